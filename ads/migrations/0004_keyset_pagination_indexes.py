@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0003_admanager_description"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="adclick",
+            index=models.Index(
+                fields=["timestamp", "id"], name="ads_adclick_timesta_179ebe_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adclick",
+            index=models.Index(
+                fields=["ad", "timestamp"], name="ads_adclick_ad_id_897e92_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adimpression",
+            index=models.Index(
+                fields=["timestamp", "id"], name="ads_adimpre_timesta_d67e17_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="adimpression",
+            index=models.Index(
+                fields=["ad", "timestamp"], name="ads_adimpre_ad_id_967dd8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userbehavior",
+            index=models.Index(
+                fields=["timestamp", "id"], name="ads_userbeh_timesta_98c4f7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userbehavior",
+            index=models.Index(
+                fields=["user_id", "timestamp"], name="ads_userbeh_user_id_7d042f_idx"
+            ),
+        ),
+    ]
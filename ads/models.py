@@ -158,6 +158,13 @@ class UserBehavior(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     objects = models.Manager()
 
+    class Meta:
+        # Keyset pagination seeks on (timestamp, id)
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),
+            models.Index(fields=['user_id', 'timestamp']),
+        ]
+
 
 class AdImpression(models.Model):
     """
@@ -171,6 +178,13 @@ class AdImpression(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     objects = models.Manager()
 
+    class Meta:
+        # Keyset pagination seeks on (timestamp, id)
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),
+            models.Index(fields=['ad', 'timestamp']),
+        ]
+
 
 class AdClick(models.Model):
     """
@@ -182,6 +196,13 @@ class AdClick(models.Model):
     referrer = models.TextField(blank=True)
     objects = models.Manager()
 
+    class Meta:
+        # Keyset pagination seeks on (timestamp, id)
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),
+            models.Index(fields=['ad', 'timestamp']),
+        ]
+
 
 _NORMALIZING_SPACES = set()
 
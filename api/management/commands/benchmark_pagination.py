@@ -0,0 +1,96 @@
+"""
+Management command comparing offset and keyset pagination at depth.
+
+Seeds UserBehavior rows inside a transaction that is rolled back, then
+times fetching one page at increasing depths both ways.
+
+Usage examples:
+    python manage.py benchmark_pagination
+    python manage.py benchmark_pagination --rows 500000 --page-size 100
+"""
+
+import statistics
+import time
+
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from ads.models import UserBehavior
+from api.pagination import keyset_ordering, order_by_terms, seek_condition
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded rows"""
+
+
+class Command(BaseCommand):
+    """
+    Offset pagination reads and discards every row before the page (plus
+    a COUNT(*) per page); keyset pagination seeks straight to it, so its
+    cost should stay flat as the depth grows.
+    """
+    help = 'Benchmark offset vs keyset page fetches at increasing depth'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options['rows'], options['page_size'],
+                          options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, rows, page_size, repeat):
+        self.stdout.write(f'Seeding {rows} rows...')
+        batch = 5000
+        for start in range(0, rows, batch):
+            UserBehavior.objects.bulk_create(
+                UserBehavior(page_slug=f'page-{index}', category='bench')
+                for index in range(start, min(start + batch, rows))
+            )
+
+        queryset = UserBehavior.objects.order_by('-timestamp')
+        key = keyset_ordering(queryset)
+        ordered = queryset.order_by(*order_by_terms(key))
+
+        self.stdout.write(
+            f"{'page':>8} {'offset ms':>12} {'keyset ms':>12}")
+        depth = 1
+        while (depth - 1) * page_size < rows:
+            offset = (depth - 1) * page_size
+            # Cursor for this page: the row just before it (untimed)
+            position = None
+            if offset:
+                before = ordered[offset - 1:offset].get()
+                position = [getattr(before, field.attname) for field, _ in key]
+
+            def by_offset():
+                queryset.count()
+                list(ordered[offset:offset + page_size])
+
+            def by_keyset():
+                page = ordered
+                if position is not None:
+                    page = page.filter(seek_condition(key, position))
+                list(page[:page_size + 1])
+
+            self.stdout.write(
+                f'{depth:>8} {self._time(by_offset, repeat):>12.2f} '
+                f'{self._time(by_keyset, repeat):>12.2f}')
+            depth *= 10
+
+    @staticmethod
+    def _time(fetch, repeat):
+        """Median wall time of ``fetch`` in milliseconds"""
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,247 @@
+"""
+Keyset (seek) pagination.
+
+Pages are addressed by the ordering values of the row they start after,
+so every page costs one indexed range scan no matter how deep it is and
+rows inserted meanwhile never shift or repeat results. The total count is
+a separate COUNT(*) and is only computed on request (``?count=true``).
+
+Clients opt in per request by passing ``cursor`` (empty for the first
+page); without it the endpoint keeps the page-number pagination and count
+that existing clients rely on. ``keyset_by_default`` makes keyset the
+default for endpoints that have no page-number clients.
+
+The ordering is taken from the queryset (i.e. after OrderingFilter), the
+paginator's ``ordering`` or the model's Meta.ordering, and is made total
+by appending the primary key. Orderings that cannot be seeked (annotations,
+related or nullable fields) and plain lists fall back to page numbers.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+def keyset_ordering(queryset, default=None):
+    """
+    Total ordering of ``queryset`` as ``[(field, descending), ...]``
+    ending with the primary key, or None if it cannot be seeked.
+    """
+    meta = queryset.model._meta
+    terms = list(queryset.query.order_by or default or meta.ordering or [])
+    fields = []
+    for term in terms:
+        if not isinstance(term, str) or term == '?':
+            return None
+        name = term.lstrip('-')
+        try:
+            field = meta.pk if name == 'pk' else meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.null or (
+                field.is_relation and not field.primary_key):
+            return None
+        fields.append((field, term.startswith('-')))
+        if field.primary_key:
+            return fields
+    descending = fields[0][1] if fields else False
+    fields.append((meta.pk, descending))
+    return fields
+
+
+def seek_condition(ordering, position, reverse=False):
+    """
+    Rows strictly after ``position`` in ``ordering`` (before it when
+    ``reverse``): ``a >= x AND ((a > x) OR (a = x AND b > y) OR ...)``.
+    The redundant leading bound lets the database range-scan the index
+    instead of evaluating the OR for every row.
+    """
+    condition = Q()
+    equal = Q()
+    for (field, descending), value in zip(ordering, position):
+        lookup = 'lt' if descending != reverse else 'gt'
+        condition |= equal & Q(**{f'{field.attname}__{lookup}': value})
+        equal &= Q(**{field.attname: value})
+    (field, descending), value = ordering[0], position[0]
+    bound = 'lte' if descending != reverse else 'gte'
+    return Q(**{f'{field.attname}__{bound}': value}) & condition
+
+
+def order_by_terms(ordering, reverse=False):
+    """``order_by()`` arguments for an ordering, optionally reversed"""
+    return [
+        f"{'-' if descending != reverse else ''}{field.attname}"
+        for field, descending in ordering
+    ]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination over ``(ordering field, ..., id)``.
+    Responses hold ``next``/``previous`` links and ``results``, plus
+    ``count`` when the client passes ``?count=true``. Requests without a
+    ``cursor`` use ``fallback_class`` unless ``keyset_by_default`` is set.
+    """
+    ordering = None
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    include_count = False
+    keyset_by_default = False
+    fallback_class = PageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        self.request = request
+        key = (
+            keyset_ordering(queryset, self.ordering)
+            if isinstance(queryset, QuerySet) and self.wants_keyset(request)
+            else None
+        )
+        if key is None:
+            if self.fallback_class is None:
+                raise TypeError('Queryset ordering cannot be keyset paginated')
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.key = key
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self.wants_count(request) else None
+
+        position, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(*order_by_terms(key, reverse))
+        if position is not None:
+            queryset = queryset.filter(seek_condition(key, position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return rows
+
+    def wants_keyset(self, request):
+        """Whether this request is paginated by cursor"""
+        return (self.keyset_by_default
+                or self.cursor_query_param in request.query_params)
+
+    def get_page_size(self, request):
+        """Requested page size clamped to ``max_page_size``"""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def wants_count(self, request):
+        """Whether to run the COUNT(*) query for this request"""
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() in TRUE_VALUES
+
+    def _signature(self):
+        return ','.join(order_by_terms(self.key))
+
+    def encode_cursor(self, instance, reverse):
+        """Link to the page after (or, reversed, before) ``instance``"""
+        payload = {
+            'o': self._signature(),
+            'p': [field.value_to_string(instance) for field, _ in self.key],
+        }
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """``(position, reverse)`` from the request; (None, False) if absent"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            values = payload['p']
+            # Cursors are only valid for the ordering that issued them
+            if payload.get('o') != self._signature() or \
+                    len(values) != len(self.key):
+                raise ValueError
+            position = [
+                field.to_python(value)
+                for (field, _), value in zip(self.key, values)
+            ]
+        except (TypeError, ValueError, KeyError, AttributeError,
+                binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+        return position, bool(payload.get('r'))
+
+    def get_next_link(self):
+        if self.fallback is not None:
+            return self.fallback.get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.fallback is not None:
+            return self.fallback.get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        content = OrderedDict()
+        if self.count is not None:
+            content['count'] = self.count
+        content['next'] = self.get_next_link()
+        content['previous'] = self.get_previous_link()
+        content['results'] = data
+        return Response(content)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {
+                    'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class EventKeysetPagination(KeysetPagination):
+    """Events by start time, latest first"""
+    ordering = ('-start_datetime', '-id')
+
+
+class ManagedEventPagination(EventKeysetPagination):
+    """Always by cursor: the my-events lists were never page-numbered"""
+    keyset_by_default = True
@@ -4,11 +4,13 @@ from .event_serializers import (
     EventCategorySerializer,
     EventTypeSerializer,
     EventListSerializer,
+    MyEventSerializer,
     EventDetailSerializer,
     EventCreateUpdateSerializer,
 )
 from .participant_serializers import (
     EventParticipantSerializer,
+    EventParticipantPublicSerializer,
     EventParticipantCreateSerializer,
     EventParticipantCheckInSerializer,
 )
@@ -16,12 +18,14 @@ from .financial_serializers import (
     EventSponsorSerializer,
     EventExpenseSerializer,
     EventTicketSerializer,
+    TicketReservationSerializer,
 )
 from .media_serializers import (
     EventPhotoSerializer,
     EventUpdateSerializer,
     EventMilestoneSerializer,
     EventFeedbackSerializer,
+    EventDocumentBatchSerializer,
 )
 from .organizer_serializers import (
     EventOrganizerSerializer,
@@ -34,21 +38,25 @@ __all__ = [
     'EventCategorySerializer',
     'EventTypeSerializer',
     'EventListSerializer',
+    'MyEventSerializer',
     'EventDetailSerializer',
     'EventCreateUpdateSerializer',
     # Participants
     'EventParticipantSerializer',
+    'EventParticipantPublicSerializer',
     'EventParticipantCreateSerializer',
     'EventParticipantCheckInSerializer',
     # Financial
     'EventSponsorSerializer',
     'EventExpenseSerializer',
     'EventTicketSerializer',
+    'TicketReservationSerializer',
     # Media
     'EventPhotoSerializer',
     'EventUpdateSerializer',
     'EventMilestoneSerializer',
     'EventFeedbackSerializer',
+    'EventDocumentBatchSerializer',
     # Organization
     'EventOrganizerSerializer',
     'EventPartnershipSerializer',
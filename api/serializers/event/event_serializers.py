@@ -1,6 +1,5 @@
 """Core event serializers with geolocation support"""
 
-from django.db.models import Avg
 from rest_framework import serializers
 
 from api.serializers.organizations.organization_serializers import \
@@ -11,15 +10,34 @@ from api.serializers.schools.locations import (CitySerializer,
                                                VillageSerializer)
 from api.serializers.schools.test import SimpleSchoolSerializer
 from event.models import Event, EventCategory, EventType
+from event.services.category_tree import cached_category_tree
+from event.services.stats import get_event_stats
 
 from .financial_serializers import (EventSponsorSerializer,
                                     EventTicketSerializer)
 from .media_serializers import (EventMilestoneSerializer, EventPhotoSerializer,
-                                EventUpdateSerializer)
+                                EventUpdateSerializer, ImageSrcsetField)
 from .organizer_serializers import (EventImpactSerializer,
                                     EventOrganizerSerializer)
 
 
+class EventCategoryNodeSerializer(serializers.ModelSerializer):
+    """One category of the tree, without its subcategories"""
+
+    class Meta:
+        """Meta information for the EventCategoryNodeSerializer"""
+        model = EventCategory
+        fields = [
+            'id', 'name', 'slug', 'icon', 'description',
+            'parent_category', 'depth', 'is_active', 'created_at'
+        ]
+
+
+def render_category_node(category):
+    """Plain dict for a category node of the cached tree"""
+    return dict(EventCategoryNodeSerializer(category).data)
+
+
 class EventCategorySerializer(serializers.ModelSerializer):
     """Event category with hierarchy support"""
     subcategories = serializers.SerializerMethodField()
@@ -29,18 +47,17 @@ class EventCategorySerializer(serializers.ModelSerializer):
         model = EventCategory
         fields = [
             'id', 'name', 'slug', 'icon', 'description',
-            'parent_category', 'subcategories', 'is_active', 'created_at'
+            'parent_category', 'depth', 'subcategories', 'is_active',
+            'created_at'
         ]
 
     def get_subcategories(self, obj):
-        """Get active subcategories"""
-        if obj.subcategories.exists():
-            return EventCategorySerializer(
-                obj.subcategories.filter(is_active=True),
-                many=True,
-                context=self.context
-            ).data
-        return []
+        """Active subcategories, nested, from the cached category tree"""
+        nodes = self.context.get('category_nodes')
+        if nodes is None:
+            _, _, nodes = cached_category_tree(render_category_node)
+        node = nodes.get(obj.pk)
+        return node['subcategories'] if node is not None else []
 
 
 class EventTypeSerializer(serializers.ModelSerializer):
@@ -119,6 +136,13 @@ class EventListSerializer(serializers.ModelSerializer):
     participants_count = serializers.SerializerMethodField()
     sponsors_count = serializers.SerializerMethodField()
 
+    # Set by proximity searches (?latitude=&longitude=&radius_km=)
+    distance_km = serializers.SerializerMethodField()
+
+    # Rendered image variants
+    thumbnail_srcset = ImageSrcsetField('thumbnail_image')
+    banner_srcset = ImageSrcsetField('banner_image')
+
     class Meta:
         """Meta information for the EventListSerializer"""
         model = Event
@@ -133,22 +157,43 @@ class EventListSerializer(serializers.ModelSerializer):
             'start_datetime', 'end_datetime', 'timezone',
             # Media
             'thumbnail_image', 'banner_image',
+            'thumbnail_srcset', 'banner_srcset',
             # Financial
             'funding_goal', 'current_funding', 'currency', 'funding_percentage',
             # Computed
             'is_registration_open', 'is_full',
-            'participants_count', 'sponsors_count',
+            'participants_count', 'sponsors_count', 'distance_km',
             # Metadata
             'created_at', 'updated_at'
         ]
 
     def get_participants_count(self, obj):
         """Get count of registered participants"""
-        return obj.participants.filter(status='registered').count()
+        count = getattr(obj, 'registered_count', None)
+        if count is None:
+            count = obj.participants.filter(status='registered').count()
+        return count
 
     def get_sponsors_count(self, obj):
         """Get count of public sponsors"""
-        return obj.sponsors.filter(is_public=True).count()
+        count = getattr(obj, 'public_sponsor_count', None)
+        if count is None:
+            count = obj.sponsors.filter(is_public=True).count()
+        return count
+
+    def get_distance_km(self, obj):
+        """Distance from the search point, when searching by location"""
+        distance = getattr(obj, 'distance_km', None)
+        return round(distance, 3) if distance is not None else None
+
+
+class MyEventSerializer(EventListSerializer):
+    """Event card for the current user's owned and organized events"""
+    user_role = serializers.CharField(read_only=True)
+
+    class Meta(EventListSerializer.Meta):
+        """Meta information for the MyEventSerializer"""
+        fields = [*EventListSerializer.Meta.fields, 'user_role']
 
 
 class EventDetailSerializer(serializers.ModelSerializer):
@@ -171,6 +216,11 @@ class EventDetailSerializer(serializers.ModelSerializer):
     milestones = serializers.SerializerMethodField()
     impact_metrics = serializers.SerializerMethodField()
 
+    # Rendered image variants
+    banner_srcset = ImageSrcsetField('banner_image')
+    thumbnail_srcset = ImageSrcsetField('thumbnail_image')
+    og_image_srcset = ImageSrcsetField('og_image')
+
     # Computed
     is_registration_open = serializers.BooleanField(read_only=True)
     is_full = serializers.BooleanField(read_only=True)
@@ -250,18 +300,16 @@ class EventDetailSerializer(serializers.ModelSerializer):
         ).data
 
     def get_participants_count(self, obj):
-        """Get count of registered participants"""
-        return obj.participants.filter(status__in=['registered', 'confirmed', 'attended']).count()
+        """Get count of registered, confirmed and attended participants"""
+        return get_event_stats(obj).active_participants
 
     def get_attended_count(self, obj):
         """Get count of participants who attended"""
-        return obj.participants.filter(status='attended').count()
+        return get_event_stats(obj).attended_count
 
     def get_average_rating(self, obj):
-        """Calculate average overall rating from feedback"""
-        avg = obj.feedback.filter(
-            is_public=True).aggregate(Avg('overall_rating'))
-        return round(avg['overall_rating__avg'], 1) if avg['overall_rating__avg'] else None
+        """Average overall rating from public feedback"""
+        return get_event_stats(obj).average_rating
 
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
@@ -3,7 +3,8 @@
 from django.utils import timezone
 from rest_framework import serializers
 
-from event.models import EventExpense, EventSponsor, EventTicket
+from event.models import (EventExpense, EventSponsor, EventTicket,
+                          TicketReservation)
 
 
 class EventSponsorSerializer(serializers.ModelSerializer):
@@ -119,16 +120,31 @@ class EventTicketSerializer(serializers.ModelSerializer):
         model = EventTicket
         fields = [
             'id', 'event', 'name', 'description', 'price', 'currency',
-            'quantity', 'quantity_sold', 'remaining',
+            'quantity', 'quantity_sold', 'quantity_held', 'remaining',
             'sale_start', 'sale_end', 'status', 'is_available',
             'display_order', 'max_per_order'
         ]
+        read_only_fields = ['quantity_sold', 'quantity_held']
 
     def get_remaining(self, obj):
-        """Calculate remaining tickets"""
+        """Calculate tickets neither sold nor held"""
         if obj.quantity is None:
             return None
-        return max(0, obj.quantity - obj.quantity_sold)
+        return obj.remaining_quantity
+
+
+class TicketReservationSerializer(serializers.ModelSerializer):
+    """Checkout hold on ticket inventory"""
+    ticket_name = serializers.CharField(source='ticket.name', read_only=True)
+
+    class Meta:
+        """Meta information for the TicketReservationSerializer"""
+        model = TicketReservation
+        fields = [
+            'id', 'token', 'ticket', 'ticket_name', 'quantity', 'status',
+            'expires_at', 'confirmed_at', 'created_at'
+        ]
+        read_only_fields = fields
 
 
 class EventFinancialSummarySerializer(serializers.Serializer):
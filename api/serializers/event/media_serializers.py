@@ -2,18 +2,39 @@
 
 from rest_framework import serializers
 
-from event.models import EventFeedback, EventMilestone, EventPhoto, EventUpdate
+from event.models import (EventDocumentBatch, EventFeedback, EventMilestone,
+                          EventPhoto, EventUpdate)
+from event.services.images import srcset
+
+
+class ImageSrcsetField(serializers.Field):
+    """
+    ``{"webp": "url 320w, ...", "jpeg": "..."}`` for an image field's
+    rendered variants; null until the image worker has processed it.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        return srcset(
+            value, self.image_field,
+            request.build_absolute_uri if request is not None else None)
 
 
 class EventPhotoSerializer(serializers.ModelSerializer):
     """Event photo gallery"""
     photographer_name = serializers.SerializerMethodField()
+    srcset = ImageSrcsetField('image')
 
     class Meta:
         """Meta information for the EventPhotoSerializer"""
         model = EventPhoto
         fields = [
-            'id', 'event', 'image', 'caption', 'photographer',
+            'id', 'event', 'image', 'srcset', 'caption', 'photographer',
             'photographer_name', 'photographer_credit', 'taken_at',
             'tags', 'is_featured', 'is_public', 'display_order',
             'uploaded_at'
@@ -33,13 +54,14 @@ class EventUpdateSerializer(serializers.ModelSerializer):
         source='posted_by.get_full_name',
         read_only=True
     )
+    image_srcset = ImageSrcsetField('image')
 
     class Meta:
         """Meta information for the EventUpdateSerializer"""
         model = EventUpdate
         fields = [
             'id', 'event', 'update_type', 'title', 'content',
-            'image', 'posted_by', 'posted_by_name', 'posted_at',
+            'image', 'image_srcset', 'posted_by', 'posted_by_name', 'posted_at',
             'is_pinned', 'is_public', 'notify_participants',
             'notify_sponsors'
         ]
@@ -231,3 +253,21 @@ class EventFeedbackSummarySerializer(serializers.Serializer):
     def update(self, instance, validated_data):
         """Not used for read-only serializer"""
         raise NotImplementedError()
+
+
+class EventDocumentBatchSerializer(serializers.ModelSerializer):
+    """Bulk certificate/badge archive and its generation progress"""
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        """Meta information for the EventDocumentBatchSerializer"""
+        model = EventDocumentBatch
+        fields = [
+            'id', 'event', 'kind', 'status', 'total', 'processed',
+            'progress', 'archive', 'last_error', 'requested_by',
+            'created_at', 'finished_at'
+        ]
+        read_only_fields = [
+            'event', 'status', 'total', 'processed', 'archive',
+            'last_error', 'requested_by', 'created_at', 'finished_at'
+        ]
@@ -5,19 +5,23 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from event.models import EventParticipant
+from event.services.checkin import ticket_code
+from event.services.registration import register_participant
+from event.services.tickets import TicketUnavailable, sell_tickets
 
 
 class EventParticipantSerializer(serializers.ModelSerializer):
     """Full participant details for organizers"""
     user_email = serializers.EmailField(source='user.email', read_only=True)
     event_title = serializers.CharField(source='event.title', read_only=True)
+    ticket_code = serializers.SerializerMethodField()
 
     class Meta:  # pylint: disable=too-few-public-methods
         """Full participant details for organizers"""
         model = EventParticipant
         fields = [
             'id', 'event', 'event_title', 'user', 'user_email',
-            'name', 'email', 'phone', 'role', 'status',
+            'name', 'email', 'phone', 'role', 'status', 'ticket_code',
             'organization_name', 'special_requirements',
             'registration_date', 'confirmation_date',
             'check_in_time', 'check_out_time',
@@ -27,6 +31,23 @@ class EventParticipantSerializer(serializers.ModelSerializer):
             'registration_date', 'check_in_time', 'check_out_time'
         ]
 
+    def get_ticket_code(self, obj):
+        """Code encoded in the participant's check-in QR"""
+        return ticket_code(obj.pk, obj.event_id)
+
+
+class EventParticipantPublicSerializer(serializers.ModelSerializer):
+    """Public projection of a participant: no contact or internal fields"""
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Fields safe to show to anyone viewing the event"""
+        model = EventParticipant
+        fields = [
+            'id', 'event', 'name', 'role', 'status',
+            'organization_name', 'registration_date'
+        ]
+        read_only_fields = fields
+
 
 class EventParticipantCreateSerializer(serializers.ModelSerializer):
     """Serializer for event registration"""
@@ -68,12 +89,8 @@ class EventParticipantCreateSerializer(serializers.ModelSerializer):
                     'Invalid ticket selected'
                 ) from exc
 
-        # Check capacity
-        if event.is_full:
-            # Auto-add to waitlist
-            attrs['status'] = 'waitlist'
-        else:
-            attrs['status'] = 'registered'
+        # Capacity is enforced atomically at creation time; full events
+        # place the participant on the waitlist
 
         # Check for duplicate registration
         email = attrs['email']
@@ -101,12 +118,15 @@ class EventParticipantCreateSerializer(serializers.ModelSerializer):
 
         # Use transaction to ensure ticket quantity is updated atomically
         with transaction.atomic():
-            participant = super().create(validated_data)
+            participant = register_participant(
+                validated_data.pop('event'), **validated_data)
 
-            # Update ticket quantity_sold if ticket was selected
+            # Sell the selected ticket against remaining inventory
             if ticket:
-                ticket.quantity_sold += 1
-                ticket.save(update_fields=['quantity_sold'])
+                try:
+                    sell_tickets(ticket)
+                except TicketUnavailable as exc:
+                    raise serializers.ValidationError(str(exc)) from exc
 
             return participant
 
@@ -142,12 +162,3 @@ class EventParticipantCheckInSerializer(serializers.Serializer):
     def update(self, instance, validated_data):
         """Not implemented for check-in serializer"""
         raise NotImplementedError('Use create() for check-in operations')
-
-
-class EventParticipantPublicSerializer(serializers.ModelSerializer):
-    """Public participant list (privacy-focused)"""
-
-    class Meta:  # pylint: disable=too-few-public-methods
-        """ Public participant list (privacy-focused) """
-        model = EventParticipant
-        fields = ['name', 'role', 'organization_name']
@@ -0,0 +1,25 @@
+"""
+Search filter backends shared by the API viewsets.
+"""
+
+from rest_framework import filters
+
+from schools.services.name_search import search_names
+
+
+class NameSearchFilter(filters.BaseFilterBackend):
+    """
+    Ranked search (?search=) over the name fields of places and
+    scholarships, backed by the name search index: Khmer names match as
+    substrings and Latin names ignore accents. Unless ?ordering= is given,
+    matches are ordered by relevance.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get("search", "").strip()
+        if not text:
+            return queryset
+        queryset = search_names(queryset, text)
+        if not request.query_params.get("ordering"):
+            queryset = queryset.order_by("-search_rank", "name", "pk")
+        return queryset
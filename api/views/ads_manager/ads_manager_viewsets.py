@@ -3,9 +3,10 @@ ViewSets for Ads Manager API endpoints.
 """
 
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
 from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django_filters import rest_framework as filters_rf
@@ -18,6 +19,7 @@ from rest_framework.response import Response
 
 from ads.models import (AdClick, AdImpression, AdManager, AdPlacement, AdSpace,
                         AdType, UserBehavior, UserProfile)
+from api.pagination import KeysetPagination
 from api.serializers.ads_manager import (AdAnalyticsSerializer,
                                          AdClickSerializer,
                                          AdImpressionSerializer,
@@ -373,16 +375,17 @@ class AdImpressionViewSet(viewsets.ModelViewSet):
     filterset_fields = ['ad', 'user_id']
     ordering_fields = ['timestamp', 'id']
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Limit queryset to recent impressions for performance."""
         # Only show impressions from the last 90 days by default
         days = int(self.request.query_params.get('days', 90))
-        cutoff_date = date.today() - timedelta(days=days)
+        # A plain range on timestamp (not timestamp__date) can use the index
+        cutoff = timezone.make_aware(datetime.combine(
+            date.today() - timedelta(days=days), time.min))
 
-        return super().get_queryset().filter(
-            timestamp__date__gte=cutoff_date
-        )
+        return super().get_queryset().filter(timestamp__gte=cutoff)
 
 
 class AdClickViewSet(viewsets.ModelViewSet):
@@ -395,16 +398,17 @@ class AdClickViewSet(viewsets.ModelViewSet):
     filterset_fields = ['ad', 'user_id']
     ordering_fields = ['timestamp', 'id']
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Limit queryset to recent clicks for performance."""
         # Only show clicks from the last 90 days by default
         days = int(self.request.query_params.get('days', 90))
-        cutoff_date = date.today() - timedelta(days=days)
+        # A plain range on timestamp (not timestamp__date) can use the index
+        cutoff = timezone.make_aware(datetime.combine(
+            date.today() - timedelta(days=days), time.min))
 
-        return super().get_queryset().filter(
-            timestamp__date__gte=cutoff_date
-        )
+        return super().get_queryset().filter(timestamp__gte=cutoff)
 
 
 class UserProfileViewSet(viewsets.ModelViewSet):
@@ -433,13 +437,14 @@ class UserBehaviorViewSet(viewsets.ModelViewSet):
     search_fields = ['user_id', 'page_slug', 'category']
     ordering_fields = ['timestamp', 'id']
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """Limit queryset to recent behavior for performance."""
         # Only show behavior from the last 30 days by default
         days = int(self.request.query_params.get('days', 30))
-        cutoff_date = date.today() - timedelta(days=days)
+        # A plain range on timestamp (not timestamp__date) can use the index
+        cutoff = timezone.make_aware(datetime.combine(
+            date.today() - timedelta(days=days), time.min))
 
-        return super().get_queryset().filter(
-            timestamp__date__gte=cutoff_date
-        )
+        return super().get_queryset().filter(timestamp__gte=cutoff)
@@ -3,40 +3,79 @@ Event Management ViewSets
 Complete CRUD operations for event management system
 """
 
-from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, Sum
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, parsers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from api.pagination import (EventKeysetPagination, KeysetPagination,
+                            ManagedEventPagination)
 from api.serializers.event.event_serializers import (
     EventCategorySerializer, EventCreateUpdateSerializer,
-    EventDetailSerializer, EventListSerializer, EventTypeSerializer)
+    EventDetailSerializer, EventListSerializer, EventTypeSerializer,
+    MyEventSerializer, render_category_node)
 from api.serializers.event.financial_serializers import (
-    EventExpenseSerializer, EventSponsorSerializer, EventTicketSerializer)
+    EventExpenseSerializer, EventSponsorSerializer, EventTicketSerializer,
+    TicketReservationSerializer)
 from api.serializers.event.media_serializers import (
-    EventFeedbackCreateSerializer, EventFeedbackSerializer,
-    EventMilestoneSerializer, EventPhotoSerializer, EventUpdateSerializer)
+    EventDocumentBatchSerializer, EventFeedbackCreateSerializer,
+    EventFeedbackSerializer, EventMilestoneSerializer, EventPhotoSerializer,
+    EventUpdateSerializer)
 from api.serializers.event.organizer_serializers import (
     EventImpactSerializer, EventOrganizerSerializer,
     EventPartnershipSerializer)
 from api.serializers.event.participant_serializers import (
-    EventParticipantCreateSerializer, EventParticipantSerializer)
-from event.models import (Event, EventCategory, EventExpense, EventFeedback,
-                          EventImpact, EventMilestone, EventOrganizer,
-                          EventParticipant, EventPartnership, EventPhoto,
-                          EventSponsor, EventTicket, EventType, EventUpdate)
+    EventParticipantCreateSerializer, EventParticipantPublicSerializer,
+    EventParticipantSerializer)
+from api.utils.streaming import EXPORT_FORMATS, streaming_export
+from event.models import (Event, EventCategory, EventDocumentBatch,
+                          EventExpense, EventFeedback, EventImpact,
+                          EventMilestone, EventOrganizer, EventParticipant,
+                          EventPartnership, EventPhoto, EventSponsor,
+                          EventTicket, EventType, EventUpdate,
+                          TicketReservation)
 from event.permissions import (EventPermissionChecker,
+                               EventPermissionContext,
                                get_user_event_permissions)
+from event.services.category_tree import cached_category_tree
+from event.services.certificates import request_batch
+from event.services.checkin import (MAX_SYNC_BATCH, build_manifest,
+                                    known_manifest_version, sync_scans)
+from event.services.detail_cache import (cached_event_payload, detail_etag,
+                                         get_event_version)
+from event.services.event_map import MapQueryError, map_viewport
+from event.services.event_search import filter_tags, search_events
+from event.services.geo_search import ProximitySearch
+from event.services.notifications import (notify_expense_decided,
+                                          notify_organizer_invited,
+                                          notify_registration_confirmed,
+                                          notify_sponsor_approved,
+                                          notify_sponsor_submitted)
+from event.services.participant_import import (ParticipantImportError,
+                                               import_participants_csv)
+from event.services.photo_import import PhotoImportError, import_photos_zip
+from event.services.registration import cancel_participant, claim_seat
+from event.services.stats import get_event_stats, refresh_event_stats
+from event.services.tickets import (ReservationNotActive, TicketUnavailable,
+                                    confirm_reservation, release_reservation,
+                                    reserve_tickets)
+from event.services.timeseries import (TimeSeriesQueryError,
+                                       apply_check_ins, event_timeseries,
+                                       parse_moment)
 
 
 class EventCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for event categories (read-only for public)
+    Subcategories are rendered from the cached category tree.
     """
     queryset = EventCategory.objects.filter(is_active=True)
     serializer_class = EventCategorySerializer
@@ -44,6 +83,25 @@ class EventCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'description']
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        _, _, context['category_nodes'] = cached_category_tree(
+            render_category_node)
+        return context
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """Whole active category tree, nested; honors If-None-Match"""
+        version, roots, _ = cached_category_tree(render_category_node)
+        etag = f'"category-tree-{version}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(roots)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'
+        return response
+
 
 class EventTypeViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -58,6 +116,33 @@ class EventTypeViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['name', 'description']
 
 
+class EventFullTextFilter(filters.BaseFilterBackend):
+    """
+    Ranked full-text search (?q=, or the legacy ?search=) with prefix
+    matching, plus exact tag filters (?tag=a&tag=b), backed by the event
+    search index. Runs after OrderingFilter so that, unless ?ordering= is
+    given, matches are ordered by relevance.
+    """
+    query_params = ('q', 'search')
+
+    def filter_queryset(self, request, queryset, view):
+        tags = request.query_params.getlist('tag')
+        if tags:
+            queryset = filter_tags(queryset, tags)
+
+        text = next((
+            request.query_params[param] for param in self.query_params
+            if request.query_params.get(param, '').strip()
+        ), None)
+        if text is None:
+            return queryset
+
+        queryset = search_events(queryset, text)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-start_datetime', 'pk')
+        return queryset
+
+
 class EventViewSet(viewsets.ModelViewSet):
     """
     ViewSet for events with full CRUD operations
@@ -67,52 +152,35 @@ class EventViewSet(viewsets.ModelViewSet):
     - Only owner or organizers with edit permission can update/delete
     """
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['event_type', 'status', 'visibility',
+                       filters.OrderingFilter, EventFullTextFilter]
+    filterset_fields = ['event_type', 'status', 'visibility', 'registration_open',
                         'country', 'state', 'city', 'is_virtual', 'is_featured']
-    search_fields = ['title', 'description', 'tags']
     ordering_fields = ['start_datetime', 'created_at', 'title']
     ordering = ['-start_datetime']
+    pagination_class = EventKeysetPagination
 
     def get_permissions(self):
         """Define permissions based on action"""
-        if self.action in ['list', 'retrieve', 'by_slug']:
+        if self.action in ['list', 'retrieve', 'by_slug', 'map_clusters']:
             return [AllowAny()]
         return [IsAuthenticated()]
 
     def get_queryset(self):
-        queryset = Event.objects.select_related(
+        queryset = self.get_base_queryset().select_related(
             'event_type', 'event_type__category',
             'country', 'state', 'city', 'village',
             'target_school', 'target_organization'
-        ).prefetch_related(
-            'organizers', 'sponsors', 'tickets'
-        ).annotate(
-            participants_count=Count('participants'),
-            sponsors_count=Count('sponsors')
         )
 
-        # Filter by location proximity if lat/lng provided
-        latitude = self.request.query_params.get('latitude')
-        longitude = self.request.query_params.get('longitude')
-        radius_km = self.request.query_params.get('radius_km', 50)
-
-        if latitude and longitude:
-            try:
-                lat = float(latitude)
-                lng = float(longitude)
-                radius = float(radius_km)
-
-                # Simple bounding box filter (more efficient than Haversine for initial filtering)
-                lat_delta = radius / 111.32
-                lng_delta = radius / (111.32 * abs(lat) / 90)
+        if self.action == 'list':
+            return queryset.with_counts()
+        # Detail views read counters from the denormalized stats row
+        return queryset.select_related('stats').prefetch_related(
+            'organizers', 'sponsors', 'tickets')
 
-                queryset = queryset.filter(
-                    latitude__range=(lat - lat_delta, lat + lat_delta),
-                    longitude__range=(lng - lng_delta, lng + lng_delta)
-                )
-            except (ValueError, TypeError):
-                pass
+    def get_base_queryset(self):
+        """Filtered events without joins or aggregate annotations"""
+        queryset = Event.objects.all()
 
         # Date range filters
         start_from = self.request.query_params.get('start_date_from')
@@ -125,6 +193,53 @@ class EventViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_proximity_search(self):
+        """Build a radius search from latitude/longitude/radius_km params"""
+        latitude = self.request.query_params.get('latitude')
+        longitude = self.request.query_params.get('longitude')
+        radius_km = self.request.query_params.get('radius_km', 50)
+
+        if not (latitude and longitude):
+            return None
+        try:
+            return ProximitySearch(latitude, longitude, radius_km)
+        except (ValueError, TypeError):
+            return None
+
+    def list(self, request, *args, **kwargs):
+        """List events, optionally within a radius of latitude/longitude"""
+        proximity = self.get_proximity_search()
+        if proximity is None:
+            return super().list(request, *args, **kwargs)
+
+        # Candidate ids come from the geohash cell filter + haversine
+        # refinement; only the requested page is loaded in full
+        queryset = self.filter_queryset(self.get_base_queryset())
+        event_ids, distances = proximity.search(
+            queryset,
+            sort_by_distance=request.query_params.get('sort') == 'distance'
+        )
+
+        page = self.paginate_queryset(event_ids)
+        events = self._load_events_with_distance(
+            event_ids if page is None else page, distances)
+
+        serializer = self.get_serializer(events, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def _load_events_with_distance(self, event_ids, distances):
+        """Fetch events in the given order and attach distance_km"""
+        events_by_id = self.get_queryset().in_bulk(event_ids)
+        events = []
+        for event_id in event_ids:
+            event = events_by_id.get(event_id)
+            if event is not None:
+                event.distance_km = distances[event_id]
+                events.append(event)
+        return events
+
     def get_serializer_class(self):
         if self.action == 'list':
             return EventListSerializer
@@ -148,26 +263,111 @@ class EventViewSet(viewsets.ModelViewSet):
         EventPermissionChecker.require_event_owner(self.request.user, instance)
         instance.delete()
 
+    def retrieve(self, request, *args, **kwargs):
+        """Event detail served from the versioned payload cache"""
+        try:
+            event_id = int(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):
+            raise NotFound() from None
+        return self._detail_response(
+            request, event_id, variant=request.build_absolute_uri('/'),
+            with_permissions=False)
+
     @action(detail=False, methods=['get'], url_path='by-slug/(?P<slug>[-\\w]+)')
     def by_slug(self, request, slug=None):
         """Get event by slug with user permissions"""
-        try:
-            event = self.get_queryset().get(slug=slug)
-            serializer = EventDetailSerializer(event)
-            data = serializer.data
-
-            # Add user permissions if authenticated
-            if request.user.is_authenticated:
-                data['user_permissions'] = get_user_event_permissions(
-                    request.user, event
-                )
-
-            return Response(data)
-        except ObjectDoesNotExist:
+        event_id = Event.objects.filter(slug=slug).values_list(
+            'pk', flat=True).first()
+        if event_id is None:
             return Response(
                 {'error': 'Event not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        # Rendered without request context, i.e. with relative media URLs
+        return self._detail_response(
+            request, event_id, variant='relative', with_permissions=True)
+
+    @action(detail=False, methods=['get'], url_path='map')
+    def map_clusters(self, request):
+        """
+        Clustered markers for a map viewport
+        (?bbox=west,south,east,north&zoom=0-20). Clusters carry a count,
+        centroid and sample ids; zoom 14 and above returns single events.
+        """
+        try:
+            west, south, east, north = (
+                float(value)
+                for value in request.query_params.get('bbox', '').split(','))
+            zoom = int(request.query_params.get('zoom', 0))
+            payload = map_viewport(west, south, east, north, zoom)
+        except ValueError as exc:
+            message = str(exc) if isinstance(exc, MapQueryError) else (
+                'bbox=west,south,east,north and an integer zoom are required')
+            return Response(
+                {'error': message}, status=status.HTTP_400_BAD_REQUEST)
+        response = Response(payload)
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+    def _detail_response(self, request, event_id, variant, with_permissions):
+        """
+        Detail response built from the cached public payload, plus its
+        clock-dependent fields and the viewer's permissions when requested.
+        The ETag covers all of them, so If-None-Match is answered with a 304
+        without rendering the event.
+        """
+        version = get_event_version(event_id)
+        context = (
+            {} if variant == 'relative' else self.get_serializer_context())
+        payload = cached_event_payload(
+            event_id, version, variant,
+            lambda: self._render_detail(event_id, context))
+        if payload is None:
+            raise NotFound()
+
+        # Clock-dependent fields are evaluated per request; the cached
+        # payload only changes when the version does
+        overlay = self._live_detail_fields(payload, timezone.now())
+        private = with_permissions and request.user.is_authenticated
+        if private:
+            # Permission checks only read pk and created_by_id
+            event = Event.objects.only('pk', 'created_by').filter(
+                pk=event_id).first()
+            if event is None:
+                raise NotFound()
+            overlay['user_permissions'] = get_user_event_permissions(
+                request.user, event)
+
+        etag = detail_etag(event_id, version, variant, overlay)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({**payload, **overlay})
+
+        response['ETag'] = etag
+        response['Cache-Control'] = (
+            'private, no-cache' if private else 'public, no-cache')
+        patch_vary_headers(response, ['Authorization', 'Cookie'])
+        return response
+
+    @staticmethod
+    def _live_detail_fields(payload, now):
+        """Fields of a cached detail payload that depend on ``now``"""
+        window = Event(
+            status=payload['status'],
+            registration_start=payload['registration_start'] and
+            parse_datetime(payload['registration_start']),
+            registration_deadline=payload['registration_deadline'] and
+            parse_datetime(payload['registration_deadline']),
+        )
+        return {'is_registration_open': window.registration_window_open(now)}
+
+    def _render_detail(self, event_id, context):
+        """Serialized public detail payload, or None if there is no event"""
+        event = self.get_queryset().filter(pk=event_id).first()
+        if event is None:
+            return None
+        return EventDetailSerializer(event, context=context).data
 
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def management_dashboard(self, request, pk=None):  # pylint: disable=unused-argument
@@ -175,38 +375,91 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         EventPermissionChecker.require_edit_permission(request.user, event)
 
-        # Get statistics
-        participants = event.participants.all()
-        sponsors = event.sponsors.all()
-        expenses = event.expenses.all()
+        # Statistics come from the denormalized EventStats row
+        stats = get_event_stats(event)
 
         dashboard_data = {
             'event': EventDetailSerializer(event).data,
             'user_permissions': get_user_event_permissions(request.user, event),
             'statistics': {
-                'total_participants': participants.count(),
-                'confirmed_participants': participants.filter(status='confirmed').count(),
-                'attended_participants': participants.filter(status='attended').count(),
-                'waitlist_count': participants.filter(status='waitlist').count(),
-                'total_sponsors': sponsors.count(),
-                'total_sponsorship': sponsors.aggregate(
-                    total=Sum('contribution_amount')
-                )['total'] or 0,
-                'total_expenses': expenses.filter(status='approved').aggregate(
-                    total=Sum('amount')
-                )['total'] or 0,
-                'pending_expenses': expenses.filter(status='pending').count(),
+                'total_participants': stats.total_participants,
+                'confirmed_participants': stats.confirmed_count,
+                'attended_participants': stats.attended_count,
+                'waitlist_count': stats.waitlist_count,
+                'total_sponsors': stats.sponsor_count,
+                'total_sponsorship': stats.sponsorship_total,
+                'total_expenses': stats.approved_expense_total,
+                'pending_expenses': stats.pending_expense_count,
+                'pending_expenses_total': stats.pending_expense_total,
+                'average_rating': stats.average_rating,
+                'rating_histogram': stats.rating_histogram,
             },
             'recent_participants': EventParticipantSerializer(
-                participants.order_by('-registration_date')[:10], many=True
+                event.participants.select_related('event', 'user').order_by(
+                    '-registration_date')[:10],
+                many=True
             ).data,
             'organizers': EventOrganizerSerializer(
                 event.organizers.all(), many=True
             ).data,
+            'document_batches': EventDocumentBatchSerializer(
+                event.document_batches.all()[:5], many=True,
+                context=self.get_serializer_context()
+            ).data,
         }
 
         return Response(dashboard_data)
 
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def timeseries(self, request, pk=None):  # pylint: disable=unused-argument
+        """
+        Registrations, check-ins and sponsorship per bucket
+        (?granularity=hour|day&start=...&end=..., ISO dates or datetimes),
+        read from the hourly/daily rollups.
+        """
+        event = self.get_object()
+        EventPermissionChecker.require_edit_permission(request.user, event)
+        try:
+            payload = event_timeseries(
+                event,
+                granularity=request.query_params.get('granularity', 'day'),
+                start=parse_moment(request.query_params.get('start')),
+                end=parse_moment(request.query_params.get('end')),
+            )
+        except TimeSeriesQueryError as exc:
+            return Response(
+                {'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(payload)
+
+    @action(detail=True, methods=['get', 'post'], url_path='documents',
+            permission_classes=[IsAuthenticated])
+    def documents(self, request, pk=None):  # pylint: disable=unused-argument
+        """
+        Bulk certificates and badges: POST {"kind": "certificates|badges|all"}
+        queues a zip archive for the document worker (or returns the one
+        already in progress); GET lists recent batches with their progress.
+        """
+        event = self.get_object()
+        EventPermissionChecker.require_participant_management(request.user, event)
+        context = self.get_serializer_context()
+
+        if request.method == 'GET':
+            return Response(EventDocumentBatchSerializer(
+                event.document_batches.all()[:20], many=True, context=context
+            ).data)
+
+        kind = request.data.get('kind', 'certificates')
+        if kind not in dict(EventDocumentBatch.KIND_CHOICES):
+            return Response(
+                {'error': 'kind must be certificates, badges or all'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        batch, created = request_batch(event, kind, request.user)
+        return Response(
+            EventDocumentBatchSerializer(batch, context=context).data,
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
+        )
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def publish(self, request, pk=None):  # pylint: disable=unused-argument
         """Publish a draft event"""
@@ -252,44 +505,152 @@ class EventViewSet(viewsets.ModelViewSet):
             request.user, event
         )
 
-        participants = event.participants.all()
+        participants, serializer_class = self._participant_projection(
+            event, can_manage)
+        serializer = serializer_class(participants, many=True)
+        return Response(serializer.data)
 
+    @staticmethod
+    def _participant_projection(event, can_manage):
+        """Participants visible to the caller and the serializer to use"""
+        participants = event.participants.order_by('registration_date', 'pk')
         if can_manage:
-            serializer = EventParticipantSerializer(participants, many=True)
+            return (
+                participants.select_related('event', 'user'),
+                EventParticipantSerializer
+            )
+        # Public view - limited info for confirmed/attended participants
+        return (
+            participants.filter(status__in=['confirmed', 'attended']).only(
+                *EventParticipantPublicSerializer.Meta.fields),
+            EventParticipantPublicSerializer
+        )
+
+    @action(detail=True, methods=['get'], url_path='participants/export')
+    def export_participants(self, request, pk=None):  # pylint: disable=unused-argument
+        """
+        Stream participants as CSV or NDJSON (?export_format=csv|ndjson).
+        Organizers get full records, everyone else the public projection.
+        """
+        event = self.get_object()
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        can_manage = EventPermissionChecker.can_manage_participants(
+            request.user, event
+        )
+        participants, serializer_class = self._participant_projection(
+            event, can_manage)
+        return streaming_export(
+            participants, serializer_class(), export_format,
+            f'{event.slug}-participants')
+
+    @action(
+        detail=True, methods=['post'], url_path='participants/import',
+        permission_classes=[IsAuthenticated],
+        parser_classes=[parsers.MultiPartParser, parsers.FormParser])
+    def import_participants(self, request, pk=None):  # pylint: disable=unused-argument
+        """Bulk import participants from an uploaded CSV file ('file')"""
+        event = self.get_object()
+        EventPermissionChecker.require_participant_management(
+            request.user, event)
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'CSV file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            report = import_participants_csv(event, upload)
+        except ParticipantImportError as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(report, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path='check-in/manifest')
+    def check_in_manifest(self, request, pk=None):  # pylint: disable=unused-argument
+        """
+        Signed, compressed manifest of hashed ticket codes for offline
+        kiosks. Honors If-None-Match so unchanged manifests cost a 304.
+        """
+        event = self.get_object()
+        EventPermissionChecker.require_participant_management(
+            request.user, event)
+
+        cached = parse_etags(request.headers.get('If-None-Match', ''))
+        # The manifest is only built when the kiosk's copy is not current
+        version, token = known_manifest_version(event), None
+        if version is None or f'"{version}"' not in cached:
+            version, token = build_manifest(event)
+        etag = f'"{version}"'
+        if etag in cached:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            # Public view - limited info
-            participants = participants.filter(
-                status__in=['confirmed', 'attended'])
-            serializer = EventParticipantSerializer(participants, many=True)
-            # Filter sensitive data
-            data = serializer.data
-            for item in data:
-                item.pop('email', None)
-                item.pop('phone', None)
-                item.pop('special_requirements', None)
-                item.pop('notes', None)
+            response = Response({
+                'event': event.pk,
+                'version': version,
+                'manifest': token,
+            })
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @action(detail=True, methods=['post'], url_path='check-in/sync')
+    def check_in_sync(self, request, pk=None):  # pylint: disable=unused-argument
+        """Apply a batch of queued kiosk scans idempotently"""
+        event = self.get_object()
+        EventPermissionChecker.require_participant_management(
+            request.user, event)
 
-        return Response(serializer.data)
+        scans = request.data.get('scans')
+        if not isinstance(scans, list):
+            return Response(
+                {'error': 'scans must be a list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(scans) > MAX_SYNC_BATCH:
+            return Response(
+                {'error': f'At most {MAX_SYNC_BATCH} scans per batch'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(sync_scans(event, scans))
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_events(self, request):
-        """Get events where user is owner or organizer"""
-        # Events created by user
-        owned_events = Event.objects.filter(created_by=request.user)
-
-        # Events where user is organizer
-        organizer_records = EventOrganizer.objects.filter(user=request.user)
-        organized_event_ids = organizer_records.values_list(
-            'event_id', flat=True)
-        organized_events = Event.objects.filter(id__in=organized_event_ids)
-
-        # Combine and deduplicate
-        all_events = (owned_events | organized_events).distinct().order_by(
-            '-start_datetime')
-
-        serializer = EventListSerializer(
-            all_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        """Events the user owns or organizes, with their role, latest first"""
+        return my_events_response(request)
+
+
+def my_events_response(request, with_permissions=False):
+    """
+    Keyset-paginated events owned or organized by the current user, read
+    with one query and annotated with ``user_role``. ``with_permissions``
+    adds each row's ``user_permissions`` (one organizer query per page).
+    """
+    events = Event.objects.managed_by(request.user).select_related(
+        'event_type', 'event_type__category', 'country', 'state', 'city'
+    ).with_counts()
+
+    paginator = ManagedEventPagination()
+    page = paginator.paginate_queryset(events, request)
+    data = MyEventSerializer(
+        page, many=True, context={'request': request}).data
+
+    if with_permissions:
+        EventPermissionContext.prime(request.user, page)
+        data = [
+            {**row, 'user_permissions': get_user_event_permissions(
+                request.user, event) or {}}
+            for event, row in zip(page, data)
+        ]
+    return paginator.get_paginated_response(data)
 
 
 class EventParticipantViewSet(viewsets.ModelViewSet):
@@ -305,6 +666,7 @@ class EventParticipantViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['event', 'status', 'role']
     ordering = ['-registration_date']
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         """Define permissions based on action"""
@@ -426,14 +788,19 @@ class EventParticipantViewSet(viewsets.ModelViewSet):
         EventPermissionChecker.require_participant_management(
             request.user, event)
 
-        participant.registration_confirmed = True
-        participant.status = 'confirmed'
-        participant.confirmation_date = timezone.now()
-        participant.save()
-
-        # Send confirmation email notification
-        # Note: Implement email notification service (e.g., via celery tasks or signals)
-        # send_confirmation_email.delay(participant.id)
+        with transaction.atomic():
+            # A waitlisted participant needs a free seat to be confirmed
+            if (participant.status not in EventParticipant.SEAT_STATUSES
+                    and not claim_seat(event)):
+                return Response(
+                    {'error': 'Event is full'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            participant.registration_confirmed = True
+            participant.status = 'confirmed'
+            participant.confirmation_date = timezone.now()
+            participant.save()
+            notify_registration_confirmed(participant)
 
         serializer = self.get_serializer(participant)
         return Response(serializer.data)
@@ -448,10 +815,9 @@ class EventParticipantViewSet(viewsets.ModelViewSet):
         EventPermissionChecker.require_participant_management(
             request.user, event)
 
-        participant.status = 'cancelled'
-        participant.notes = request.data.get(
-            'reason', 'Registration rejected by organizer')
-        participant.save()
+        # Frees the seat and promotes the oldest waitlisted participant
+        cancel_participant(participant, notes=request.data.get(
+            'reason', 'Registration rejected by organizer'))
 
         # Note: Implement notification service to send rejection emails
         # send_rejection_email.delay(participant.id)
@@ -470,8 +836,7 @@ class EventParticipantViewSet(viewsets.ModelViewSet):
             EventPermissionChecker.require_participant_management(
                 request.user, event)
 
-        participant.status = 'cancelled'
-        participant.save()
+        cancel_participant(participant)
 
         serializer = self.get_serializer(participant)
         return Response(serializer.data)
@@ -495,13 +860,20 @@ class EventParticipantViewSet(viewsets.ModelViewSet):
             request.user, event)
 
         # Update participants
-        updated_count = EventParticipant.objects.filter(
-            id__in=participant_ids,
-            event=event
-        ).update(
-            status='attended',
-            check_in_time=timezone.now()
-        )
+        now = timezone.now()
+        with transaction.atomic():
+            participants = EventParticipant.objects.select_for_update().filter(
+                id__in=participant_ids,
+                event=event
+            )
+            previous = list(participants.values_list('check_in_time', flat=True))
+            updated_count = participants.update(
+                status='attended',
+                check_in_time=now
+            )
+            # Bulk updates bypass the stats and rollup signal handlers
+            refresh_event_stats([event.pk])
+            apply_check_ins(event.pk, ((before, now) for before in previous))
 
         return Response({
             'message': f'Successfully checked in {updated_count} participants'
@@ -628,11 +1000,9 @@ class EventSponsorViewSet(viewsets.ModelViewSet):
         # Create sponsor
         serializer = self.get_serializer(data=sponsor_data)
         serializer.is_valid(raise_exception=True)
-        sponsor = serializer.save()
-
-        # Send notification to event organizers about new sponsor registration
-        # Note: Implement via celery tasks or signal handlers to notify organizers
-        # Example: send_sponsor_notification.delay(sponsor.id)
+        with transaction.atomic():
+            sponsor = serializer.save(submitted_by=request.user)
+            notify_sponsor_submitted(sponsor)
 
         return Response({
             'message': 'Sponsorship registration submitted successfully. '
@@ -647,10 +1017,9 @@ class EventSponsorViewSet(viewsets.ModelViewSet):
         self._check_financial_permission(sponsor.event_id)
 
         sponsor.is_public = True
-        sponsor.save()
-
-        # Note: Implement notification service to send approval emails
-        # This could use celery tasks or signal handlers to notify the sponsor
+        with transaction.atomic():
+            sponsor.save()
+            notify_sponsor_approved(sponsor)
 
         serializer = self.get_serializer(sponsor)
         return Response({
@@ -772,7 +1141,9 @@ class EventExpenseViewSet(viewsets.ModelViewSet):
         expense.approved_by = request.user
         expense.approved_at = timezone.now()
         expense.notes = request.data.get('notes', expense.notes)
-        expense.save()
+        with transaction.atomic():
+            expense.save()
+            notify_expense_decided(expense)
 
         serializer = self.get_serializer(expense)
         return Response(serializer.data)
@@ -787,7 +1158,9 @@ class EventExpenseViewSet(viewsets.ModelViewSet):
 
         expense.status = 'rejected'
         expense.rejection_reason = request.data.get('reason', '')
-        expense.save()
+        with transaction.atomic():
+            expense.save()
+            notify_expense_decided(expense)
 
         serializer = self.get_serializer(expense)
         return Response(serializer.data)
@@ -821,9 +1194,75 @@ class EventTicketViewSet(viewsets.ModelViewSet):
     serializer_class = EventTicketSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['event', 'is_active']
+    filterset_fields = ['event', 'status']
     ordering = ['display_order', 'price']
 
+    @action(detail=True, methods=['post'])
+    def reserve(self, request, pk=None):  # pylint: disable=unused-argument
+        """Hold tickets for checkout; the hold expires unless confirmed"""
+        ticket = self.get_object()
+        try:
+            quantity = int(request.data.get('quantity', 1))
+            reservation = reserve_tickets(ticket, quantity, user=request.user)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'quantity must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except TicketUnavailable as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(
+            TicketReservationSerializer(reservation).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    def _get_reservation(self, request):
+        """Look up a reservation by its checkout token"""
+        try:
+            return TicketReservation.objects.get(token=request.data.get('token'))
+        except (ObjectDoesNotExist, ValidationError):
+            return None
+
+    @action(detail=False, methods=['post'])
+    def confirm_reservation(self, request):
+        """Convert a held reservation into sold tickets"""
+        reservation = self._get_reservation(request)
+        if reservation is None:
+            return Response(
+                {'error': 'Reservation not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            confirm_reservation(reservation)
+        except ReservationNotActive as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(TicketReservationSerializer(reservation).data)
+
+    @action(detail=False, methods=['post'])
+    def release_reservation(self, request):
+        """Give held tickets back before the hold expires"""
+        reservation = self._get_reservation(request)
+        if reservation is None:
+            return Response(
+                {'error': 'Reservation not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            release_reservation(reservation)
+        except ReservationNotActive as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(TicketReservationSerializer(reservation).data)
+
 
 class EventPhotoViewSet(viewsets.ModelViewSet):
     """
@@ -888,6 +1327,39 @@ class EventPhotoViewSet(viewsets.ModelViewSet):
             self.request.user, instance.event)
         instance.delete()
 
+    @action(
+        detail=False, methods=['post'], url_path='bulk-upload',
+        parser_classes=[parsers.MultiPartParser, parsers.FormParser])
+    def bulk_upload(self, request):
+        """
+        Add the images of an uploaded zip archive ('file') to an event's
+        gallery ('event'). Duplicates of existing photos are skipped.
+        """
+        event_id = request.data.get('event')
+        event = Event.objects.filter(pk=event_id).first() if str(
+            event_id or '').isdigit() else None
+        if event is None:
+            return Response(
+                {'error': 'A valid event is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        EventPermissionChecker.require_media_upload(request.user, event)
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'Zip file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            report = import_photos_zip(event, upload, photographer=request.user)
+        except PhotoImportError as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(report, status=status.HTTP_201_CREATED)
+
 
 class EventUpdateViewSet(viewsets.ModelViewSet):
     """
@@ -1098,7 +1570,10 @@ class EventOrganizerViewSet(viewsets.ModelViewSet):
         event = serializer.validated_data['event']
         EventPermissionChecker.require_organizer_management(
             self.request.user, event)
-        serializer.save()
+        with transaction.atomic():
+            organizer = serializer.save()
+            notify_organizer_invited(organizer, invited_by=self.request.user)
+        EventPermissionContext.invalidate(self.request.user, event)
 
     def perform_update(self, serializer):
         """Check permissions before updating organizer"""
@@ -1107,6 +1582,7 @@ class EventOrganizerViewSet(viewsets.ModelViewSet):
             self.request.user, organizer.event
         )
         serializer.save()
+        EventPermissionContext.invalidate(self.request.user, organizer.event)
 
     def perform_destroy(self, instance):
         """Check permissions and prevent removing last lead organizer"""
@@ -1126,41 +1602,12 @@ class EventOrganizerViewSet(viewsets.ModelViewSet):
                 )
 
         instance.delete()
+        EventPermissionContext.invalidate(self.request.user, event)
 
     @action(detail=False, methods=['get'])
     def my_events(self, request):
-        """Get all events where current user is an organizer"""
-        user = request.user
-
-        organizer_event_ids = set(
-            EventOrganizer.objects.filter(
-                user=user).values_list('event_id', flat=True)
-        )
-        owner_event_ids = set(
-            Event.objects.filter(created_by=user).values_list('id', flat=True)
-        )
-        all_event_ids = organizer_event_ids | owner_event_ids
-
-        if not all_event_ids:
-            return Response([])
-
-        events = Event.objects.filter(id__in=all_event_ids).select_related(
-            'event_type', 'event_type__category', 'country', 'state', 'city'
-        ).order_by('-start_datetime')
-
-        serialized_events = EventListSerializer(
-            events, many=True, context={'request': request}
-        ).data
-
-        enriched_events = []
-        for event_obj, serialized in zip(events, serialized_events):
-            event_data = dict(serialized)
-            permissions = get_user_event_permissions(user, event_obj) or {}
-            event_data['user_permissions'] = permissions
-            event_data['user_role'] = permissions.get('role')
-            enriched_events.append(event_data)
-
-        return Response(enriched_events)
+        """Events the user owns or organizes, with role and permissions"""
+        return my_events_response(request, with_permissions=True)
 
     @action(detail=True, methods=['patch'])
     def update_permissions(self, request, pk=None):  # pylint: disable=unused-argument
@@ -1183,6 +1630,8 @@ class EventOrganizerViewSet(viewsets.ModelViewSet):
             organizer.role = request.data['role']
 
         organizer.save()
+        # The acting user may have changed their own role or flags
+        EventPermissionContext.invalidate(request.user, event)
         serializer = self.get_serializer(organizer)
         return Response(serializer.data)
 
@@ -1216,14 +1665,13 @@ class EventOrganizerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create organizer
+        # Create organizer and queue the invitation email
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-
-        # Send invitation notification to user
-        # Note: Implement notification service to send invitation emails
-        # This could use celery tasks or signal handlers to notify the invited user
+        with transaction.atomic():
+            organizer = serializer.save()
+            notify_organizer_invited(organizer, invited_by=request.user)
+        EventPermissionContext.invalidate(request.user, event)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
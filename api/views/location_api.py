@@ -14,6 +14,7 @@ from api.serializers.schools.locations import (CitySerializer,
                                                StateSimpleSerializer,
                                                VillageSerializer,
                                                VillageSimpleSerializer)
+from api.utils.search import NameSearchFilter
 from geo.models import City, Country, State, Village
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,7 @@ class CountryViewSet(viewsets.ModelViewSet):
     queryset = Country.objects.filter(is_active=True)
     serializer_class = CountrySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, NameSearchFilter]
     filterset_fields = ["is_active"]
     search_fields = ["name", "code"]
     ordering_fields = ["name", "code"]
@@ -46,7 +47,7 @@ class StateViewSet(viewsets.ModelViewSet):
     queryset = State.objects.filter(is_active=True).select_related("country")
     serializer_class = StateSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, NameSearchFilter]
     filterset_fields = ["country", "is_active"]
     search_fields = ["name", "code", "country__name"]
     ordering_fields = ["name", "code", "country__name"]
@@ -87,7 +88,7 @@ class CityViewSet(viewsets.ModelViewSet):
     )
     serializer_class = CitySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, NameSearchFilter]
     filterset_fields = ["state", "state__country", "is_capital", "is_active"]
     search_fields = ["name", "code", "state__name", "state__country__name"]
     ordering_fields = ["name", "code", "state__name"]
@@ -137,7 +138,7 @@ class VillageViewSet(viewsets.ModelViewSet):
     )
     serializer_class = VillageSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, NameSearchFilter]
     # Simplified - we'll handle geo filtering manually
     filterset_fields = ["is_active"]
     search_fields = ["name", "code", "city__name", "city__state__name"]
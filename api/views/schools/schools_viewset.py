@@ -5,7 +5,7 @@
 import logging
 from typing import Any, Dict
 
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.http import Http404
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
@@ -24,8 +24,12 @@ from rbac.permissions import SchoolManagementPermission
 from schools.models.levels import (SchoolCollegeAssociation,
                                    SchoolDegreeOffering, SchoolMajorOffering)
 from schools.models.online_profile import PlatformProfile
+from schools.models.related import RelatedSchool
 from schools.models.school import (School, SchoolBranch, SchoolCustomizeButton,
                                    SchoolScholarship)
+from schools.services.facets import filter_by_facets, school_facets
+from schools.services.related_schools import fallback_related_schools
+from schools.services.school_search import SearchPaginator, search_schools
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +41,8 @@ class SchoolAPIView(APIView):
         search_query = request.query_params.get("q", "")
         schools = School.objects.all()  # pylint: disable=no-member
         if search_query:
-            schools = schools.filter(name__icontains=search_query)
+            schools = search_schools(schools, search_query).order_by(
+                "-search_rank", "name", "pk")
         serializer = SchoolSerializer(schools, many=True)
         return Response(serializer.data)
 
@@ -46,6 +51,26 @@ class CustomSchoolPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+    # Reads the page and the total count in one query
+    django_paginator_class = SearchPaginator
+
+
+class SchoolFullTextFilter(filters.BaseFilterBackend):
+    """
+    Ranked full-text search (?search=) backed by the school search index:
+    bare words match as prefixes, quoted text as a phrase, Khmer text as
+    a substring. Runs after OrderingFilter so that, unless ?ordering= is
+    given, matches are ordered by relevance.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get("search", "").strip()
+        if not text:
+            return queryset
+        queryset = search_schools(queryset, text)
+        if not request.query_params.get("ordering"):
+            queryset = queryset.order_by("-search_rank", "name", "id")
+        return queryset
 
 
 class SchoolViewSet(viewsets.ModelViewSet):
@@ -55,29 +80,28 @@ class SchoolViewSet(viewsets.ModelViewSet):
     pagination_class = CustomSchoolPagination
     # Accept both multipart (for file uploads) and JSON bodies for updates
     parser_classes = (MultiPartParser, FormParser, JSONParser)
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, SchoolFullTextFilter]
     ordering_fields = ['name', 'local_name', 'established',
                        'created_date', 'updated_date', 'slug', 'uuid']
-    search_fields = ['name', 'local_name', 'description']
 
     def get_queryset(self):
         queryset = School.objects.all()  # pylint: disable=no-member
 
-        # Safely check if the action exists and is "list"
-        if getattr(self, 'action', None) == "list":
-            # Annotate with unique counts of related branches, colleges, majors, and degrees
-            queryset = queryset.annotate(
-                branch_count=Count('school_branches', distinct=True),
-                college_count=Count(
-                    'college_associations__college', distinct=True),
-                major_count=Count('major_offerings__major', distinct=True),
-                degree_count=Count('degree_offerings__degree', distinct=True),
-            )
-
         # Explicitly order to prevent pagination warnings
         # Use 'id' as secondary ordering to ensure consistent results
         return queryset.order_by('name', 'id')
 
+    @staticmethod
+    def annotate_list_counts(queryset):
+        """Annotate with unique counts of related branches, colleges, majors, and degrees"""
+        return queryset.annotate(
+            branch_count=Count('school_branches', distinct=True),
+            college_count=Count(
+                'college_associations__college', distinct=True),
+            major_count=Count('major_offerings__major', distinct=True),
+            degree_count=Count('degree_offerings__degree', distinct=True),
+        )
+
     def get_serializer_class(self):
         if hasattr(self, 'action') and self.action == "list":
             return SchoolListSerializer
@@ -87,7 +111,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
         """
         Instantiate and return the list of permissions that this view requires.
         """
-        if self.action in ["list", "retrieve", "analytics", "branches"]:
+        if self.action in ["list", "retrieve", "analytics", "branches", "related"]:
             # Public read access for these actions
             return [AllowAny()]
         else:
@@ -100,26 +124,23 @@ class SchoolViewSet(viewsets.ModelViewSet):
         if create_date:
             queryset = queryset.filter(created_date__date=create_date)
 
-        type_id = request.query_params.get("type")
-        if type_id:
-            queryset = queryset.filter(type__id=type_id)
+        # ?type=, ?educational_level=, ?degree=, ?country=, ?state=, ?city=
+        queryset = filter_by_facets(queryset, request.query_params)
 
         queryset = self.filter_queryset(queryset)
+        # Counted before the per-row annotations, which join four tables
+        facets = school_facets(queryset)
+        queryset = self.annotate_list_counts(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        search = request.query_params.get("search")
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search)
-                | Q(local_name__icontains=search)
-                | Q(description__icontains=search)
-            )
+            response = self.get_paginated_response(serializer.data)
+            response.data["facets"] = facets
+            return response
 
-        ordering = request.query_params.get("ordering", "created_date")
-        queryset = queryset.order_by(ordering)
+        ordering = request.query_params.get("ordering")
+        if ordering:
+            queryset = queryset.order_by(ordering)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -208,6 +229,31 @@ class SchoolViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=True, methods=["get"], url_path="related")
+    def related(self, request, **kwargs):
+        """Most similar schools, read from the precomputed neighbour table."""
+        school = self.get_object()
+        entries = list(RelatedSchool.objects.filter(school=school).order_by(
+            "rank").values_list("related_id", "score"))
+        if not entries:
+            # Not built yet: unscored schools sharing a level, type or location
+            entries = [(related.pk, None)
+                       for related in fallback_related_schools(school)]
+        schools = self.annotate_list_counts(
+            School.objects.filter(pk__in=[related_id for related_id, _ in entries])
+        ).prefetch_related("type", "educational_levels")
+        by_id = {related.pk: related for related in schools}
+        serializer = SchoolListSerializer(
+            [by_id[related_id] for related_id, _ in entries if related_id in by_id],
+            many=True, context=self.get_serializer_context())
+        scores = dict(entries)
+        results = [
+            dict(item, similarity=(
+                None if scores[item["pk"]] is None else round(scores[item["pk"]], 4)))
+            for item in serializer.data
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=["get"], url_path="branches")
     def branches(self, _request, **kwargs):
         """Get all branches for a specific school."""
@@ -15,6 +15,7 @@ from api.serializers.schools.base import (AddressSerializer,
                                           SchoolMajorOfferingSerializer,
                                           SchoolScholarshipSerializer)
 from api.serializers.schools.branch_serializers import SchoolBranchSerializer
+from api.utils.search import NameSearchFilter
 
 EducationalLevel = apps.get_model("schools", "EducationalLevel")
 Major = apps.get_model("schools", "Major")
@@ -68,6 +69,7 @@ class ScholarshipViewSet(viewsets.ModelViewSet):
     queryset = Scholarship.objects.all()
     serializer_class = ScholarshipSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [NameSearchFilter]
 
 
 class SchoolScholarshipViewSet(viewsets.ModelViewSet):
@@ -6,9 +6,10 @@ from django.contrib import admin
 from django.utils.html import format_html
 
 from .models import (Event, EventCategory, EventExpense, EventFeedback,
-                     EventImpact, EventMilestone, EventOrganizer,
-                     EventParticipant, EventPartnership, EventPhoto,
-                     EventSponsor, EventTicket, EventType, EventUpdate)
+                     EventImpact, EventMilestone, EventNotification,
+                     EventOrganizer, EventParticipant, EventPartnership,
+                     EventPhoto, EventSponsor, EventTicket, EventType,
+                     EventUpdate)
 
 
 @admin.register(EventCategory)
@@ -147,9 +148,15 @@ class EventAdmin(admin.ModelAdmin):
         return obj.location_name or obj.city
     location_info.short_description = 'Location'
 
+    def get_queryset(self, request):
+        """Annotate participant counts for the changelist"""
+        return super().get_queryset(request).with_counts()
+
     def participants_count(self, obj):
         """Display count of registered participants"""
-        count = obj.participants.filter(status='registered').count()
+        count = getattr(obj, 'registered_count', None)
+        if count is None:
+            count = obj.participants.filter(status='registered').count()
         max_p = obj.max_participants
         if max_p:
             return f"{count}/{max_p}"
@@ -325,3 +332,14 @@ class EventImpactAdmin(admin.ModelAdmin):
     list_filter = ['metric_type', 'verified']
     search_fields = ['metric_name', 'description', 'event__title']
     raw_id_fields = ['event']
+
+
+@admin.register(EventNotification)
+class EventNotificationAdmin(admin.ModelAdmin):
+    """Admin for the event email outbox"""
+    list_display = ['kind', 'recipient', 'event', 'status',
+                    'attempts', 'available_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['recipient', 'event__title']
+    raw_id_fields = ['event']
+    readonly_fields = ['dedupe_key', 'claimed_at', 'sent_at', 'created_at']
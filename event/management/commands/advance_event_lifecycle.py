@@ -0,0 +1,49 @@
+"""
+Management command to advance event statuses with time.
+
+Usage examples:
+    python manage.py advance_event_lifecycle               # Run once (e.g. from cron)
+    python manage.py advance_event_lifecycle --loop        # Long-running worker
+    python manage.py advance_event_lifecycle --loop --max-sleep 30
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from event.services.lifecycle import (advance_lifecycle,
+                                      seconds_until_next_transition)
+
+
+class Command(BaseCommand):
+    """
+    Move due events published -> ongoing -> completed and open/close their
+    registration windows, then record each event's next transition time.
+    """
+    help = 'Apply due event lifecycle transitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, sleeping until the next transition is due',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help='Longest pause between runs in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        while True:
+            counts = advance_lifecycle()
+            if any(counts.values()) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(', '.join(
+                    f'{name}: {count}' for name, count in counts.items()
+                )))
+            if not options['loop']:
+                return
+            time.sleep(seconds_until_next_transition(
+                ceiling=max(1.0, options['max_sleep'])))
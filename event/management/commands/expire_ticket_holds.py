@@ -0,0 +1,34 @@
+"""
+Management command to expire lapsed ticket reservations.
+
+Usage examples:
+    python manage.py expire_ticket_holds                  # Run once (e.g. from cron)
+    python manage.py expire_ticket_holds --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from event.services.tickets import SWEEP_BATCH_SIZE, expire_reservations
+
+
+class Command(BaseCommand):
+    """
+    Flip held reservations past their expiry to ``expired`` and return the
+    held quantities to ticket inventory, one batch per transaction.
+    """
+    help = 'Expire lapsed ticket reservations and release their inventory'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help='Number of reservations expired per transaction',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        expired = expire_reservations(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {expired} ticket reservations'
+        ))
@@ -0,0 +1,69 @@
+"""
+Management command to render queued certificate and badge archives.
+
+Usage examples:
+    python manage.py generate_event_documents                 # Drain once (e.g. from cron)
+    python manage.py generate_event_documents --loop          # Long-running worker
+    python manage.py generate_event_documents --workers 8 --chunk-size 100
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from event.services.certificates import CHUNK_SIZE, process_batches
+
+
+class Command(BaseCommand):
+    """
+    Render the PDFs of each queued EventDocumentBatch across a process pool
+    and save them as one zip archive, reporting progress on the batch.
+    Rendering is CPU-bound, so throughput grows with --workers up to the
+    number of cores.
+    """
+    help = 'Generate queued event certificate and badge archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Rendering processes (default: one per CPU, 0 renders inline)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Documents rendered per pool task',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling for new batches',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Pause between polls in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        executor = (ProcessPoolExecutor(options['workers'])
+                    if options['workers'] != 0 else None)
+        try:
+            while True:
+                counts = process_batches(
+                    executor, chunk_size=max(1, options['chunk_size']))
+                if counts['batches'] or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(', '.join(
+                        f'{name}: {count}' for name, count in counts.items()
+                    )))
+                if not options['loop']:
+                    return
+                time.sleep(max(0.1, options['sleep']))
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -0,0 +1,67 @@
+"""
+Management command to render event image variants and remove replaced files.
+
+Usage examples:
+    python manage.py process_event_media                  # Drain once (e.g. from cron)
+    python manage.py process_event_media --loop           # Long-running worker
+    python manage.py process_event_media --workers 4 --batch-size 40
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from event.services.images import BATCH_SIZE, process_pending
+
+
+class Command(BaseCommand):
+    """
+    Render resized WebP/JPEG variants of newly uploaded event images in a
+    process pool, then delete the files queued for removal.
+    """
+    help = 'Process queued event images and file deletions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Rendering processes (default: one per CPU, 0 renders inline)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Images claimed per batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling the queues when they are empty',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Pause between polls of empty queues in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        executor = (ProcessPoolExecutor(options['workers'])
+                    if options['workers'] != 0 else None)
+        try:
+            while True:
+                counts = process_pending(
+                    max(1, options['batch_size']), executor)
+                if counts['claimed'] or counts['deleted'] or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(', '.join(
+                        f'{name}: {count}' for name, count in counts.items()
+                    )))
+                if not options['loop']:
+                    return
+                time.sleep(max(0.1, options['sleep']))
+        finally:
+            if executor is not None:
+                executor.shutdown()
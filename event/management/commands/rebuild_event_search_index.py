@@ -0,0 +1,62 @@
+"""
+Management command to rebuild the event full-text search index.
+
+Usage examples:
+    python manage.py rebuild_event_search_index
+    python manage.py rebuild_event_search_index --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from event.models import Event, EventSearchDocument
+from event.services.event_search import document_fields
+
+
+class Command(BaseCommand):
+    """
+    Rewrite every EventSearchDocument from its event. Needed after bulk
+    writes that bypass Event.save (QuerySet.update, raw SQL, fixtures).
+    """
+    help = 'Rebuild full-text search documents for all events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of documents written per batch',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        events = Event.objects.order_by('pk').only(
+            'pk', 'title', 'tags', 'short_description', 'description')
+
+        indexed = 0
+        batch = []
+        for event in events.iterator(chunk_size=batch_size):
+            batch.append(EventSearchDocument(
+                event_id=event.pk, **document_fields(event)))
+            if len(batch) >= batch_size:
+                indexed += self._write(batch)
+                batch = []
+        if batch:
+            indexed += self._write(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} events'
+        ))
+
+    @staticmethod
+    def _write(documents):
+        """Upsert one batch of documents"""
+        with transaction.atomic():
+            EventSearchDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=['event'],
+                update_fields=['title', 'tags', 'body', 'updated_at'],
+            )
+        return len(documents)
@@ -0,0 +1,62 @@
+"""
+Management command to rebuild the EventStats read model.
+
+Usage examples:
+    python manage.py rebuild_event_stats                  # Backfill / repair all events
+    python manage.py rebuild_event_stats --event 12 --event 15
+    python manage.py rebuild_event_stats --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from event.models import Event
+from event.services.stats import refresh_event_stats
+
+
+class Command(BaseCommand):
+    """
+    Recompute EventStats rows from participants, sponsors, expenses and
+    feedback. Creates missing rows and repairs rows that drifted from
+    their source tables (e.g. after raw SQL or bulk updates).
+    """
+    help = 'Backfill and repair denormalized per-event statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            action='append',
+            type=int,
+            dest='event_ids',
+            help='Only rebuild the given event id (repeatable)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of events recomputed per batch of grouped queries',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        event_ids = Event.objects.order_by('pk').values_list('pk', flat=True)
+        if options['event_ids']:
+            event_ids = event_ids.filter(pk__in=options['event_ids'])
+
+        batch_size = max(1, options['batch_size'])
+        processed = 0
+        drifted = 0
+        batch = []
+        for event_id in event_ids.iterator(chunk_size=batch_size):
+            batch.append(event_id)
+            if len(batch) >= batch_size:
+                drifted += len(refresh_event_stats(batch))
+                processed += len(batch)
+                batch = []
+        if batch:
+            drifted += len(refresh_event_stats(batch))
+            processed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt statistics for {processed} events '
+            f'({drifted} created or repaired)'
+        ))
@@ -0,0 +1,63 @@
+"""
+Management command to rebuild the hourly/daily activity rollups.
+
+Usage examples:
+    python manage.py rebuild_event_timeseries                  # Backfill / repair all events
+    python manage.py rebuild_event_timeseries --event 12 --event 15
+    python manage.py rebuild_event_timeseries --batch-size 200
+"""
+
+from django.core.management.base import BaseCommand
+
+from event.models import Event
+from event.services.timeseries import refresh_event_timeseries
+
+
+class Command(BaseCommand):
+    """
+    Recompute EventTimeSeries rows from participant registrations and
+    check-ins and from sponsorships. Fills in events created before the
+    rollups existed and repairs buckets changed behind the signal
+    handlers (e.g. by raw SQL).
+    """
+    help = 'Backfill and repair hourly/daily event activity rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            action='append',
+            type=int,
+            dest='event_ids',
+            help='Only rebuild the given event id (repeatable)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of events recomputed per batch of grouped queries',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        event_ids = Event.objects.order_by('pk').values_list('pk', flat=True)
+        if options['event_ids']:
+            event_ids = event_ids.filter(pk__in=options['event_ids'])
+
+        batch_size = max(1, options['batch_size'])
+        processed = 0
+        buckets = 0
+        batch = []
+        for event_id in event_ids.iterator(chunk_size=batch_size):
+            batch.append(event_id)
+            if len(batch) >= batch_size:
+                buckets += refresh_event_timeseries(batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            buckets += refresh_event_timeseries(batch)
+            processed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt activity rollups for {processed} events '
+            f'({buckets} buckets)'
+        ))
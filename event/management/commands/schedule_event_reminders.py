@@ -0,0 +1,64 @@
+"""
+Management command to queue "event starts soon" reminders.
+
+Usage examples:
+    python manage.py schedule_event_reminders               # Run once (e.g. from cron)
+    python manage.py schedule_event_reminders --loop        # Long-running worker
+    python manage.py schedule_event_reminders --lead-hours 48 --chunk-size 5000
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from event.services.reminders import CHUNK_SIZE, schedule_reminders
+
+
+class Command(BaseCommand):
+    """
+    Queue reminders in the notification outbox for participants of events
+    starting within the lead time; send_event_notifications delivers them.
+    Safe to re-run: reminded participants are flagged in the same
+    transaction that queues their email.
+    """
+    help = 'Queue reminders for events starting soon'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead-hours',
+            type=float,
+            default=24,
+            help='Remind participants of events starting within this many hours',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Participants queued and flagged per transaction',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, checking for due events periodically',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=60,
+            help='Pause between runs in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        lead = timedelta(hours=options['lead_hours'])
+        while True:
+            counts = schedule_reminders(
+                lead=lead, chunk_size=max(1, options['chunk_size']))
+            if counts['reminded'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(', '.join(
+                    f'{name}: {count}' for name, count in counts.items()
+                )))
+            if not options['loop']:
+                return
+            time.sleep(max(1.0, options['sleep']))
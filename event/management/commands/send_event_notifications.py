@@ -0,0 +1,53 @@
+"""
+Management command to deliver queued event emails.
+
+Usage examples:
+    python manage.py send_event_notifications                 # Drain once (e.g. from cron)
+    python manage.py send_event_notifications --loop          # Long-running worker
+    python manage.py send_event_notifications --batch-size 500 --loop --sleep 10
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from event.services.notifications import BATCH_SIZE, deliver_pending
+
+
+class Command(BaseCommand):
+    """
+    Claim due notifications from the outbox in batches and send each batch
+    over one mail connection. Several workers may run at once.
+    """
+    help = 'Send queued event notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Notifications claimed and sent per connection',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling the outbox when it is empty',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Pause between polls of an empty outbox in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        while True:
+            counts = deliver_pending(batch_size=max(1, options['batch_size']))
+            if counts['claimed'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(', '.join(
+                    f'{name}: {count}' for name, count in counts.items()
+                )))
+            if not options['loop']:
+                return
+            time.sleep(max(0.1, options['sleep']))
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:05
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0003_event_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventStats",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="event.event",
+                        verbose_name="Event",
+                    ),
+                ),
+                ("registered_count", models.IntegerField(default=0)),
+                ("waitlist_count", models.IntegerField(default=0)),
+                ("confirmed_count", models.IntegerField(default=0)),
+                ("attended_count", models.IntegerField(default=0)),
+                ("no_show_count", models.IntegerField(default=0)),
+                ("cancelled_count", models.IntegerField(default=0)),
+                ("sponsor_count", models.IntegerField(default=0)),
+                ("public_sponsor_count", models.IntegerField(default=0)),
+                (
+                    "sponsorship_total",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=14
+                    ),
+                ),
+                ("approved_expense_count", models.IntegerField(default=0)),
+                (
+                    "approved_expense_total",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=14
+                    ),
+                ),
+                ("pending_expense_count", models.IntegerField(default=0)),
+                (
+                    "pending_expense_total",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=14
+                    ),
+                ),
+                ("rating_count", models.IntegerField(default=0)),
+                ("rating_sum", models.IntegerField(default=0)),
+                ("rating_1_count", models.IntegerField(default=0)),
+                ("rating_2_count", models.IntegerField(default=0)),
+                ("rating_3_count", models.IntegerField(default=0)),
+                ("rating_4_count", models.IntegerField(default=0)),
+                ("rating_5_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Event Statistics",
+                "verbose_name_plural": "Event Statistics",
+            },
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Kept in sync with event.services.event_search
+FTS_TABLE = 'event_search_fts'
+DOCUMENT_TABLE = 'event_eventsearchdocument'
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', tags), 'B') || "
+    "setweight(to_tsvector('simple', body), 'C')"
+)
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, tags, body,
+        content='{DOCUMENT_TABLE}', content_rowid='event_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, tags, body)
+        VALUES (new.event_id, new.title, new.tags, new.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, tags, body)
+        VALUES ('delete', old.event_id, old.title, old.tags, old.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, tags, body)
+        VALUES ('delete', old.event_id, old.title, old.tags, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, tags, body)
+        VALUES (new.event_id, new.title, new.tags, new.body);
+    END""",
+]
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_FORWARD = [
+    f"CREATE INDEX event_search_vector_gin ON {DOCUMENT_TABLE} "
+    f"USING gin (({POSTGRES_VECTOR}))",
+]
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS event_search_vector_gin"]
+
+
+def _run(schema_editor, statements):
+    """Execute raw DDL statements in order"""
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """Database-specific full-text index over the document table"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    """Reverse of create_search_index"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+def backfill_documents(apps, schema_editor):
+    """Index existing events (mirrors event_search.document_fields)"""
+    Event = apps.get_model('event', 'Event')
+    EventSearchDocument = apps.get_model('event', 'EventSearchDocument')
+
+    batch = []
+    for event in Event.objects.order_by('pk').iterator(chunk_size=1000):
+        tags = [
+            ' '.join(str(tag).lower().replace('|', ' ').split())
+            for tag in event.tags or [] if str(tag).strip()
+        ]
+        batch.append(EventSearchDocument(
+            event_id=event.pk,
+            title=event.title or '',
+            tags=f"|{'|'.join(tags)}|" if tags else '',
+            body='\n'.join(
+                part for part in (event.short_description, event.description)
+                if part
+            ),
+        ))
+        if len(batch) >= 1000:
+            EventSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EventSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0005_ticket_reservations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventSearchDocument",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="event.event",
+                        verbose_name="Event",
+                    ),
+                ),
+                ("title", models.TextField(blank=True, default="")),
+                ("tags", models.TextField(blank=True, default="")),
+                ("body", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Event Search Document",
+                "verbose_name_plural": "Event Search Documents",
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
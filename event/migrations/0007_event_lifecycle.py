@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:20
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_active_events_due(apps, schema_editor):
+    """Let the first scheduler run compute lifecycle fields for live events"""
+    Event = apps.get_model('event', 'Event')
+    Event.objects.filter(status__in=['published', 'ongoing']).update(
+        next_transition_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0006_event_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="next_transition_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When status or registration_open is next due to change",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="registration_open",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Registration window is open (maintained automatically)",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["next_transition_at"], name="event_event_next_tr_b6cd13_idx"
+            ),
+        ),
+        migrations.RunPython(mark_active_events_due, migrations.RunPython.noop),
+    ]
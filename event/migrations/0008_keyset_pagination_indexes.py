@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0007_event_lifecycle"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventparticipant",
+            index=models.Index(
+                fields=["event", "registration_date", "id"],
+                name="event_event_event_i_68d29a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventparticipant",
+            index=models.Index(
+                fields=["user", "registration_date", "id"],
+                name="event_event_user_id_fe2536_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:37
+
+from django.db import migrations, models
+
+
+def build_category_paths(apps, schema_editor):
+    """Materialize the path and depth of every existing category"""
+    EventCategory = apps.get_model('event', 'EventCategory')
+    parents = dict(EventCategory.objects.values_list('pk', 'parent_category_id'))
+
+    def lineage(pk):
+        chain = []
+        while pk is not None and pk not in chain:
+            chain.append(pk)
+            pk = parents.get(pk)
+        return list(reversed(chain))
+
+    rows = []
+    for pk in parents:
+        chain = lineage(pk)
+        rows.append(EventCategory(
+            pk=pk, path=''.join(f'{node}/' for node in chain),
+            depth=len(chain) - 1))
+    EventCategory.objects.bulk_update(rows, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0008_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventcategory",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="eventcategory",
+            name="path",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(build_category_paths, migrations.RunPython.noop),
+    ]
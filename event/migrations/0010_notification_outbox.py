@@ -0,0 +1,113 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0009_category_tree_path"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventsponsor",
+            name="submitted_by",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="User who registered this sponsorship",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="submitted_sponsorships",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.CreateModel(
+            name="EventNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("registration_received", "Registration received"),
+                            ("registration_confirmed", "Registration confirmed"),
+                            ("sponsor_submitted", "Sponsorship submitted"),
+                            ("sponsor_approved", "Sponsorship approved"),
+                            ("organizer_invited", "Organizer invitation"),
+                            ("expense_approved", "Expense approved"),
+                            ("expense_rejected", "Expense rejected"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "recipient",
+                    models.EmailField(max_length=254, verbose_name="Recipient"),
+                ),
+                ("context", models.JSONField(blank=True, default=dict)),
+                (
+                    "dedupe_key",
+                    models.CharField(
+                        blank=True, max_length=255, null=True, unique=True
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="event.event",
+                        verbose_name="Event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Event Notification",
+                "verbose_name_plural": "Event Notifications",
+                "ordering": ["available_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"],
+                        name="event_event_status_f6464c_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0010_notification_outbox"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="eventnotification",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("registration_received", "Registration received"),
+                    ("registration_confirmed", "Registration confirmed"),
+                    ("event_reminder", "Event reminder"),
+                    ("sponsor_submitted", "Sponsorship submitted"),
+                    ("sponsor_approved", "Sponsorship approved"),
+                    ("organizer_invited", "Organizer invitation"),
+                    ("expense_approved", "Expense approved"),
+                    ("expense_rejected", "Expense rejected"),
+                ],
+                max_length=50,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventparticipant",
+            index=models.Index(
+                fields=["event", "reminder_sent", "id"],
+                name="event_event_event_i_bcd3c1_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:59
+
+import hashlib
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def backfill_content_hash(apps, schema_editor):
+    """Hash the stored bytes of existing photos; missing files stay blank"""
+    EventPhoto = apps.get_model("event", "EventPhoto")
+    photos = EventPhoto.objects.filter(content_hash="").exclude(image="")
+    batch = []
+    for photo in photos.only("pk", "image").iterator(chunk_size=BATCH_SIZE):
+        digest = hashlib.sha256()
+        try:
+            with photo.image.open("rb") as image:
+                for chunk in image.chunks():
+                    digest.update(chunk)
+        except OSError:
+            continue
+        photo.content_hash = digest.hexdigest()
+        batch.append(photo)
+        if len(batch) >= BATCH_SIZE:
+            EventPhoto.objects.bulk_update(batch, ["content_hash"])
+            batch = []
+    EventPhoto.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0013_document_batches"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventphoto",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="eventphoto",
+            index=models.Index(
+                fields=["event", "content_hash"], name="event_event_event_i_53d964_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
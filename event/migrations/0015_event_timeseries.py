@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:03
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0014_photo_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventTimeSeries",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")], max_length=4
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("registrations", models.IntegerField(default=0)),
+                ("check_ins", models.IntegerField(default=0)),
+                ("sponsor_count", models.IntegerField(default=0)),
+                (
+                    "sponsorship_amount",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=14
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeseries",
+                        to="event.event",
+                        verbose_name="Event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Event Time Series",
+                "verbose_name_plural": "Event Time Series",
+                "unique_together": {("event", "granularity", "bucket")},
+            },
+        ),
+    ]
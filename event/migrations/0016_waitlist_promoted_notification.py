@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0015_event_timeseries"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="eventnotification",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("registration_received", "Registration received"),
+                    ("registration_confirmed", "Registration confirmed"),
+                    ("waitlist_promoted", "Promoted from waitlist"),
+                    ("event_reminder", "Event reminder"),
+                    ("sponsor_submitted", "Sponsorship submitted"),
+                    ("sponsor_approved", "Sponsorship approved"),
+                    ("organizer_invited", "Organizer invitation"),
+                    ("expense_approved", "Expense approved"),
+                    ("expense_rejected", "Expense rejected"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
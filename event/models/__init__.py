@@ -5,9 +5,14 @@ Event models package
 from .base_models import EventCategory, EventType
 from .content import EventFeedback, EventMilestone, EventPhoto, EventUpdate
 from .event import Event
-from .financial import EventExpense, EventSponsor, EventTicket
+from .financial import (EventExpense, EventSponsor, EventTicket,
+                        TicketReservation)
+from .media import EventDocumentBatch, EventFileDeletion, EventImageJob
+from .notifications import EventNotification
 from .partnerships import EventImpact, EventPartnership
 from .people import EventOrganizer, EventParticipant
+from .search import EventSearchDocument
+from .stats import EventStats, EventTimeSeries
 
 __all__ = [
     'Event',
@@ -18,10 +23,18 @@ __all__ = [
     'EventSponsor',
     'EventExpense',
     'EventTicket',
+    'TicketReservation',
     'EventPhoto',
     'EventUpdate',
     'EventMilestone',
     'EventFeedback',
     'EventPartnership',
     'EventImpact',
+    'EventStats',
+    'EventTimeSeries',
+    'EventSearchDocument',
+    'EventNotification',
+    'EventImageJob',
+    'EventFileDeletion',
+    'EventDocumentBatch',
 ]
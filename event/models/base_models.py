@@ -3,7 +3,10 @@ Base models for event taxonomy: categories and types.
 """
 # pylint: disable=no-member
 
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext_lazy as _
 
 
@@ -29,6 +32,12 @@ class EventCategory(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Materialized path of ancestor ids, e.g. "3/17/42/"; a subtree is a
+    # single indexed prefix scan (path__startswith=category.path)
+    path = models.CharField(
+        max_length=255, blank=True, db_index=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
     objects = models.Manager()
 
     class Meta:
@@ -40,6 +49,58 @@ class EventCategory(models.Model):
     def __str__(self):
         return str(self.name)
 
+    def _creates_cycle(self):
+        """Whether the parent is this category or one of its descendants"""
+        parent = self.parent_category
+        if parent is None or self.pk is None:
+            return False
+        return parent.pk == self.pk or bool(
+            self.path and parent.path.startswith(self.path))
+
+    def clean(self):
+        """Reject parents that would create a cycle"""
+        super().clean()
+        if self._creates_cycle():
+            raise ValidationError({
+                'parent_category': _(
+                    'A category cannot be nested under itself or its '
+                    'subcategories.')
+            })
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        moved = update_fields is None or 'parent_category' in update_fields \
+            or 'parent_category_id' in update_fields
+        # Checked before writing so a rejected move leaves the row untouched
+        if moved and self._creates_cycle():
+            raise ValidationError(
+                'A category cannot be nested under itself or its subcategories')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if moved:
+                self._sync_path()
+
+    def _sync_path(self):
+        """Store this node's path and move its subtree along with it"""
+        parent = self.parent_category
+        prefix = parent.path if parent is not None else ''
+        path = f'{prefix}{self.pk}/'
+        depth = parent.depth + 1 if parent is not None else 0
+        if path == self.path and depth == self.depth:
+            return
+
+        old_path, old_depth = self.path, self.depth
+        type(self).objects.filter(pk=self.pk).update(path=path, depth=depth)
+        if old_path:
+            # Descendants keep their suffix below this node
+            type(self).objects.filter(
+                path__startswith=old_path
+            ).exclude(pk=self.pk).update(
+                path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (depth - old_depth),
+            )
+        self.path, self.depth = path, depth
+
 
 class EventType(models.Model):
     """
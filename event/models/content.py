@@ -3,6 +3,8 @@ Content models: photos, updates, milestones, and feedback.
 """
 # pylint: disable=no-member
 
+import hashlib
+
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -24,6 +26,7 @@ class EventPhoto(models.Model):
     )
     image = models.ImageField(
         upload_to='events/photos/', verbose_name=_("Photo"))
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(
         max_length=500, blank=True, verbose_name=_("Caption"))
 
@@ -61,6 +64,9 @@ class EventPhoto(models.Model):
         default=True, help_text="Visible to public")
     display_order = models.IntegerField(default=0)
 
+    # SHA-256 of the uploaded bytes, used to skip re-uploaded photos
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     objects = models.Manager()
@@ -70,10 +76,32 @@ class EventPhoto(models.Model):
         verbose_name = _("Event Photo")
         verbose_name_plural = _("Event Photos")
         ordering = ['event', 'display_order', '-taken_at']
+        indexes = [
+            models.Index(fields=['event', 'content_hash']),
+        ]
 
     def __str__(self):
         return f"Photo for {self.event.title} - {self.uploaded_at.date()}"
 
+    def save(self, *args, **kwargs):
+        """Override save to hash a newly assigned image"""
+        # pylint: disable=protected-access
+        if self.image and not self.image._committed:
+            self.content_hash = self.compute_content_hash()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_hash'}
+        super().save(*args, **kwargs)
+
+    def compute_content_hash(self):
+        """SHA-256 of the image bytes, read in chunks"""
+        digest = hashlib.sha256()
+        self.image.open('rb')
+        for chunk in self.image.chunks():
+            digest.update(chunk)
+        self.image.seek(0)
+        return digest.hexdigest()
+
 
 class EventUpdate(models.Model):
     """
@@ -107,6 +135,7 @@ class EventUpdate(models.Model):
     # Media attachment
     image = models.ImageField(
         upload_to='events/updates/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     # Posting details
     posted_by = models.ForeignKey(
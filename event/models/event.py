@@ -7,14 +7,87 @@ import uuid
 from decimal import Decimal
 from django.utils import timezone
 from django.conf import settings
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (BooleanField, Case, CharField, Count, F,
+                              OuterRef, Q, Subquery, Value, When)
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
+from ..services.geo_search import encode_geohash
 from .base_models import EventType
 
 
+def _related_count(model, **filters):
+    """Correlated COUNT(*) of ``model`` rows for the outer event"""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(event=OuterRef('pk'), **filters)
+            .order_by()
+            .values('event')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+class EventQuerySet(models.QuerySet):
+    """Query helpers for events"""
+
+    def with_counts(self):
+        """
+        Annotate the counts list pages need so they cost no per-row queries:
+        ``registered_count``, ``seat_count``, ``public_sponsor_count`` and
+        ``is_full``. Counts are correlated subqueries so the participant and
+        sponsor joins never multiply each other's rows.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .financial import EventSponsor
+        from .people import EventParticipant
+
+        return self.annotate(
+            registered_count=_related_count(
+                EventParticipant, status='registered'),
+            seat_count=_related_count(
+                EventParticipant, status__in=EventParticipant.SEAT_STATUSES),
+            public_sponsor_count=_related_count(EventSponsor, is_public=True),
+        ).annotate(
+            is_full=Case(
+                # No limit when max_participants is unset or 0, as in
+                # Event.is_full and claim_seat
+                When(
+                    Q(max_participants__gt=0) &
+                    Q(seat_count__gte=F('max_participants')),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
+
+    def managed_by(self, user):
+        """
+        Events ``user`` owns or organizes, in one query, annotated with
+        ``user_role``: ``'owner'`` or the user's organizer role.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .people import EventOrganizer
+
+        organizers = EventOrganizer.objects.filter(user=user)
+        return self.filter(
+            Q(created_by=user) | Q(pk__in=organizers.values('event_id'))
+        ).annotate(
+            user_role=Case(
+                When(created_by=user, then=Value('owner')),
+                default=Subquery(
+                    organizers.filter(event=OuterRef('pk')).values('role')[:1]),
+                output_field=CharField(),
+            )
+        )
+
+
 class Event(models.Model):
     """
     Core event entity: fundraisers, workshops, conferences, charity drives, tournaments, etc.
@@ -28,6 +101,13 @@ class Event(models.Model):
         ('cancelled', _('Cancelled')),
     ]
 
+    # Statuses the lifecycle scheduler advances on its own
+    ACTIVE_STATUSES = ('published', 'ongoing')
+    LIFECYCLE_SOURCE_FIELDS = {
+        'status', 'start_datetime', 'end_datetime',
+        'registration_start', 'registration_deadline',
+    }
+
     VISIBILITY_CHOICES = [
         ('public', _('Public - Anyone can view')),
         ('unlisted', _('Unlisted - Only with link')),
@@ -141,6 +221,15 @@ class Event(models.Model):
         help_text="Decimal degrees (-180 to 180)"
     )
 
+    # Geohash of (latitude, longitude), maintained on save. Prefix ranges
+    # of this indexed column back the coarse cell filter of radius searches.
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False,
+        verbose_name=_("Geohash")
+    )
+
     # Location display & convenience
     location_name = models.CharField(
         max_length=255,
@@ -203,6 +292,9 @@ class Event(models.Model):
         blank=True,
         verbose_name=_("Thumbnail for cards")
     )
+    # Resized WebP/JPEG renditions per image field, written by the
+    # image worker (see event.services.images)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     video_url = models.URLField(
         blank=True, verbose_name=_("Promotional video URL"))
 
@@ -245,6 +337,20 @@ class Event(models.Model):
     is_featured = models.BooleanField(
         default=False, help_text="Show on homepage")
 
+    # Lifecycle bookkeeping, kept current by save() and the
+    # advance_event_lifecycle scheduler so listings can filter in SQL
+    registration_open = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Registration window is open (maintained automatically)"
+    )
+    next_transition_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When status or registration_open is next due to change"
+    )
+
     # Metadata
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -263,7 +369,7 @@ class Event(models.Model):
     meta_description = models.CharField(max_length=160, blank=True)
     og_image = models.ImageField(upload_to='events/og/', null=True, blank=True)
 
-    objects = models.Manager()
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         """ Meta options for the Event model """
@@ -274,7 +380,9 @@ class Event(models.Model):
             models.Index(fields=['status', 'visibility']),
             models.Index(fields=['start_datetime']),
             models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['geohash']),
             models.Index(fields=['country', 'state', 'city']),
+            models.Index(fields=['next_transition_at']),
         ]
 
     def clean(self):
@@ -319,35 +427,100 @@ class Event(models.Model):
                 _('Both latitude and longitude must be provided together.'))
 
     def save(self, *args, **kwargs):
-        """Override save to call full_clean"""
+        """Override save to call full_clean and refresh derived fields"""
         self.full_clean()
+        self.geohash = self.compute_geohash()
+        now = timezone.now()
+        self.registration_open = self.registration_window_open(now)
+        self.next_transition_at = self.compute_next_transition(now)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'latitude', 'longitude'} & update_fields:
+                update_fields.add('geohash')
+            if self.LIFECYCLE_SOURCE_FIELDS & update_fields:
+                update_fields |= {'registration_open', 'next_transition_at'}
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
 
+    def registration_window_open(self, now):
+        """Whether registration is open at ``now``"""
+        if self.status not in self.ACTIVE_STATUSES:
+            return False
+        if self.registration_start and now < self.registration_start:
+            return False
+        if self.registration_deadline and now > self.registration_deadline:
+            return False
+        return True
+
+    def compute_next_transition(self, now):
+        """
+        Earliest future moment the status or registration window changes,
+        ``now`` if the status is already stale, or None if nothing is pending.
+        Mirrors event.services.lifecycle.next_transition_expression.
+        """
+        if self.status not in self.ACTIVE_STATUSES:
+            return None
+        if self.end_datetime <= now or (
+                self.status == 'published' and self.start_datetime <= now):
+            return now
+
+        candidates = [
+            self.end_datetime, self.registration_start, self.registration_deadline
+        ]
+        if self.status == 'published':
+            candidates.append(self.start_datetime)
+        return min(
+            (moment for moment in candidates if moment and moment > now),
+            default=None
+        )
+
+    def compute_geohash(self):
+        """Geohash of the event coordinates ('' when not geolocated)"""
+        if self.latitude is None or self.longitude is None:
+            return ''
+        return encode_geohash(self.latitude, self.longitude)
+
     def __str__(self):
         return str(self.title)
 
     @property
     def is_registration_open(self):
         """Check if registration is currently open"""
-        now = timezone.now()
-
-        if self.registration_start and now < self.registration_start:
-            return False
-        if self.registration_deadline and now > self.registration_deadline:
-            return False
-        if self.status not in ['published', 'ongoing']:
-            return False
-
-        return True
+        return self.registration_window_open(timezone.now())
 
     @property
     def is_full(self):
-        """Check if event reached capacity"""
+        """Check if every seat is taken by a registered/confirmed/attended participant"""
+        if '_is_full' in self.__dict__:
+            return self._is_full
         if not self.max_participants:
             return False
-        participant_count = self.participants.filter(
-            status='registered').count()
-        return participant_count >= self.max_participants
+        seat_count = self.__dict__.get('seat_count')
+        if seat_count is None:
+            stats = self.loaded_stats
+            if stats is not None:
+                seat_count = stats.active_participants
+        if seat_count is None:
+            seat_count = self.participants.filter(
+                status__in=self.participants.model.SEAT_STATUSES).count()
+        return seat_count >= self.max_participants
+
+    @is_full.setter
+    def is_full(self, value):
+        """Receive the SQL-computed flag from EventQuerySet.with_counts()"""
+        self._is_full = value
+
+    @property
+    def loaded_stats(self):
+        """EventStats row loaded via select_related('stats'); never queries"""
+        if not type(self).stats.is_cached(self):
+            return None
+        try:
+            return self.stats
+        except ObjectDoesNotExist:
+            return None
 
     @property
     def funding_percentage(self):
@@ -1,8 +1,9 @@
 """
-Financial models: sponsors, expenses, and tickets.
+Financial models: sponsors, expenses, tickets and ticket reservations.
 """
 # pylint: disable=no-member
 
+import uuid
 from decimal import Decimal
 from django.utils import timezone
 from django.conf import settings
@@ -84,6 +85,14 @@ class EventSponsor(models.Model):
         default=0, help_text="Sort order for display")
 
     # Metadata
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='submitted_sponsorships',
+        help_text="User who registered this sponsorship"
+    )
     contributed_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True, help_text="Internal notes")
 
@@ -243,6 +252,10 @@ class EventTicket(models.Model):
         help_text="Total number of tickets available"
     )
     quantity_sold = models.IntegerField(default=0)
+    quantity_held = models.IntegerField(
+        default=0,
+        help_text="Tickets held by unexpired checkout reservations"
+    )
     max_per_order = models.IntegerField(
         default=10,
         validators=[MinValueValidator(1)],
@@ -291,7 +304,7 @@ class EventTicket(models.Model):
 
         if self.status != 'active':
             return False
-        if self.quantity_sold >= self.quantity:
+        if self.quantity_sold + self.quantity_held >= self.quantity:
             return False
         if self.sale_start and now < self.sale_start:
             return False
@@ -302,5 +315,66 @@ class EventTicket(models.Model):
 
     @property
     def remaining_quantity(self):
-        """Get number of tickets still available"""
-        return max(0, self.quantity - self.quantity_sold)
+        """Get number of tickets neither sold nor held"""
+        return max(0, self.quantity - self.quantity_sold - self.quantity_held)
+
+
+class TicketReservation(models.Model):
+    """
+    Short-lived hold on ticket inventory during checkout.
+    Held quantities count against the ticket until the reservation is
+    confirmed (sold), released, or expired by the sweeper.
+    """
+    RESERVATION_STATUS = [
+        ('held', _('Held')),
+        ('confirmed', _('Confirmed')),
+        ('released', _('Released')),
+        ('expired', _('Expired')),
+    ]
+
+    ticket = models.ForeignKey(
+        EventTicket,
+        on_delete=models.CASCADE,
+        related_name='reservations',
+        verbose_name=_("Ticket")
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='ticket_reservations'
+    )
+    token = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+        help_text="Opaque checkout reference for guest buyers"
+    )
+    quantity = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)])
+    status = models.CharField(
+        max_length=20, choices=RESERVATION_STATUS, default='held')
+    expires_at = models.DateTimeField()
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the TicketReservation model """
+        verbose_name = _("Ticket Reservation")
+        verbose_name_plural = _("Ticket Reservations")
+        ordering = ['-created_at']
+        indexes = [
+            # Sweeper scan: held reservations past their expiry
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.ticket.name} ({self.status})"
+
+    @property
+    def is_expired(self):
+        """Hold ran out before confirmation"""
+        return self.status == 'held' and self.expires_at <= timezone.now()
@@ -0,0 +1,155 @@
+"""
+Queues of the off-request media pipeline: image renditions to generate,
+stored files to delete and bulk certificate/badge archives.
+"""
+# pylint: disable=no-member
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .event import Event
+
+
+class EventImageJob(models.Model):
+    """
+    Request to render the variants of one uploaded image.
+    Queued when an image field gets a new file; the image worker claims
+    due jobs, renders them in a process pool and records the results on
+    the owning row (see event.services.images).
+    """
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('processing', _('Processing')),
+        ('done', _('Done')),
+        ('failed', _('Failed')),
+    ]
+
+    # "app_label.model" of the row owning the image
+    model = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=50)
+    # Stored file name the variants are rendered from
+    source = models.CharField(max_length=255)
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventImageJob model """
+        verbose_name = _("Event Image Job")
+        verbose_name_plural = _("Event Image Jobs")
+        ordering = ['available_at', 'id']
+        unique_together = ['model', 'object_id', 'field', 'source']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.model}#{self.object_id}.{self.field} ({self.status})"
+
+
+class EventFileDeletion(models.Model):
+    """
+    A stored file no row references any more. Written in the transaction
+    that replaced or deleted the file and removed from storage later, so
+    saves never wait on storage I/O.
+    """
+    name = models.CharField(max_length=255)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventFileDeletion model """
+        verbose_name = _("Event File Deletion")
+        verbose_name_plural = _("Event File Deletions")
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['available_at']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class EventDocumentBatch(models.Model):
+    """
+    Bulk generation of attendance certificates and/or name badges for an
+    event, packed into one zip archive. Requested from the management
+    dashboard and rendered by the document worker, which records its
+    progress here (see event.services.certificates).
+    """
+    KIND_CHOICES = [
+        ('certificates', _('Attendance certificates')),
+        ('badges', _('Name badges')),
+        ('all', _('Certificates and badges')),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('running', _('Running')),
+        ('done', _('Done')),
+        ('failed', _('Failed')),
+    ]
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='document_batches',
+        verbose_name=_("Event")
+    )
+    kind = models.CharField(
+        max_length=20, choices=KIND_CHOICES, default='certificates')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='event_document_batches'
+    )
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    archive = models.FileField(
+        upload_to='events/documents/', null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Refreshed with every progress update; a stale one means the worker died
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventDocumentBatch model """
+        verbose_name = _("Event Document Batch")
+        verbose_name_plural = _("Event Document Batches")
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for event #{self.event_id} ({self.status})"
+
+    @property
+    def progress(self):
+        """Share of documents rendered, from 0 to 1"""
+        if self.status == 'done':
+            return 1.0
+        return self.processed / self.total if self.total else 0.0
@@ -0,0 +1,74 @@
+"""
+Notification outbox for event workflows.
+"""
+# pylint: disable=no-member
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .event import Event
+
+
+class EventNotification(models.Model):
+    """
+    One outgoing email, written in the same transaction as the state change
+    that triggers it and delivered later by the outbox worker
+    (see event.services.notifications).
+    """
+    KIND_CHOICES = [
+        ('registration_received', _('Registration received')),
+        ('registration_confirmed', _('Registration confirmed')),
+        ('waitlist_promoted', _('Promoted from waitlist')),
+        ('event_reminder', _('Event reminder')),
+        ('sponsor_submitted', _('Sponsorship submitted')),
+        ('sponsor_approved', _('Sponsorship approved')),
+        ('organizer_invited', _('Organizer invitation')),
+        ('expense_approved', _('Expense approved')),
+        ('expense_rejected', _('Expense rejected')),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('sending', _('Sending')),
+        ('sent', _('Sent')),
+        ('failed', _('Failed')),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notifications',
+        verbose_name=_("Event")
+    )
+    recipient = models.EmailField(verbose_name=_("Recipient"))
+    context = models.JSONField(default=dict, blank=True)
+    # Unique when set, so retried or repeated enqueues collapse to one email
+    dedupe_key = models.CharField(
+        max_length=255, unique=True, null=True, blank=True)
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventNotification model """
+        verbose_name = _("Event Notification")
+        verbose_name_plural = _("Event Notifications")
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} -> {self.recipient} ({self.status})"
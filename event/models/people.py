@@ -80,6 +80,9 @@ class EventParticipant(models.Model):
         ('cancelled', _('Cancelled')),
     ]
 
+    # Statuses that occupy one of the event's max_participants seats
+    SEAT_STATUSES = ('registered', 'confirmed', 'attended')
+
     PARTICIPANT_ROLE = [
         ('attendee', _('Attendee')),
         ('speaker', _('Speaker/Presenter')),
@@ -158,6 +161,9 @@ class EventParticipant(models.Model):
         indexes = [
             models.Index(fields=['event', 'status']),
             models.Index(fields=['email']),
+            models.Index(fields=['event', 'registration_date', 'id']),
+            models.Index(fields=['user', 'registration_date', 'id']),
+            models.Index(fields=['event', 'reminder_sent', 'id']),
         ]
 
     def __str__(self):
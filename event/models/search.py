@@ -0,0 +1,42 @@
+"""
+Denormalized full-text search document for events.
+"""
+# pylint: disable=no-member
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .event import Event
+
+
+class EventSearchDocument(models.Model):
+    """
+    Text of an event as indexed for search (see event.services.event_search).
+
+    The database-specific index is built on top of this table by migration:
+    a GIN index over a weighted tsvector expression on PostgreSQL, or an
+    external-content FTS5 table kept in sync by triggers on SQLite.
+    ``tags`` holds normalized tags delimited as ``|tag one|tag two|`` so a
+    single column serves both full-text matching and exact tag filters.
+    """
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        verbose_name=_("Event")
+    )
+    title = models.TextField(default='', blank=True)
+    tags = models.TextField(default='', blank=True)
+    body = models.TextField(default='', blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventSearchDocument model """
+        verbose_name = _("Event Search Document")
+        verbose_name_plural = _("Event Search Documents")
+
+    def __str__(self):
+        return f"Search document ({self.event_id})"
@@ -0,0 +1,143 @@
+"""
+Denormalized per-event statistics (read model).
+"""
+# pylint: disable=no-member
+
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .event import Event
+
+
+class EventStats(models.Model):
+    """
+    Running totals for one event, maintained incrementally with
+    F-expressions by the participant, sponsor, expense and feedback write
+    paths (see event.services.stats). Dashboards and detail pages read a
+    single row instead of running COUNT/SUM/AVG queries per request.
+
+    ``rebuild_event_stats`` recomputes rows from source tables for
+    backfills and drift repair.
+    """
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name=_("Event")
+    )
+
+    # Participants per status
+    registered_count = models.IntegerField(default=0)
+    waitlist_count = models.IntegerField(default=0)
+    confirmed_count = models.IntegerField(default=0)
+    attended_count = models.IntegerField(default=0)
+    no_show_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+
+    # Sponsors
+    sponsor_count = models.IntegerField(default=0)
+    public_sponsor_count = models.IntegerField(default=0)
+    sponsorship_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    # Expenses
+    approved_expense_count = models.IntegerField(default=0)
+    approved_expense_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0'))
+    pending_expense_count = models.IntegerField(default=0)
+    pending_expense_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    # Public feedback ratings (sum/count plus 1-5 star histogram)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventStats model """
+        verbose_name = _("Event Statistics")
+        verbose_name_plural = _("Event Statistics")
+
+    def __str__(self):
+        return f"Stats ({self.event_id})"
+
+    @property
+    def total_participants(self):
+        """All participants regardless of status"""
+        return (
+            self.registered_count + self.waitlist_count +
+            self.confirmed_count + self.attended_count +
+            self.no_show_count + self.cancelled_count
+        )
+
+    @property
+    def active_participants(self):
+        """Registered, confirmed or attended participants"""
+        return self.registered_count + self.confirmed_count + self.attended_count
+
+    @property
+    def average_rating(self):
+        """Average public overall rating, rounded to one decimal"""
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 1)
+
+    @property
+    def rating_histogram(self):
+        """Count of public ratings per star"""
+        return {
+            star: getattr(self, f'rating_{star}_count') for star in range(1, 6)
+        }
+
+
+class EventTimeSeries(models.Model):
+    """
+    Per-event activity in one hourly or daily bucket (read model for
+    dashboard charts). Rows are kept current by the participant and
+    sponsor write paths (see event.services.timeseries), so a chart over
+    any range reads one row per bucket instead of scanning registrations.
+
+    ``rebuild_event_timeseries`` recomputes rows from source tables.
+    """
+    GRANULARITY_CHOICES = [
+        ('hour', _('Hour')),
+        ('day', _('Day')),
+    ]
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='timeseries',
+        verbose_name=_("Event")
+    )
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    # Start of the bucket in the site's time zone
+    bucket = models.DateTimeField()
+
+    registrations = models.IntegerField(default=0)
+    check_ins = models.IntegerField(default=0)
+    sponsor_count = models.IntegerField(default=0)
+    sponsorship_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    objects = models.Manager()
+
+    class Meta:
+        """ Meta options for the EventTimeSeries model """
+        verbose_name = _("Event Time Series")
+        verbose_name_plural = _("Event Time Series")
+        unique_together = ['event', 'granularity', 'bucket']
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket:%Y-%m-%d %H:%M} ({self.event_id})"
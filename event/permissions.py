@@ -3,11 +3,187 @@ Event Management Permission Utilities
 Centralized permission checking for event-related actions
 """
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import cached_property
 from rest_framework.exceptions import PermissionDenied
 
 from event.models import EventOrganizer
 
+# Attribute used to memoize permission contexts on the authenticated user
+# instance. DRF authenticates a fresh user object for every request, so the
+# cache naturally lives for exactly one (request, user) pair.
+_CONTEXT_CACHE_ATTR = '_event_permission_contexts'
+
+
+class EventPermissionContext:
+    """
+    Resolved permissions of one user for one event.
+
+    Loads the user's ``EventOrganizer`` row at most once (ownership is read
+    from ``event.created_by_id`` without a query) and memoizes every
+    capability flag, so all checks for the same event share a single query.
+    """
+
+    def __init__(self, user, event):
+        self.user = user
+        self.event = event
+
+    @classmethod
+    def for_user(cls, user, event):
+        """Return the request-scoped context for ``user`` and ``event``"""
+        if not user or not user.is_authenticated or event is None:
+            return cls(None, event)
+
+        cache = getattr(user, _CONTEXT_CACHE_ATTR, None)
+        if cache is None:
+            cache = {}
+            setattr(user, _CONTEXT_CACHE_ATTR, cache)
+
+        # Keyed by pk: views often load the same event more than once per
+        # request (get_queryset, get_object), all of which share one context
+        context = cache.get(event.pk)
+        if context is None:
+            context = cache[event.pk] = cls(user, event)
+        return context
+
+    @classmethod
+    def prime(cls, user, events):
+        """
+        Resolve contexts for many events with a single organizer query.
+        Used by list endpoints that report permissions for every row.
+        """
+        events = [event for event in events if event is not None]
+        if not user or not user.is_authenticated or not events:
+            return {}
+
+        organizers = {
+            organizer.event_id: organizer
+            for organizer in EventOrganizer.objects.filter(
+                user=user,
+                event_id__in=[event.pk for event in events]
+            )
+        }
+
+        contexts = {}
+        for event in events:
+            context = cls.for_user(user, event)
+            context.__dict__['organizer'] = organizers.get(event.pk)
+            contexts[event.pk] = context
+        return contexts
+
+    @staticmethod
+    def invalidate(user, event=None):
+        """
+        Drop cached contexts of ``user``; the organizer endpoints call this
+        after changing organizer rows
+        """
+        cache = getattr(user, _CONTEXT_CACHE_ATTR, None)
+        if not cache:
+            return
+        if event is None:
+            cache.clear()
+        else:
+            cache.pop(event.pk, None)
+
+    @property
+    def is_authenticated(self):
+        """Whether the context belongs to an authenticated user"""
+        return self.user is not None
+
+    @cached_property
+    def organizer(self):
+        """The user's organizer row for this event, or None"""
+        if not self.is_authenticated:
+            return None
+        # Explicit pk ordering avoids the join implied by Meta.ordering
+        return EventOrganizer.objects.filter(
+            event=self.event,
+            user=self.user
+        ).order_by('pk').first()
+
+    @cached_property
+    def is_owner(self):
+        """Check if user is the event owner (creator)"""
+        if not self.is_authenticated:
+            return False
+        return self.event.created_by_id == self.user.pk
+
+    @cached_property
+    def is_organizer(self):
+        """Check if user is any type of organizer for the event"""
+        return self.organizer is not None
+
+    @cached_property
+    def is_lead_organizer(self):
+        """Check if user is a lead organizer for the event"""
+        return self.is_organizer and self.organizer.role == 'lead'
+
+    def _owner_or_flag(self, flag):
+        """Owner always passes; organizers need the granular flag"""
+        if self.is_owner:
+            return True
+        return self.is_organizer and bool(getattr(self.organizer, flag))
+
+    @cached_property
+    def can_edit_event(self):
+        """Check if user has permission to edit event details"""
+        return self._owner_or_flag('can_edit_event')
+
+    @cached_property
+    def can_manage_participants(self):
+        """Check if user can manage participants (approve, check-in, etc.)"""
+        return self._owner_or_flag('can_manage_participants')
+
+    @cached_property
+    def can_manage_finances(self):
+        """Check if user can manage finances (sponsors, expenses)"""
+        return self._owner_or_flag('can_manage_finances')
+
+    @cached_property
+    def can_manage_organizers(self):
+        """Only event owner or lead organizers can manage the team"""
+        return self.is_owner or self.is_lead_organizer
+
+    @cached_property
+    def can_post_updates(self):
+        """Check if user can post updates/announcements"""
+        return self._owner_or_flag('can_post_updates')
+
+    @cached_property
+    def can_upload_media(self):
+        """Check if user can upload photos/media"""
+        return self._owner_or_flag('can_upload_media')
+
+    @cached_property
+    def role(self):
+        """Get user's role in the event"""
+        if not self.is_authenticated:
+            return None
+        if self.is_owner:
+            return 'owner'
+        return self.organizer.role if self.organizer else None
+
+    def as_dict(self):
+        """Serialize all permission flags"""
+        if not self.is_authenticated:
+            return {}
+        return {
+            'is_owner': self.is_owner,
+            'is_lead_organizer': self.is_lead_organizer,
+            'is_organizer': self.is_organizer,
+            'can_edit_event': self.can_edit_event,
+            'can_manage_participants': self.can_manage_participants,
+            'can_manage_finances': self.can_manage_finances,
+            'can_manage_organizers': self.can_manage_organizers,
+            'can_post_updates': self.can_post_updates,
+            'can_upload_media': self.can_upload_media,
+            'role': self.role,
+        }
+
+
+def get_event_permission_context(user, event):
+    """Shortcut for ``EventPermissionContext.for_user``"""
+    return EventPermissionContext.for_user(user, event)
+
 
 class EventPermissionChecker:
     """Utility class for checking event-related permissions"""
@@ -15,127 +191,47 @@ class EventPermissionChecker:
     @staticmethod
     def is_event_owner(user, event):
         """Check if user is the event owner (creator)"""
-        if not user or not user.is_authenticated:
-            return False
-        return event.created_by == user
+        return get_event_permission_context(user, event).is_owner
 
     @staticmethod
     def is_lead_organizer(user, event):
         """Check if user is a lead organizer for the event"""
-        if not user or not user.is_authenticated:
-            return False
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            role='lead'
-        ).exists()
+        return get_event_permission_context(user, event).is_lead_organizer
 
     @staticmethod
     def is_organizer(user, event):
         """Check if user is any type of organizer for the event"""
-        if not user or not user.is_authenticated:
-            return False
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user
-        ).exists()
+        return get_event_permission_context(user, event).is_organizer
 
     @staticmethod
     def can_edit_event(user, event):
         """Check if user has permission to edit event details"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Event owner can always edit
-        if EventPermissionChecker.is_event_owner(user, event):
-            return True
-
-        # Check if organizer has edit permission
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            can_edit_event=True
-        ).exists()
+        return get_event_permission_context(user, event).can_edit_event
 
     @staticmethod
     def can_manage_participants(user, event):
         """Check if user can manage participants (approve, check-in, etc.)"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Event owner can always manage
-        if EventPermissionChecker.is_event_owner(user, event):
-            return True
-
-        # Check if organizer has participant management permission
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            can_manage_participants=True
-        ).exists()
+        return get_event_permission_context(user, event).can_manage_participants
 
     @staticmethod
     def can_manage_finances(user, event):
         """Check if user can manage finances (sponsors, expenses)"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Event owner can always manage
-        if EventPermissionChecker.is_event_owner(user, event):
-            return True
-
-        # Check if organizer has finance management permission
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            can_manage_finances=True
-        ).exists()
+        return get_event_permission_context(user, event).can_manage_finances
 
     @staticmethod
     def can_manage_organizers(user, event):
         """Check if user can add/remove organizers"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Only event owner or lead organizers can manage team
-        return (
-            EventPermissionChecker.is_event_owner(user, event) or
-            EventPermissionChecker.is_lead_organizer(user, event)
-        )
+        return get_event_permission_context(user, event).can_manage_organizers
 
     @staticmethod
     def can_post_updates(user, event):
         """Check if user can post updates/announcements"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Event owner can always post
-        if EventPermissionChecker.is_event_owner(user, event):
-            return True
-
-        # Check if organizer has update posting permission
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            can_post_updates=True
-        ).exists()
+        return get_event_permission_context(user, event).can_post_updates
 
     @staticmethod
     def can_upload_media(user, event):
         """Check if user can upload photos/media"""
-        if not user or not user.is_authenticated:
-            return False
-
-        # Event owner can always upload
-        if EventPermissionChecker.is_event_owner(user, event):
-            return True
-
-        # Check if organizer has media upload permission
-        return EventOrganizer.objects.filter(
-            event=event,
-            user=user,
-            can_upload_media=True
-        ).exists()
+        return get_event_permission_context(user, event).can_upload_media
 
     @staticmethod
     def require_event_owner(user, event):
@@ -195,34 +291,9 @@ class EventPermissionChecker:
 
 def get_user_event_role(user, event):
     """Get user's role in an event"""
-    if not user or not user.is_authenticated:
-        return None
-
-    if EventPermissionChecker.is_event_owner(user, event):
-        return 'owner'
-    try:
-        organizer = EventOrganizer.objects.get(event=event, user=user)
-        return organizer.role
-    except ObjectDoesNotExist:
-        return None
+    return get_event_permission_context(user, event).role
 
 
 def get_user_event_permissions(user, event):
     """Get all permissions for a user in an event"""
-    if not user or not user.is_authenticated:
-        return {}
-
-    permissions = {
-        'is_owner': EventPermissionChecker.is_event_owner(user, event),
-        'is_lead_organizer': EventPermissionChecker.is_lead_organizer(user, event),
-        'is_organizer': EventPermissionChecker.is_organizer(user, event),
-        'can_edit_event': EventPermissionChecker.can_edit_event(user, event),
-        'can_manage_participants': EventPermissionChecker.can_manage_participants(user, event),
-        'can_manage_finances': EventPermissionChecker.can_manage_finances(user, event),
-        'can_manage_organizers': EventPermissionChecker.can_manage_organizers(user, event),
-        'can_post_updates': EventPermissionChecker.can_post_updates(user, event),
-        'can_upload_media': EventPermissionChecker.can_upload_media(user, event),
-        'role': get_user_event_role(user, event),
-    }
-
-    return permissions
+    return get_event_permission_context(user, event).as_dict()
@@ -0,0 +1,78 @@
+"""
+Event category tree.
+
+Active categories are read with one query ordered by materialized path
+(parents before children) and linked into nested nodes in memory. The
+assembled tree is cached under a version number that category signals
+bump, so the public category endpoints render it without touching the
+database until a category changes.
+"""
+
+from django.core.cache import cache
+
+from event.models import EventCategory
+from shared.cache_versions import bump_versions, get_version
+
+TREE_CACHE_TIMEOUT = 60 * 60 * 24
+_VERSION_KEY = 'event-category-tree:version'
+
+
+def get_tree_version():
+    """Current version of the category tree, initializing it if missing"""
+    return get_version(_VERSION_KEY)
+
+
+def bump_tree_version():
+    """
+    Invalidate every cached rendering of the tree; the bump on commit also
+    covers the subtree path update that follows a move
+    """
+    bump_versions([_VERSION_KEY])
+
+
+def build_tree(categories, render):
+    """
+    Link ``categories`` into nested nodes.
+
+    ``render(category)`` returns the node dict of one category; each node
+    gets a ``subcategories`` list of its child nodes, in the order the
+    categories were given. Returns ``(roots, nodes_by_id)``; categories
+    whose parent is not among ``categories`` (e.g. inactive) are left out
+    of the nesting.
+    """
+    nodes = {}
+    for category in categories:
+        node = render(category)
+        node['subcategories'] = []
+        nodes[category.pk] = node
+
+    roots = []
+    for category in categories:
+        if category.parent_category_id is None:
+            roots.append(nodes[category.pk])
+        elif category.parent_category_id in nodes:
+            nodes[category.parent_category_id]['subcategories'].append(
+                nodes[category.pk])
+    return roots, nodes
+
+
+def load_category_tree(render):
+    """Active categories as a nested tree, read with a single query"""
+    categories = list(
+        EventCategory.objects.filter(is_active=True).order_by('depth', 'name'))
+    return build_tree(categories, render)
+
+
+def cached_category_tree(render, variant=''):
+    """
+    ``(version, roots, nodes_by_id)`` for the active tree, built with
+    ``render`` on a cache miss. ``variant`` separates renderings.
+    """
+    version = get_tree_version()
+    key = f'event-category-tree:{version}:{variant}'
+    tree = cache.get(key)
+    if tree is None:
+        tree = load_category_tree(render)
+        cache.set(key, tree, TREE_CACHE_TIMEOUT)
+    roots, nodes = tree
+    return version, roots, nodes
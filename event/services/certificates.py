@@ -0,0 +1,247 @@
+"""
+Bulk attendance certificates and name badges.
+
+Organizers request an EventDocumentBatch from the management dashboard;
+the document worker (``manage.py generate_event_documents``) claims it,
+reads the participants with one narrow query and renders their PDFs in
+chunks across a process pool. Rendered chunks are appended, in order, to
+a zip spooled to a temporary file, which is then saved to storage in one
+piece. Progress is written to the batch after every chunk.
+
+Certificates go to participants who attended. Badges go to everyone
+holding a seat, so they can be printed before the event.
+"""
+
+import io
+import zipfile
+from datetime import timedelta
+from functools import lru_cache
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import gettext as _
+from PIL import Image, ImageDraw, ImageFont
+
+from event.models import EventDocumentBatch, EventParticipant
+from event.services.checkin import ticket_code
+
+CHUNK_SIZE = 50
+# A running batch that has not reported progress for this long is retried
+CLAIM_LEASE = timedelta(minutes=30)
+# Archives up to this size stay in memory while being written
+SPOOL_SIZE = 64 * 1024 * 1024
+
+DPI = 150
+CERTIFICATE_SIZE = (1754, 1240)  # A4 landscape at 150 dpi
+BADGE_SIZE = (600, 450)  # 4 x 3 in at 150 dpi
+
+# Battambang covers Latin and Khmer names
+FONT_DIR = settings.BASE_DIR / 'static' / 'css' / 'fonts'
+FONTS = {
+    'regular': str(FONT_DIR / 'Battambang-Regular.ttf'),
+    'bold': str(FONT_DIR / 'Battambang-Bold.ttf'),
+}
+
+# Participants each kind of document is issued to
+RECIPIENTS = {
+    'certificates': ('attended',),
+    'badges': EventParticipant.SEAT_STATUSES,
+}
+KIND_DOCUMENTS = {
+    'certificates': ('certificates',),
+    'badges': ('badges',),
+    'all': ('certificates', 'badges'),
+}
+
+
+@lru_cache(maxsize=None)
+def _font(style, size):
+    """TrueType font, loaded once per process; Pillow's default otherwise"""
+    try:
+        return ImageFont.truetype(FONTS[style], size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def _centered(draw, y, text, font, fill, width):
+    left, _top, right, _bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text(((width - (right - left)) / 2, y), text, font=font, fill=fill)
+
+
+def _pdf(image):
+    buffer = io.BytesIO()
+    image.save(buffer, 'PDF', resolution=DPI)
+    return buffer.getvalue()
+
+
+def render_certificate(document):
+    """One attendance certificate as PDF bytes"""
+    width, height = CERTIFICATE_SIZE
+    image = Image.new('RGB', CERTIFICATE_SIZE, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, width - 40, height - 40), outline=(25, 70, 140), width=12)
+    draw.rectangle((70, 70, width - 70, height - 70), outline=(190, 150, 60), width=3)
+
+    _centered(draw, 190, document['heading'], _font('bold', 84), (25, 70, 140), width)
+    _centered(draw, 380, document['presented_to'], _font('regular', 36), (80, 80, 80), width)
+    _centered(draw, 460, document['name'], _font('bold', 96), (20, 20, 20), width)
+    _centered(draw, 640, document['for_attending'], _font('regular', 36), (80, 80, 80), width)
+    _centered(draw, 710, document['event_title'], _font('bold', 56), (25, 70, 140), width)
+    _centered(draw, 820, document['date'], _font('regular', 36), (80, 80, 80), width)
+    _centered(draw, height - 210, document['issuer'], _font('regular', 30), (120, 120, 120), width)
+    return _pdf(image)
+
+
+def render_badge(document):
+    """One name badge as PDF bytes"""
+    width, height = BADGE_SIZE
+    image = Image.new('RGB', BADGE_SIZE, 'white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, 90), fill=(25, 70, 140))
+    _centered(draw, 22, document['event_title'][:40], _font('bold', 30), 'white', width)
+    _centered(draw, 150, document['name'][:30], _font('bold', 48), (20, 20, 20), width)
+    if document['organization']:
+        _centered(draw, 230, document['organization'][:40],
+                  _font('regular', 26), (80, 80, 80), width)
+    _centered(draw, 300, document['role'], _font('regular', 28), (25, 70, 140), width)
+    _centered(draw, height - 60, document['code'], _font('regular', 22), (120, 120, 120), width)
+    return _pdf(image)
+
+
+RENDERERS = {'certificates': render_certificate, 'badges': render_badge}
+
+
+def render_chunk(documents):
+    """
+    Render a chunk of ``(kind, filename, document)`` tuples; runs in pool
+    processes, so it takes and returns plain data only.
+    """
+    return [
+        (filename, RENDERERS[kind](document))
+        for kind, filename, document in documents
+    ]
+
+
+def request_batch(event, kind='certificates', user=None):
+    """
+    Queue a batch for ``event``, or return the one of the same kind that
+    is already queued or running. Returns ``(batch, created)``.
+    """
+    with transaction.atomic():
+        active = EventDocumentBatch.objects.select_for_update().filter(
+            event=event, kind=kind, status__in=('pending', 'running')).first()
+        if active is not None:
+            return active, False
+        return EventDocumentBatch.objects.create(
+            event=event, kind=kind, requested_by=user), True
+
+
+def claim_batch(now=None):
+    """Lock the oldest due batch and mark it running; None if there is none"""
+    now = now or timezone.now()
+    due = EventDocumentBatch.objects.filter(
+        Q(status='pending') |
+        Q(status='running', claimed_at__lt=now - CLAIM_LEASE))
+    with transaction.atomic():
+        batch = due.select_for_update(skip_locked=True).order_by(
+            'created_at', 'pk').select_related('event').first()
+        if batch is not None:
+            EventDocumentBatch.objects.filter(pk=batch.pk).update(
+                status='running', claimed_at=now, processed=0)
+    return batch
+
+
+def batch_documents(batch):
+    """``(kind, filename, document)`` for every document of a batch"""
+    event = batch.event
+    issuer = getattr(settings, 'SITE_NAME', 'EducationHub')
+    date = timezone.localtime(event.start_datetime).strftime('%d %B %Y')
+    statuses = {
+        status for kind in KIND_DOCUMENTS[batch.kind]
+        for status in RECIPIENTS[kind]
+    }
+    participants = list(EventParticipant.objects.filter(
+        event_id=event.pk, status__in=statuses,
+    ).order_by('pk').values_list(
+        'pk', 'name', 'status', 'role', 'organization_name'))
+    roles = dict(EventParticipant.PARTICIPANT_ROLE)
+
+    documents = []
+    for kind in KIND_DOCUMENTS[batch.kind]:
+        for pk, name, status, role, organization in participants:
+            if status not in RECIPIENTS[kind]:
+                continue
+            filename = f'{kind}/{pk}-{slugify(name) or "participant"}.pdf'
+            documents.append((kind, filename, {
+                'name': name,
+                'event_title': event.title,
+                'date': date,
+                'heading': _('Certificate of Attendance'),
+                'presented_to': _('This certifies that'),
+                'for_attending': _('attended'),
+                'issuer': issuer,
+                'organization': organization,
+                'role': str(roles.get(role, role)),
+                'code': ticket_code(pk, event.pk),
+            }))
+    return documents
+
+
+def run_batch(batch, executor=None, chunk_size=CHUNK_SIZE):
+    """
+    Render every document of a claimed batch (in ``executor`` when given,
+    inline otherwise) into a zip archive saved to storage.
+    """
+    documents = batch_documents(batch)
+    EventDocumentBatch.objects.filter(pk=batch.pk).update(total=len(documents))
+    chunks = [
+        documents[start:start + chunk_size]
+        for start in range(0, len(documents), chunk_size)
+    ]
+    # map() yields chunks in submission order while the pool keeps working
+    rendered = (executor.map(render_chunk, chunks) if executor is not None
+                else map(render_chunk, chunks))
+
+    processed = 0
+    with SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+        # PDFs are already compressed; storing avoids deflating them again
+        with zipfile.ZipFile(spool, 'w', zipfile.ZIP_STORED) as archive:
+            for chunk in rendered:
+                for filename, data in chunk:
+                    archive.writestr(filename, data)
+                processed += len(chunk)
+                EventDocumentBatch.objects.filter(pk=batch.pk).update(
+                    processed=processed, claimed_at=timezone.now())
+        spool.seek(0)
+        name = default_storage.save(
+            f'events/documents/{batch.event.slug}-{batch.kind}-{batch.pk}.zip',
+            File(spool))
+
+    EventDocumentBatch.objects.filter(pk=batch.pk).update(
+        status='done', archive=name, processed=processed,
+        finished_at=timezone.now(), last_error='')
+    return processed
+
+
+def process_batches(executor=None, chunk_size=CHUNK_SIZE, max_batches=None):
+    """Run claimed batches until none is due; returns counts"""
+    counts = {'batches': 0, 'documents': 0, 'failed': 0}
+    while max_batches is None or counts['batches'] < max_batches:
+        batch = claim_batch()
+        if batch is None:
+            break
+        counts['batches'] += 1
+        try:
+            counts['documents'] += run_batch(batch, executor, chunk_size)
+        except Exception as exc:  # pylint: disable=broad-except
+            counts['failed'] += 1
+            EventDocumentBatch.objects.filter(pk=batch.pk).update(
+                status='failed', finished_at=timezone.now(),
+                last_error=f'{type(exc).__name__}: {exc}'[:2000])
+    return counts
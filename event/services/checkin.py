@@ -0,0 +1,187 @@
+"""
+Offline check-in support for door kiosks.
+
+Every participant has a ticket code derived from a keyed HMAC of its
+id, so codes need no storage and cannot be guessed. Kiosks download a
+manifest of *hashed* codes (a leaked manifest cannot be turned back into
+valid tickets), scan offline, and later upload their queued scans in one
+batch that is applied idempotently.
+
+Participant writes bump the event's detail cache version, so the version
+of the last manifest built is remembered under it; a kiosk that already
+holds that manifest is answered without reading the participants.
+"""
+
+import hashlib
+import json
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.dateparse import parse_datetime
+
+from event.models import EventParticipant
+from event.services.detail_cache import DETAIL_CACHE_TIMEOUT, get_event_version
+from event.services.stats import refresh_event_stats
+from event.services.timeseries import apply_check_ins
+
+TICKET_CODE_SALT = 'event.checkin.ticket-code'
+MANIFEST_SALT = 'event.checkin.manifest'
+TICKET_CODE_LENGTH = 20
+CODE_HASH_LENGTH = 32
+MANIFEST_CHUNK_SIZE = 5000
+# Upper bound on queued kiosk scans accepted per sync request
+MAX_SYNC_BATCH = 5000
+
+
+def ticket_code(participant_id, event_id):
+    """Ticket code printed on the participant's badge / QR code"""
+    value = f'{event_id}:{participant_id}'
+    return salted_hmac(TICKET_CODE_SALT, value).hexdigest()[:TICKET_CODE_LENGTH]
+
+
+def hash_code(code):
+    """Manifest key for a ticket code; kiosks hash scans the same way"""
+    return hashlib.sha256(code.encode()).hexdigest()[:CODE_HASH_LENGTH]
+
+
+def _manifest_version_key(event_id, detail_version):
+    return f'check-in-manifest:version:{event_id}:{detail_version}'
+
+
+def known_manifest_version(event):
+    """
+    Version of the manifest last built for the event's current
+    participants, or None if it has to be built to be known.
+    """
+    return cache.get(
+        _manifest_version_key(event.pk, get_event_version(event.pk)))
+
+
+def build_manifest(event):
+    """
+    Return ``(version, token)`` for an event's check-in manifest.
+
+    The payload lists ``[code_hash, participant_id, status]`` rows; the
+    token is the payload signed and zlib-compressed by django.core.signing.
+    ``version`` is a content hash suitable for use as an ETag.
+    """
+    # Read before the rows, so a write in between leaves a stale key
+    detail_version = get_event_version(event.pk)
+    rows = (
+        EventParticipant.objects.filter(event=event)
+        .order_by('pk')
+        .values_list('pk', 'status')
+        .iterator(chunk_size=MANIFEST_CHUNK_SIZE)
+    )
+    entries = [
+        [hash_code(ticket_code(pk, event.pk)), pk, participant_status]
+        for pk, participant_status in rows
+    ]
+    version = hashlib.sha256(
+        json.dumps(entries, separators=(',', ':')).encode()
+    ).hexdigest()[:32]
+
+    cache.set(_manifest_version_key(event.pk, detail_version), version,
+              DETAIL_CACHE_TIMEOUT)
+
+    payload = {
+        'event': event.pk,
+        'version': version,
+        'generated_at': timezone.now().isoformat(),
+        'hash': f'sha256[:{CODE_HASH_LENGTH}]',
+        'entries': entries,
+    }
+    return version, signing.dumps(payload, salt=MANIFEST_SALT, compress=True)
+
+
+def load_manifest(token, max_age=None):
+    """Verify and decode a manifest token; raises signing.BadSignature"""
+    return signing.loads(token, salt=MANIFEST_SALT, max_age=max_age)
+
+
+def _scan_time(value, now):
+    """Parse a queued scan timestamp; scans from the future are clamped"""
+    if not value:
+        return now
+    scanned_at = parse_datetime(str(value))
+    if scanned_at is None:
+        raise ValueError('Invalid scanned_at timestamp')
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    return min(scanned_at, now)
+
+
+def sync_scans(event, scans):
+    """
+    Apply a batch of queued kiosk scans in one transaction.
+
+    Each scan is ``{'participant': id, 'code': ticket_code,
+    'scanned_at': iso8601}``. Repeated scans of one participant collapse
+    to the earliest; replaying a batch changes nothing. Participants are
+    written with a single ``bulk_update``. Returns a summary dict.
+    """
+    now = timezone.now()
+    rejected = []
+    earliest = {}
+    for index, scan in enumerate(scans):
+        try:
+            participant_id = int(scan.get('participant'))
+            scanned_at = _scan_time(scan.get('scanned_at'), now)
+        except (AttributeError, TypeError, ValueError):
+            rejected.append({'index': index, 'reason': 'malformed scan'})
+            continue
+        expected = ticket_code(participant_id, event.pk)
+        if not constant_time_compare(str(scan.get('code', '')), expected):
+            rejected.append({'index': index, 'reason': 'invalid ticket code'})
+            continue
+        if participant_id not in earliest or scanned_at < earliest[participant_id][1]:
+            earliest[participant_id] = (index, scanned_at)
+
+    duplicates = len(scans) - len(rejected) - len(earliest)
+    changed = []
+    with transaction.atomic():
+        participants = EventParticipant.objects.select_for_update().filter(
+            event=event, pk__in=earliest).order_by().only(
+                'pk', 'event_id', 'status', 'check_in_time')
+        found = set()
+        moves = []
+        for participant in participants:
+            found.add(participant.pk)
+            index, scanned_at = earliest[participant.pk]
+            if participant.status not in EventParticipant.SEAT_STATUSES:
+                rejected.append({
+                    'index': index,
+                    'reason': f'participant is {participant.status}',
+                })
+                continue
+            if participant.status == 'attended' and participant.check_in_time \
+                    and participant.check_in_time <= scanned_at:
+                duplicates += 1
+                continue
+            moves.append((participant.check_in_time, scanned_at))
+            participant.status = 'attended'
+            participant.check_in_time = scanned_at
+            changed.append(participant)
+
+        for participant_id in set(earliest) - found:
+            rejected.append({
+                'index': earliest[participant_id][0],
+                'reason': 'participant not found',
+            })
+
+        if changed:
+            EventParticipant.objects.bulk_update(
+                changed, ['status', 'check_in_time'])
+            # bulk_update bypasses the stats and rollup signal handlers;
+            # the rollups take the known check-in moves as deltas
+            refresh_event_stats([event.pk])
+            apply_check_ins(event.pk, moves)
+
+    return {
+        'applied': len(changed),
+        'duplicates': duplicates,
+        'rejected': sorted(rejected, key=lambda item: item['index']),
+    }
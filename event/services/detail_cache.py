@@ -0,0 +1,62 @@
+"""
+Versioned cache for public event detail payloads.
+
+Every event has a version number in the cache. Signals on the event and
+its child rows (and the set-based UPDATE paths that bypass signals) bump
+it, which orphans all payloads cached under the previous version, so
+nothing ever has to be deleted explicitly. The version also makes a
+strong ETag: equal versions mean identical public payloads. Versions are
+kept by ``shared.cache_versions``.
+
+Only the viewer-independent part of a response is cached; per-user data
+such as ``user_permissions`` and fields that depend on the clock, such as
+``is_registration_open``, are layered on top per request.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from shared.cache_versions import bump_versions, get_version
+
+DETAIL_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(event_id):
+    return f'event-detail:version:{event_id}'
+
+
+def get_event_version(event_id):
+    """Current payload version of an event, initializing it if missing"""
+    return get_version(_version_key(event_id))
+
+
+def bump_event_versions(event_ids):
+    """Invalidate the cached payloads of ``event_ids``, now and on commit"""
+    bump_versions(_version_key(event_id) for event_id in event_ids
+                  if event_id is not None)
+
+
+def cached_event_payload(event_id, version, variant, build):
+    """
+    Public payload of an event at ``version``; ``build()`` produces it on
+    a miss and may return None (nothing is cached then). ``variant``
+    separates renderings of the same version, e.g. absolute URLs per host.
+    """
+    key = f'event-detail:payload:{event_id}:{version}:{variant}'
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        if payload is not None:
+            cache.set(key, payload, DETAIL_CACHE_TIMEOUT)
+    return payload
+
+
+def detail_etag(event_id, version, variant, overlay=None):
+    """Strong ETag for a payload version plus its per-viewer overlay"""
+    parts = [str(event_id), str(version), variant]
+    if overlay:
+        parts.append(json.dumps(overlay, sort_keys=True, default=str))
+    digest = hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
@@ -0,0 +1,249 @@
+"""
+Server-side marker clustering for event maps.
+
+A map viewport is answered from the web-mercator tiles (z, x, y) covering
+its bounding box. Each tile is computed from the indexed ``geohash``
+column: a few prefix ranges select the tile's events. Below
+``POINT_ZOOM`` they are grouped by a geohash prefix sized to about
+``GRID`` cells across the tile, and each group is one aggregate row with
+its count, centroid and a few sample ids. At ``POINT_ZOOM`` and above the
+events are returned as individual points. Tile payloads are cached under
+a version number that changes with the mapped events, so panning over
+tiles seen before costs a single cache round trip.
+"""
+
+import math
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Window
+from django.db.models.functions import RowNumber, Substr
+
+from event.models import Event
+from event.services.geo_search import (GEOHASH_PRECISION, encode_geohash,
+                                       geohash_cell_filter, geohash_cell_size)
+from shared.cache_versions import bump_versions, get_version
+
+MAX_ZOOM = 20
+# From this zoom on, tiles hold individual events instead of clusters
+POINT_ZOOM = 14
+# Clusters per tile side (roughly; geohash cells come in steps of 4-8x)
+GRID = 8
+SAMPLE_SIZE = 3
+MAX_POINTS_PER_TILE = 500
+MAX_TILES = 64
+# Web-mercator latitude limit
+MAX_LATITUDE = 85.05112878
+
+TILE_CACHE_TIMEOUT = 60 * 10
+_VERSION_KEY = 'event-map:version'
+
+# Event fields that decide whether and where an event is mapped
+MAP_FIELDS = {
+    'latitude', 'longitude', 'geohash', 'status', 'visibility', 'title',
+    'slug', 'start_datetime',
+}
+
+
+class MapQueryError(ValueError):
+    """A viewport that is out of range or needs too many tiles"""
+
+
+def get_map_version():
+    """Current version of the mapped events, initializing it if missing"""
+    return get_version(_VERSION_KEY)
+
+
+def bump_map_version():
+    """Invalidate every cached map tile"""
+    bump_versions([_VERSION_KEY])
+
+
+def mapped_events():
+    """Public, upcoming or running events with coordinates"""
+    return Event.objects.filter(
+        status__in=Event.ACTIVE_STATUSES,
+        visibility='public',
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).exclude(geohash='')
+
+
+def _tile_x(longitude, zoom):
+    return int((longitude + 180.0) / 360.0 * 2 ** zoom)
+
+
+def _tile_y(latitude, zoom):
+    latitude = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude)))
+    return int((1 - math.asinh(math.tan(latitude)) / math.pi) / 2 * 2 ** zoom)
+
+
+def _tile_latitude(y, zoom):
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** zoom))))
+
+
+def tile_bounds(zoom, x, y):
+    """``(south, west, north, east)`` of a tile in degrees"""
+    return (
+        _tile_latitude(y + 1, zoom),
+        x / 2 ** zoom * 360.0 - 180.0,
+        _tile_latitude(y, zoom),
+        (x + 1) / 2 ** zoom * 360.0 - 180.0,
+    )
+
+
+def tiles_for_bbox(west, south, east, north, zoom, limit=MAX_TILES):
+    """
+    ``(x, y)`` of the tiles covering a bounding box. A box with
+    ``west > east`` crosses the antimeridian. Raises MapQueryError when
+    more than ``limit`` tiles would be needed.
+    """
+    last = 2 ** zoom - 1
+    y_range = range(
+        max(0, _tile_y(north, zoom)), min(last, _tile_y(south, zoom)) + 1)
+    if west <= east:
+        x_spans = [(west, east)]
+    else:
+        x_spans = [(west, 180.0), (-180.0, east)]
+    x_ranges = [
+        range(max(0, _tile_x(span_west, zoom)),
+              min(last, _tile_x(span_east, zoom)) + 1)
+        for span_west, span_east in x_spans
+    ]
+    if sum(len(x_range) for x_range in x_ranges) * len(y_range) > limit:
+        raise MapQueryError('Bounding box too large for this zoom level')
+
+    tiles = []
+    for x_range in x_ranges:
+        for x in x_range:
+            tiles.extend((x, y) for y in y_range)
+    return list(dict.fromkeys(tiles))
+
+
+def cluster_precision(zoom):
+    """Geohash precision giving about GRID cells across a tile"""
+    target = 360.0 / 2 ** zoom / GRID
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        if geohash_cell_size(precision)[1] <= target:
+            return precision
+    return GEOHASH_PRECISION
+
+
+def tile_events(zoom, x, y):
+    """Mapped events inside a tile, narrowed by geohash prefix ranges"""
+    south, west, north, east = tile_bounds(zoom, x, y)
+    events = mapped_events().filter(
+        latitude__gte=south, latitude__lt=north,
+        longitude__gte=west, longitude__lt=east,
+    )
+    # Coarsest cells at least as large as the tile: at most 2x2 of them,
+    # found at the tile's corners, cover it
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        lat_size, lng_size = geohash_cell_size(candidate)
+        if lat_size < north - south or lng_size < east - west:
+            break
+        precision = candidate
+    if precision:
+        epsilon = 1e-9
+        cells = {
+            encode_geohash(latitude, longitude, precision)
+            for latitude in (south, north - epsilon)
+            for longitude in (west, east - epsilon)
+        }
+        events = events.filter(geohash_cell_filter(sorted(cells)))
+    return events
+
+
+def build_tile(zoom, x, y):
+    """Payload of one tile: ``{'clusters': [...], 'points': [...]}``"""
+    events = tile_events(zoom, x, y)
+    if zoom >= POINT_ZOOM:
+        points = events.order_by('start_datetime', 'pk').values(
+            'id', 'slug', 'title', 'latitude', 'longitude', 'start_datetime',
+        )[:MAX_POINTS_PER_TILE]
+        return {'clusters': [], 'points': [
+            {**point,
+             'latitude': float(point['latitude']),
+             'longitude': float(point['longitude']),
+             'start_datetime': point['start_datetime'].isoformat()}
+            for point in points
+        ]}
+
+    cell = Substr('geohash', 1, cluster_precision(zoom))
+    groups = events.annotate(cell=cell).values('cell').annotate(
+        count=Count('pk'), latitude=Avg('latitude'), longitude=Avg('longitude'),
+    ).order_by('cell')
+    # Soonest events of each cell, ranked in the same query
+    samples = {}
+    ranked = events.annotate(cell=cell, rank=Window(
+        RowNumber(), partition_by=[cell],
+        order_by=[F('start_datetime').asc(), F('pk').asc()],
+    )).filter(rank__lte=SAMPLE_SIZE).order_by('cell', 'rank')
+    for cell_key, event_id in ranked.values_list('cell', 'pk'):
+        samples.setdefault(cell_key, []).append(event_id)
+
+    return {'clusters': [
+        {'cell': group['cell'],
+         'count': group['count'],
+         'latitude': float(group['latitude']),
+         'longitude': float(group['longitude']),
+         'ids': samples.get(group['cell'], [])}
+        for group in groups
+    ], 'points': []}
+
+
+def cached_tiles(zoom, tiles):
+    """Payloads of ``tiles`` keyed by (x, y), computing only cache misses"""
+    version = get_map_version()
+    keys = {f'event-map:{version}:{zoom}:{x}:{y}': (x, y) for x, y in tiles}
+    found = cache.get_many(keys)
+    missing = {}
+    for key, tile in keys.items():
+        if key not in found:
+            missing[key] = build_tile(zoom, *tile)
+    if missing:
+        cache.set_many(missing, TILE_CACHE_TIMEOUT)
+    return {tile: found.get(key) or missing[key] for key, tile in keys.items()}
+
+
+def merge_tiles(payloads):
+    """
+    Combine tile payloads into one response body. A geohash cell split
+    by a tile edge is merged back into a single cluster.
+    """
+    clusters, points = {}, []
+    for payload in payloads:
+        points.extend(payload['points'])
+        for cluster in payload['clusters']:
+            merged = clusters.get(cluster['cell'])
+            if merged is None:
+                clusters[cluster['cell']] = dict(cluster)
+                continue
+            total = merged['count'] + cluster['count']
+            for axis in ('latitude', 'longitude'):
+                merged[axis] = (merged[axis] * merged['count'] +
+                                cluster[axis] * cluster['count']) / total
+            merged['count'] = total
+            merged['ids'] = (merged['ids'] + cluster['ids'])[:SAMPLE_SIZE]
+    return {
+        'clusters': sorted(clusters.values(), key=lambda c: c['cell']),
+        'points': points,
+    }
+
+
+def map_viewport(west, south, east, north, zoom):
+    """
+    Clusters (or points) of the tiles covering a bounding box, with the
+    tiles used. Raises MapQueryError for invalid or oversized viewports.
+    """
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise MapQueryError(f'zoom must be between 0 and {MAX_ZOOM}')
+    if not (-90 <= south <= north <= 90 and
+            -180 <= west <= 180 and -180 <= east <= 180):
+        raise MapQueryError('Bounding box out of range')
+    tiles = tiles_for_bbox(west, south, east, north, zoom)
+    return {
+        'zoom': zoom,
+        'tiles': [[zoom, x, y] for x, y in tiles],
+        **merge_tiles(cached_tiles(zoom, tiles).values()),
+    }
@@ -0,0 +1,136 @@
+"""
+Full-text search over events.
+
+Each event has an EventSearchDocument row (title, tags, body) written on
+save. The database-specific index lives on that table:
+
+* PostgreSQL: a GIN index over a weighted ``tsvector`` expression,
+  queried with ``to_tsquery`` prefix terms and ranked with ``ts_rank``.
+* SQLite: an external-content FTS5 table kept in sync by triggers,
+  queried with ``MATCH`` and ranked with ``bm25``.
+
+Other backends fall back to substring matching without ranking.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import (BooleanField, FloatField, OuterRef, Q,
+                              Subquery, Value)
+from django.db.models.expressions import RawSQL
+
+from event.models import EventSearchDocument
+
+FTS_TABLE = 'event_search_fts'
+
+# Shared with the migration that creates the GIN index; the query must use
+# the identical expression for PostgreSQL to pick the index
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', tags), 'B') || "
+    "setweight(to_tsvector('simple', body), 'C')"
+)
+
+# Column weights for bm25 (title, tags, body)
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+
+MAX_QUERY_TERMS = 10
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_tag(tag):
+    """Canonical form used for tag storage and filtering"""
+    return ' '.join(str(tag).lower().replace('|', ' ').split())
+
+
+def document_fields(event):
+    """Column values of an event's search document"""
+    tags = [normalize_tag(tag) for tag in event.tags or [] if str(tag).strip()]
+    return {
+        'title': event.title or '',
+        'tags': f"|{'|'.join(tags)}|" if tags else '',
+        'body': '\n'.join(
+            part for part in (event.short_description, event.description)
+            if part
+        ),
+    }
+
+
+def index_event(event):
+    """Create or refresh the search document of one event"""
+    EventSearchDocument.objects.update_or_create(
+        event_id=event.pk, defaults=document_fields(event))
+
+
+def query_terms(text):
+    """Lower-cased word terms of a user query"""
+    return TERM_PATTERN.findall((text or '').lower())[:MAX_QUERY_TERMS]
+
+
+def _postgres_search(queryset, terms):
+    """GIN-indexed tsvector match ranked with ts_rank"""
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    documents = EventSearchDocument.objects.filter(RawSQL(
+        f"({POSTGRES_VECTOR}) @@ to_tsquery('simple', %s)", [tsquery],
+        output_field=BooleanField()))
+    rank = documents.filter(event_id=OuterRef('pk')).annotate(
+        rank=RawSQL(
+            f"ts_rank({POSTGRES_VECTOR}, to_tsquery('simple', %s))", [tsquery],
+            output_field=FloatField())
+    ).values('rank')
+    return queryset.filter(
+        pk__in=documents.values('event_id')
+    ).annotate(search_rank=Subquery(rank, output_field=FloatField()))
+
+
+def _sqlite_search(queryset, terms):
+    """FTS5 match ranked with bm25"""
+    match = ' '.join(f'"{term}"*' for term in terms)
+    table = queryset.model._meta.db_table
+    weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+    return queryset.filter(
+        pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+    ).annotate(search_rank=RawSQL(
+        # bm25 is lower-is-better; negate so higher ranks sort first
+        f'(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id")',
+        [match], output_field=FloatField()))
+
+
+def _fallback_search(queryset, terms):
+    """Unranked substring match for backends without full-text support"""
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(search_document__title__icontains=term) |
+            Q(search_document__tags__icontains=term) |
+            Q(search_document__body__icontains=term)
+        )
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_events(queryset, text):
+    """
+    Restrict an Event queryset to matches of ``text`` (every term, each as
+    a prefix) and annotate ``search_rank`` (higher is more relevant).
+    """
+    terms = query_terms(text)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'postgresql':
+        return _postgres_search(queryset, terms)
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(queryset, terms)
+    return _fallback_search(queryset, terms)
+
+
+def filter_tags(queryset, tags):
+    """Events carrying every one of ``tags`` (case-insensitive, exact)"""
+    for tag in tags:
+        tag = normalize_tag(tag)
+        if tag:
+            queryset = queryset.filter(
+                search_document__tags__contains=f'|{tag}|')
+    return queryset
@@ -0,0 +1,216 @@
+"""
+Proximity search for events.
+
+Events store a geohash of their coordinates in an indexed column. A radius
+query first narrows the table to the handful of geohash cells that cover
+the search circle (index range scans), then refines the candidates with an
+exact, NumPy-vectorized haversine distance.
+"""
+
+import math
+
+import numpy as np
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LNG = 111.320
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+
+# Radius searches wider than this skip the cell filter entirely
+MAX_INDEXED_RADIUS_KM = 2500
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a base32 geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude = float(latitude)
+    longitude = float(longitude)
+
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Return (lat_degrees, lng_degrees) spanned by a cell at ``precision``"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def geohash_successor(prefix):
+    """
+    Smallest geohash string greater than every hash starting with ``prefix``.
+    Returns None when no such bound exists (prefix is all 'z').
+    """
+    chars = list(prefix)
+    while chars:
+        index = GEOHASH_ALPHABET.index(chars[-1])
+        if index + 1 < len(GEOHASH_ALPHABET):
+            chars[-1] = GEOHASH_ALPHABET[index + 1]
+            return ''.join(chars)
+        chars.pop()
+    return None
+
+
+def covering_precision(latitude, radius_km):
+    """
+    Finest geohash precision whose cells are at least ``radius_km`` wide and
+    tall around ``latitude``, so a 3x3 block of cells covers the circle.
+    Returns None for searches too wide (or too close to a pole) to index.
+    """
+    if radius_km > MAX_INDEXED_RADIUS_KM:
+        return None
+
+    lat_extent = radius_km / KM_PER_DEGREE_LAT
+    poleward_lat = abs(latitude) + lat_extent
+    if poleward_lat >= 89.0:
+        return None
+    # Longitude degrees shrink towards the poles; size cells for the
+    # poleward edge of the circle where they are narrowest
+    lng_extent = radius_km / (KM_PER_DEGREE_LNG * math.cos(math.radians(poleward_lat)))
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = geohash_cell_size(precision)
+        if lat_size >= lat_extent and lng_size >= lng_extent:
+            return precision
+    return None
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose union contains every point within ``radius_km``
+    of the given coordinate, or None if the whole table must be scanned.
+    """
+    precision = covering_precision(latitude, radius_km)
+    if precision is None:
+        return None
+
+    lat_size, lng_size = geohash_cell_size(precision)
+    cells = set()
+    for lat_step in (-1, 0, 1):
+        cell_lat = max(-90.0, min(90.0, latitude + lat_step * lat_size))
+        for lng_step in (-1, 0, 1):
+            cell_lng = longitude + lng_step * lng_size
+            # Wrap around the antimeridian
+            cell_lng = (cell_lng + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(cell_lat, cell_lng, precision))
+    return sorted(cells)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Great-circle distance in km from one point to arrays of points.
+    Vectorized over the candidate arrays.
+    """
+    lat1 = np.radians(float(latitude))
+    lng1 = np.radians(float(longitude))
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lng2 = np.radians(np.asarray(longitudes, dtype=np.float64))
+
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def geohash_cell_filter(cells, field='geohash'):
+    """
+    Build a Q object matching any of the geohash prefixes.
+
+    Prefixes are expressed as half-open string ranges rather than LIKE so
+    the B-tree index on the column is used on both SQLite and PostgreSQL.
+    """
+    condition = Q()
+    for prefix in cells:
+        bounds = {f'{field}__gte': prefix}
+        upper = geohash_successor(prefix)
+        if upper is not None:
+            bounds[f'{field}__lt'] = upper
+        condition |= Q(**bounds)
+    return condition
+
+
+class ProximitySearch:
+    """
+    Radius search over a queryset of rows with latitude/longitude/geohash.
+
+    ``search`` returns ``(ids, distances)`` for rows within the radius, in
+    the queryset's own order or nearest-first when ``sort_by_distance``.
+    Only the narrow (id, lat, lng) projection of candidates is loaded.
+    """
+
+    def __init__(self, latitude, longitude, radius_km):
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.radius_km = float(radius_km)
+        if not -90 <= self.latitude <= 90 or not -180 <= self.longitude <= 180:
+            raise ValueError('Coordinates out of range')
+        if self.radius_km <= 0:
+            raise ValueError('Radius must be positive')
+
+    def candidates(self, queryset):
+        """Coarse cell filter backed by the geohash index"""
+        queryset = queryset.filter(
+            latitude__isnull=False, longitude__isnull=False)
+        cells = covering_cells(self.latitude, self.longitude, self.radius_km)
+        if cells is not None:
+            queryset = queryset.filter(geohash_cell_filter(cells))
+        return queryset
+
+    def search(self, queryset, sort_by_distance=False):
+        """Exact haversine refinement of the coarse candidates"""
+        rows = list(self.candidates(queryset).values_list(
+            'pk', 'latitude', 'longitude'))
+        if not rows:
+            return [], {}
+
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        latitudes = np.fromiter(
+            (row[1] for row in rows), dtype=np.float64, count=len(rows))
+        longitudes = np.fromiter(
+            (row[2] for row in rows), dtype=np.float64, count=len(rows))
+
+        distances = haversine_km(
+            self.latitude, self.longitude, latitudes, longitudes)
+        mask = distances <= self.radius_km
+        ids = ids[mask]
+        distances = distances[mask]
+
+        if sort_by_distance:
+            order = np.argsort(distances, kind='stable')
+            ids = ids[order]
+            distances = distances[order]
+
+        ids = ids.tolist()
+        return ids, dict(zip(ids, distances.tolist()))
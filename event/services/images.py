@@ -0,0 +1,306 @@
+"""
+Off-request image pipeline.
+
+Saving an event, photo or update never touches storage beyond the upload
+itself. New images queue an EventImageJob. Replaced or deleted files, with
+their renditions, queue an EventFileDeletion. Both rows are written next
+to the change.
+
+The image worker (``manage.py process_event_media``) claims due jobs,
+reads each source once and renders the resized WebP and JPEG variants in
+a process pool. It stores the variants and records their names in the
+owner's ``image_variants``, keyed by field:
+
+    {'banner_image': {'source': 'events/banners/a.jpg',
+                      'webp': [[640, 'events/banners/variants/a-640w.webp'], ...],
+                      'jpeg': [[640, ...], ...]}}
+
+Serializers expose these as ``srcset`` strings once the recorded source
+matches the current file. The same worker empties the deletion queue.
+"""
+
+import io
+import os
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from event.models import EventFileDeletion, EventImageJob
+from event.services.detail_cache import bump_event_versions
+
+# Widths rendered per image field, by "app_label.model"
+IMAGE_FIELDS = {
+    'event.event': {
+        'banner_image': (640, 1280, 1920),
+        'thumbnail_image': (160, 320, 640),
+        'og_image': (1200,),
+    },
+    'event.eventphoto': {'image': (320, 640, 1280, 1920)},
+    'event.eventupdate': {'image': (320, 640, 1280)},
+}
+
+# Output format -> (Pillow format, save options)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+# A claimed job whose worker died is handed out again after this long
+CLAIM_LEASE = timedelta(minutes=15)
+
+
+def image_fields(model):
+    """``{field: widths}`` of the images tracked on ``model``"""
+    return IMAGE_FIELDS.get(model._meta.label_lower, {})
+
+
+def variant_names(entry):
+    """Stored names of every rendition in an ``image_variants`` entry"""
+    return [
+        name for fmt in FORMATS for _, name in (entry or {}).get(fmt, ())
+    ]
+
+
+def queue_images(instance, fields):
+    """Queue variant rendering for the current files of ``fields``"""
+    label = instance._meta.label_lower
+    EventImageJob.objects.bulk_create([
+        EventImageJob(model=label, object_id=instance.pk, field=field,
+                      source=getattr(instance, field).name)
+        for field in fields
+    ], ignore_conflicts=True)
+
+
+def queue_deletions(names):
+    """Queue stored files for removal by the worker"""
+    EventFileDeletion.objects.bulk_create([
+        EventFileDeletion(name=name) for name in dict.fromkeys(names) if name
+    ])
+
+
+def render_variants(data, widths):
+    """
+    Resize an encoded image to each width (never upscaling) in every
+    output format. Runs in pool processes, so it only deals in bytes:
+    returns ``[(fmt, width, encoded), ...]``.
+    """
+    with Image.open(io.BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+
+    targets = [width for width in sorted(widths) if width < image.width]
+    if not targets or image.width < max(widths):
+        targets.append(min(image.width, max(widths)))
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if image.mode == 'RGBA':
+        flat = Image.new('RGB', image.size, (255, 255, 255))
+        flat.paste(image, mask=image.getchannel('A'))
+    else:
+        flat = image
+
+    rendered = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        for fmt, (pil_format, options) in FORMATS.items():
+            # JPEG has no alpha channel; WebP keeps it
+            source = flat if pil_format == 'JPEG' else image
+            resized = source.resize((width, height), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            rendered.append((fmt, width, buffer.getvalue()))
+    return rendered
+
+
+def _variant_name(source, fmt, width):
+    directory, filename = os.path.split(source)
+    stem = os.path.splitext(filename)[0]
+    return f'{directory}/variants/{stem}-{width}w.{fmt}'
+
+
+def claim_jobs(batch_size=BATCH_SIZE, now=None):
+    """Lock up to ``batch_size`` due jobs and mark them as processing"""
+    now = now or timezone.now()
+    due = EventImageJob.objects.filter(
+        Q(status='pending', available_at__lte=now) |
+        Q(status='processing', claimed_at__lt=now - CLAIM_LEASE)
+    )
+    with transaction.atomic():
+        jobs = list(
+            due.select_for_update(skip_locked=True)
+            .order_by('available_at', 'pk')[:batch_size]
+        )
+        EventImageJob.objects.filter(
+            pk__in=[job.pk for job in jobs]
+        ).update(status='processing', claimed_at=now)
+    return jobs
+
+
+def _record(job, model, rendered):
+    """
+    Store the renditions of ``job`` and record them on the owner. Returns
+    the owning event id, or None when the image changed meanwhile (the
+    new files are then queued for deletion).
+    """
+    entry = {'source': job.source}
+    for fmt, width, data in rendered:
+        name = default_storage.save(
+            _variant_name(job.source, fmt, width), ContentFile(data))
+        entry.setdefault(fmt, []).append([width, name])
+
+    with transaction.atomic():
+        owner = model.objects.select_for_update().filter(
+            pk=job.object_id, **{job.field: job.source}).first()
+        if owner is None:
+            queue_deletions(variant_names(entry))
+            return None
+        replaced = owner.image_variants.get(job.field)
+        if replaced and replaced.get('source') != job.source:
+            queue_deletions(variant_names(replaced))
+        variants = {**owner.image_variants, job.field: entry}
+        model.objects.filter(pk=owner.pk).update(image_variants=variants)
+    return owner.pk if model._meta.label_lower == 'event.event' else owner.event_id
+
+
+def _retry(job, exc, now, report):
+    """Put a failed job back with backoff, or give up after MAX_ATTEMPTS"""
+    job.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+    job.attempts += 1
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = 'failed'
+        report['failed'] += 1
+    else:
+        job.status = 'pending'
+        job.available_at = now + RETRY_DELAY * 2 ** (job.attempts - 1)
+        report['retried'] += 1
+
+
+def process_images(batch_size=BATCH_SIZE, executor=None, now=None):
+    """
+    Claim and render one batch of jobs, in ``executor`` when given
+    (e.g. a ProcessPoolExecutor) or inline otherwise.
+    Returns counts of processed, skipped, retried and failed jobs.
+    """
+    now = now or timezone.now()
+    jobs = claim_jobs(batch_size, now)
+    report = {'claimed': len(jobs), 'processed': 0, 'skipped': 0,
+              'retried': 0, 'failed': 0}
+
+    # Read every source first so the pool renders while storage is read
+    pending = []
+    for job in jobs:
+        model = apps.get_model(job.model)
+        widths = IMAGE_FIELDS.get(job.model, {}).get(job.field)
+        current = model.objects.filter(
+            pk=job.object_id).values_list(job.field, flat=True).first()
+        if widths is None or current != job.source:
+            # Superseded by a newer upload (which has its own job) or gone
+            job.status = 'done'
+            report['skipped'] += 1
+            continue
+        try:
+            with default_storage.open(job.source, 'rb') as source:
+                data = source.read()
+        except OSError as exc:
+            _retry(job, exc, now, report)
+            continue
+        work = (executor.submit(render_variants, data, widths)
+                if executor is not None else None)
+        pending.append((job, model, data, widths, work))
+
+    touched = set()
+    for job, model, data, widths, work in pending:
+        try:
+            rendered = (work.result() if work is not None
+                        else render_variants(data, widths))
+            event_id = _record(job, model, rendered)
+        except Exception as exc:  # pylint: disable=broad-except
+            _retry(job, exc, now, report)
+            continue
+        job.status, job.last_error = 'done', ''
+        report['processed'] += 1
+        if event_id is not None:
+            touched.add(event_id)
+
+    EventImageJob.objects.bulk_update(
+        jobs, ['status', 'attempts', 'available_at', 'last_error'])
+    if touched:
+        bump_event_versions(touched)
+    return report
+
+
+def purge_files(batch_size=100, now=None):
+    """Delete one batch of queued files from storage"""
+    now = now or timezone.now()
+    report = {'deleted': 0, 'retried': 0}
+    with transaction.atomic():
+        rows = list(
+            EventFileDeletion.objects.filter(available_at__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('available_at', 'pk')[:batch_size]
+        )
+        done, failed = [], []
+        for row in rows:
+            try:
+                default_storage.delete(row.name)
+            except Exception as exc:  # pylint: disable=broad-except
+                row.attempts += 1
+                row.available_at = now + RETRY_DELAY * 2 ** min(row.attempts - 1, 10)
+                row.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+                failed.append(row)
+            else:
+                done.append(row.pk)
+        EventFileDeletion.objects.filter(pk__in=done).delete()
+        EventFileDeletion.objects.bulk_update(
+            failed, ['attempts', 'available_at', 'last_error'])
+    report['deleted'], report['retried'] = len(done), len(failed)
+    return report
+
+
+def process_pending(batch_size=BATCH_SIZE, executor=None):
+    """
+    Render every due image job (in ``executor`` when given), then empty
+    the deletion queue. Returns the summed counts.
+    """
+    totals = {'claimed': 0, 'processed': 0, 'skipped': 0, 'retried': 0,
+              'failed': 0, 'deleted': 0}
+    while True:
+        report = process_images(batch_size, executor)
+        if not report['claimed']:
+            break
+        for key, value in report.items():
+            totals[key] += value
+    while True:
+        deleted = purge_files()['deleted']
+        totals['deleted'] += deleted
+        if not deleted:
+            break
+    return totals
+
+
+def srcset(instance, field, build_url=None):
+    """
+    ``{fmt: "url 320w, url 640w"}`` for the current file of ``field``, or
+    None until its variants have been rendered.
+    """
+    image = getattr(instance, field)
+    entry = (instance.image_variants or {}).get(field)
+    if not image or not entry or entry.get('source') != image.name:
+        return None
+    build_url = build_url or (lambda url: url)
+    return {
+        fmt: ', '.join(
+            f'{build_url(default_storage.url(name))} {width}w'
+            for width, name in entry.get(fmt, ()))
+        for fmt in FORMATS
+    }
@@ -0,0 +1,115 @@
+"""
+Time-driven event lifecycle.
+
+Events move ``published -> ongoing -> completed`` as their start and end
+times pass, and their ``registration_open`` flag follows the registration
+window. Each event records ``next_transition_at``; the scheduler only
+looks at events that are due (an indexed range scan) and applies every
+kind of transition to all of them with one set-based UPDATE.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Q, Value, When
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from event.models import Event
+from event.services.detail_cache import bump_event_versions
+from event.services.event_map import bump_map_version
+
+ACTIVE_STATUSES = Event.ACTIVE_STATUSES
+
+LIFECYCLE_COUNTS = (
+    'started', 'completed', 'registration_opened', 'registration_closed',
+    'rescheduled',
+)
+
+# Stand-in for "no pending transition" inside LEAST(); SQLite's multi-arg
+# MIN() returns NULL as soon as one argument is NULL
+NEVER = datetime(9999, 12, 31, tzinfo=dt_timezone.utc)
+
+
+def registration_window(now):
+    """Events whose registration window is open at ``now``"""
+    return (
+        Q(status__in=ACTIVE_STATUSES) &
+        (Q(registration_start__isnull=True) | Q(registration_start__lte=now)) &
+        (Q(registration_deadline__isnull=True) |
+         Q(registration_deadline__gte=now))
+    )
+
+
+def _upcoming(field, now, statuses):
+    """``field`` when it lies in the future for these statuses, else NEVER"""
+    return Case(
+        When(Q(status__in=statuses) & Q(**{f'{field}__gt': now}), then=field),
+        default=Value(NEVER),
+        output_field=DateTimeField(),
+    )
+
+
+def next_transition_expression(now):
+    """SQL counterpart of Event.compute_next_transition (NEVER for none)"""
+    return Least(
+        _upcoming('start_datetime', now, ['published']),
+        _upcoming('end_datetime', now, ACTIVE_STATUSES),
+        _upcoming('registration_start', now, ACTIVE_STATUSES),
+        _upcoming('registration_deadline', now, ACTIVE_STATUSES),
+    )
+
+
+def due_events(now):
+    """Events whose next transition has arrived"""
+    return Event.objects.filter(next_transition_at__lte=now)
+
+
+def advance_lifecycle(now=None):
+    """
+    Apply every due transition; returns the number of rows per transition.
+    Safe to run concurrently and repeatedly: each UPDATE re-checks its
+    own condition.
+    """
+    now = now or timezone.now()
+    due = due_events(now)
+    with transaction.atomic():
+        due_ids = list(due.values_list('pk', flat=True))
+        if not due_ids:
+            return dict.fromkeys(LIFECYCLE_COUNTS, 0)
+        counts = {
+            'started': due.filter(
+                status='published', start_datetime__lte=now, end_datetime__gt=now
+            ).update(status='ongoing', updated_at=now),
+            'completed': due.filter(
+                status__in=ACTIVE_STATUSES, end_datetime__lte=now
+            ).update(status='completed', updated_at=now),
+            'registration_opened': due.filter(
+                registration_window(now), registration_open=False
+            ).update(registration_open=True),
+            'registration_closed': due.filter(
+                ~registration_window(now), registration_open=True
+            ).update(registration_open=False),
+        }
+        counts['rescheduled'] = due.update(
+            next_transition_at=next_transition_expression(now))
+        Event.objects.filter(next_transition_at=NEVER).update(
+            next_transition_at=None)
+        # Status and registration flags appear in cached detail payloads
+        bump_event_versions(due_ids)
+        if counts['completed']:
+            # Completed events drop off the map
+            bump_map_version()
+    return counts
+
+
+def seconds_until_next_transition(now=None, ceiling=60):
+    """How long a worker may sleep before something becomes due"""
+    now = now or timezone.now()
+    upcoming = Event.objects.filter(
+        next_transition_at__isnull=False
+    ).order_by('next_transition_at').values_list(
+        'next_transition_at', flat=True).first()
+    if upcoming is None:
+        return ceiling
+    return max(1.0, min(ceiling, (upcoming - now).total_seconds()))
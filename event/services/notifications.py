@@ -0,0 +1,252 @@
+"""
+Transactional outbox for event emails.
+
+Workflows call ``enqueue`` (or one of the ``notify_*`` helpers) inside
+the transaction that changes state, so a notification exists exactly when
+the change commits and requests never wait on SMTP. A worker
+(``manage.py send_event_notifications``) claims due rows in batches with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so several workers can run side by
+side, renders each kind's templates once per batch and sends the whole
+batch over one mail connection. Failed sends are retried with
+exponential backoff.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+
+from event.models import EventNotification, EventOrganizer
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+# A claimed row whose worker died is handed out again after this long
+CLAIM_LEASE = timedelta(minutes=10)
+
+TEMPLATE_DIR = 'event/email'
+
+
+def enqueue(kind, recipients, event=None, context=None, dedupe_key=None):
+    """
+    Queue ``kind`` for each address in ``recipients``. With a
+    ``dedupe_key``, a recipient already queued under the same key is
+    skipped. Returns the number of addresses given.
+    """
+    recipients = sorted({address.strip().lower()
+                         for address in recipients if address and address.strip()})
+    EventNotification.objects.bulk_create([
+        EventNotification(
+            kind=kind,
+            event=event,
+            recipient=recipient,
+            context=context or {},
+            dedupe_key=f'{dedupe_key}:{recipient}' if dedupe_key else None,
+        )
+        for recipient in recipients
+    ], ignore_conflicts=dedupe_key is not None)
+    return len(recipients)
+
+
+def event_context(event):
+    """Template context shared by every event email"""
+    return {
+        'event_id': event.pk,
+        'event_title': event.title,
+        'event_slug': event.slug,
+        'start_datetime': event.start_datetime.isoformat(),
+    }
+
+
+def _user_email(user):
+    return getattr(user, 'email', '') if user is not None else ''
+
+
+def notify_registration_received(participant):
+    """Acknowledge a new registration (or waitlist place)"""
+    event = participant.event
+    enqueue(
+        'registration_received', [participant.email], event=event,
+        context={**event_context(event), 'name': participant.name,
+                 'status': participant.status},
+        dedupe_key=f'registration_received:{participant.pk}')
+
+
+def notify_registration_confirmed(participant):
+    """Tell a participant their registration was confirmed"""
+    event = participant.event
+    enqueue(
+        'registration_confirmed', [participant.email], event=event,
+        context={**event_context(event), 'name': participant.name},
+        dedupe_key=f'registration_confirmed:{participant.pk}')
+
+
+def notify_waitlist_promoted(participant):
+    """Tell a waitlisted participant a seat opened up for them"""
+    event = participant.event
+    enqueue(
+        'waitlist_promoted', [participant.email], event=event,
+        context={**event_context(event), 'name': participant.name},
+        dedupe_key=f'waitlist_promoted:{participant.pk}')
+
+
+def finance_contacts(event):
+    """Emails of the owner and organizers who manage finances"""
+    emails = list(
+        EventOrganizer.objects.filter(
+            event=event, can_manage_finances=True
+        ).values_list('user__email', flat=True))
+    emails.append(_user_email(event.created_by))
+    return emails
+
+
+def notify_sponsor_submitted(sponsor):
+    """Ask the event's finance managers to review a sponsorship"""
+    event = sponsor.event
+    enqueue(
+        'sponsor_submitted', finance_contacts(event), event=event,
+        context={**event_context(event),
+                 'sponsor_name': sponsor.sponsor_name,
+                 'sponsor_type': sponsor.get_sponsor_type_display(),
+                 'amount': str(sponsor.contribution_amount or '')},
+        dedupe_key=f'sponsor_submitted:{sponsor.pk}')
+
+
+def notify_sponsor_approved(sponsor):
+    """Tell whoever registered a sponsorship that it was approved"""
+    event = sponsor.event
+    enqueue(
+        'sponsor_approved', [_user_email(sponsor.submitted_by)], event=event,
+        context={**event_context(event), 'sponsor_name': sponsor.sponsor_name},
+        dedupe_key=f'sponsor_approved:{sponsor.pk}')
+
+
+def notify_organizer_invited(organizer, invited_by=None):
+    """Tell a user they were added to an event's organizing team"""
+    event = organizer.event
+    enqueue(
+        'organizer_invited', [_user_email(organizer.user)], event=event,
+        context={**event_context(event),
+                 'role': organizer.get_role_display(),
+                 'invited_by': (invited_by.get_full_name() or invited_by.email)
+                 if invited_by is not None else ''},
+        dedupe_key=f'organizer_invited:{organizer.pk}')
+
+
+def notify_expense_decided(expense):
+    """Tell the submitter an expense was approved or rejected"""
+    event = expense.event
+    kind = f'expense_{expense.status}'
+    enqueue(
+        kind, [_user_email(expense.submitted_by)], event=event,
+        context={**event_context(event),
+                 'expense_title': expense.title,
+                 'amount': str(expense.amount),
+                 'reason': expense.rejection_reason},
+        dedupe_key=f'{kind}:{expense.pk}')
+
+
+def claim_batch(batch_size=BATCH_SIZE, now=None):
+    """
+    Lock up to ``batch_size`` due rows (skipping rows other workers hold),
+    mark them as sending and return them. The lock is released on return;
+    the ``sending`` status and lease keep other workers away while the
+    batch is delivered outside the transaction.
+    """
+    now = now or timezone.now()
+    due = EventNotification.objects.filter(
+        Q(status='pending', available_at__lte=now) |
+        Q(status='sending', claimed_at__lt=now - CLAIM_LEASE)
+    )
+    with transaction.atomic():
+        rows = list(
+            due.select_for_update(skip_locked=True)
+            .order_by('available_at', 'pk')[:batch_size]
+        )
+        EventNotification.objects.filter(
+            pk__in=[row.pk for row in rows]
+        ).update(status='sending', claimed_at=now)
+    return rows
+
+
+def _templates(kind, cache):
+    """Compiled (subject, body) templates of a kind, loaded once per batch"""
+    if kind not in cache:
+        cache[kind] = (
+            get_template(f'{TEMPLATE_DIR}/{kind}_subject.txt'),
+            get_template(f'{TEMPLATE_DIR}/{kind}_message.txt'),
+        )
+    return cache[kind]
+
+
+def render(notification, cache=None):
+    """``(subject, body)`` of a notification"""
+    subject, body = _templates(notification.kind, {} if cache is None else cache)
+    context = {**notification.context, 'site_name': getattr(
+        settings, 'SITE_NAME', 'EducationHub')}
+    subject_text = ' '.join(subject.render(context).split())
+    return subject_text, body.render(context)
+
+
+def deliver_batch(batch_size=BATCH_SIZE, connection=None, now=None):
+    """
+    Claim and send one batch over a single mail connection.
+    Returns counts of sent, retried and failed notifications.
+    """
+    now = now or timezone.now()
+    rows = claim_batch(batch_size, now)
+    report = {'claimed': len(rows), 'sent': 0, 'retried': 0, 'failed': 0}
+    if not rows:
+        return report
+
+    templates = {}
+    delivered, failed = [], []
+    connection = connection or get_connection()
+    with connection:
+        for row in rows:
+            try:
+                subject, body = render(row, templates)
+                EmailMessage(
+                    subject, body, settings.DEFAULT_FROM_EMAIL,
+                    [row.recipient], connection=connection,
+                ).send()
+            except Exception as exc:  # pylint: disable=broad-except
+                row.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+                failed.append(row)
+            else:
+                delivered.append(row)
+
+    for row in delivered:
+        row.status, row.sent_at, row.last_error = 'sent', timezone.now(), ''
+    for row in failed:
+        row.attempts += 1
+        if row.attempts >= MAX_ATTEMPTS:
+            row.status = 'failed'
+            report['failed'] += 1
+        else:
+            row.status = 'pending'
+            row.available_at = now + RETRY_DELAY * 2 ** (row.attempts - 1)
+            report['retried'] += 1
+    EventNotification.objects.bulk_update(
+        delivered + failed,
+        ['status', 'sent_at', 'attempts', 'available_at', 'last_error'])
+    report['sent'] = len(delivered)
+    return report
+
+
+def deliver_pending(batch_size=BATCH_SIZE, max_batches=None, connection=None):
+    """Deliver batches until nothing is due; returns the summed counts"""
+    totals = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        report = deliver_batch(batch_size, connection=connection)
+        if not report['claimed']:
+            break
+        for key, value in report.items():
+            totals[key] += value
+        batches += 1
+    return totals
@@ -0,0 +1,134 @@
+"""
+Bulk participant import from CSV.
+
+The upload is read as a text stream and processed in fixed-size chunks:
+each chunk is validated, de-duplicated against the event with one query
+and written with one ``bulk_create``, so memory use does not depend on
+the size of the file. Rows take free seats in file order, as
+``register_participant`` would; the overflow goes to the waitlist. The
+status is not an import column, so an import cannot overbook the event.
+"""
+
+import csv
+import io
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from event.models import EventParticipant
+from event.services.registration import claim_seats
+from event.services.stats import refresh_event_stats
+from event.services.timeseries import refresh_event_timeseries
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_FIELDS = [
+    'name', 'email', 'phone', 'role',
+    'organization_name', 'special_requirements',
+]
+REQUIRED_COLUMNS = {'name', 'email'}
+
+
+class ParticipantImportError(Exception):
+    """The file cannot be imported at all (e.g. missing columns)"""
+
+
+def _build(event, row):
+    """Unsaved participant for one CSV row; raises ValidationError"""
+    values = {
+        field: (row.get(field) or '').strip()
+        for field in IMPORT_FIELDS if row.get(field)
+    }
+    values['email'] = values.get('email', '').lower()
+    participant = EventParticipant(event=event, **values)
+    participant.full_clean(exclude=['event', 'user'], validate_unique=False)
+    return participant
+
+
+def _import_chunk(event, rows, seen_emails, report):
+    """Validate and insert one chunk of (line_number, row) pairs"""
+    candidates = []
+    for line, row in rows:
+        try:
+            participant = _build(event, row)
+        except ValidationError as exc:
+            report['failed'] += 1
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append(
+                    {'line': line, 'errors': exc.message_dict})
+            continue
+        if participant.email in seen_emails:
+            report['duplicates'] += 1
+            continue
+        seen_emails.add(participant.email)
+        candidates.append(participant)
+
+    existing = set(
+        EventParticipant.objects.filter(
+            event=event,
+            email__in=[participant.email for participant in candidates]
+        ).values_list('email', flat=True)
+    )
+    new = [p for p in candidates if p.email not in existing]
+    report['duplicates'] += len(candidates) - len(new)
+
+    seats = claim_seats(event, len(new))
+    for participant in new[seats:]:
+        participant.status = 'waitlist'
+    EventParticipant.objects.bulk_create(new, batch_size=IMPORT_CHUNK_SIZE)
+    # bulk_create bypasses the stats signal handlers; the next chunk's
+    # claim reads these counters
+    refresh_event_stats([event.pk])
+    report['created'] += len(new)
+    report['waitlisted'] += len(new) - seats
+
+
+def import_participants_csv(event, uploaded_file, chunk_size=None):
+    """
+    Import participants for ``event`` from a CSV upload.
+    Rows that fail validation or duplicate an existing email are skipped
+    and reported; the rest are created, waitlisted once the event is full.
+    Returns a summary dict.
+    """
+    binary = getattr(uploaded_file, 'file', uploaded_file)
+    stream = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    try:
+        return _import_stream(event, stream, chunk_size or IMPORT_CHUNK_SIZE)
+    except UnicodeDecodeError as exc:
+        raise ParticipantImportError('File must be UTF-8 encoded CSV') from exc
+    finally:
+        # Leave the upload open for Django to clean up
+        stream.detach()
+
+
+def _import_stream(event, stream, chunk_size):
+    """Read a text CSV stream chunk by chunk inside one transaction"""
+    reader = csv.DictReader(stream)
+    columns = {name.strip().lower() for name in reader.fieldnames or []}
+    missing = REQUIRED_COLUMNS - columns
+    if missing:
+        raise ParticipantImportError(
+            f"Missing required columns: {', '.join(sorted(missing))}")
+
+    rows = (
+        (reader.line_num, {
+            (key or '').strip().lower(): value for key, value in row.items()
+        })
+        for row in reader
+    )
+    report = {
+        'created': 0, 'waitlisted': 0, 'duplicates': 0, 'failed': 0,
+        'errors': [],
+    }
+    seen_emails = set()
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            _import_chunk(event, chunk, seen_emails, report)
+        # bulk_create bypasses the rollup signal handlers
+        refresh_event_timeseries([event.pk])
+    return report
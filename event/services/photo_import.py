@@ -0,0 +1,219 @@
+"""
+Bulk photo upload from a zip archive.
+
+Entries are read one at a time straight from the uploaded archive (never
+extracted as a whole) and hashed while they are read; photos whose bytes
+match one already in the event, or earlier in the archive, are skipped.
+The remaining ones are cleaned in a thread pool (Pillow releases the GIL
+while decoding and encoding, and storage uploads are I/O-bound): EXIF
+orientation is applied and all metadata except the colour profile is
+dropped before the photo is stored. Only a bounded number of entries is
+held in memory at once. Rows are then written with one ``bulk_create``
+and their display variants queued for the image worker.
+"""
+
+import hashlib
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from event.models import EventImageJob, EventPhoto
+from event.services.detail_cache import bump_event_versions
+from event.services.images import queue_deletions
+
+MAX_ENTRIES = 1000
+MAX_ENTRY_SIZE = 30 * 1024 * 1024
+MAX_TOTAL_SIZE = 2 * 1024 * 1024 * 1024
+MAX_REPORTED_ERRORS = 100
+WORKERS = 4
+READ_CHUNK = 1024 * 1024
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+# Formats stored as they came; anything else is stored as JPEG
+KEPT_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 92, 'optimize': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_DATETIME = 306
+
+
+class PhotoImportError(Exception):
+    """The upload cannot be imported at all (e.g. not a zip)"""
+
+
+def _image_entries(archive):
+    """Image members of the archive, skipping folders and OS metadata"""
+    for info in archive.infolist():
+        name = info.filename
+        basename = os.path.basename(name)
+        if (info.is_dir() or not basename or basename.startswith('.') or
+                name.startswith('__MACOSX/')):
+            continue
+        if os.path.splitext(basename)[1].lower() in IMAGE_EXTENSIONS:
+            yield info
+
+
+def _read_entry(archive, info):
+    """``(bytes, sha256)`` of a member, read in chunks; None if too large"""
+    digest = hashlib.sha256()
+    parts, size = [], 0
+    with archive.open(info) as member:
+        while True:
+            chunk = member.read(READ_CHUNK)
+            if not chunk:
+                break
+            size += len(chunk)
+            # The header size can lie; enforce the limit on what is read
+            if size > MAX_ENTRY_SIZE:
+                return None
+            digest.update(chunk)
+            parts.append(chunk)
+    return b''.join(parts), digest.hexdigest()
+
+
+def _taken_at(exif):
+    """Capture time recorded by the camera, as an aware datetime"""
+    value = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or \
+        exif.get(EXIF_DATETIME)
+    try:
+        taken = datetime.strptime(str(value).strip('\x00 '), '%Y:%m:%d %H:%M:%S')
+    except ValueError:
+        return None
+    return timezone.make_aware(taken)
+
+
+def clean_image(data):
+    """
+    Re-encode an image without its metadata, upright per its EXIF
+    orientation. Returns ``(bytes, extension, taken_at)``.
+    """
+    with Image.open(io.BytesIO(data)) as opened:
+        taken_at = _taken_at(opened.getexif())
+        source_format = opened.format
+        icc_profile = opened.info.get('icc_profile')
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+
+    pil_format = source_format if source_format in KEPT_FORMATS else 'JPEG'
+    if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    options = dict(SAVE_OPTIONS[pil_format])
+    if icc_profile:
+        options['icc_profile'] = icc_profile
+
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue(), KEPT_FORMATS[pil_format], taken_at
+
+
+def _store(filename, data):
+    """Clean one photo and save it; runs in the thread pool"""
+    cleaned, extension, taken_at = clean_image(data)
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    field = EventPhoto._meta.get_field('image')
+    name = default_storage.save(
+        field.generate_filename(None, f'{stem}.{extension}'),
+        ContentFile(cleaned))
+    return name, taken_at
+
+
+def import_photos_zip(event, uploaded_file, photographer=None, workers=WORKERS):
+    """
+    Add every new image in a zip upload to ``event``'s gallery.
+    Unreadable entries and duplicates are skipped and reported; returns
+    a summary dict with the ids of the created photos.
+    """
+    binary = getattr(uploaded_file, 'file', uploaded_file)
+    try:
+        archive = zipfile.ZipFile(binary)
+    except (zipfile.BadZipFile, OSError) as exc:
+        raise PhotoImportError('File must be a zip archive') from exc
+
+    with archive:
+        entries = list(_image_entries(archive))
+        if len(entries) > MAX_ENTRIES:
+            raise PhotoImportError(
+                f'A zip may contain at most {MAX_ENTRIES} images')
+        if sum(info.file_size for info in entries) > MAX_TOTAL_SIZE:
+            raise PhotoImportError('Zip archive is too large once extracted')
+        return _import_entries(event, archive, entries, photographer, workers)
+
+
+def _import_entries(event, archive, entries, photographer, workers):
+    report = {'created': 0, 'duplicates': 0, 'failed': 0, 'errors': [],
+              'photo_ids': []}
+
+    def fail(filename, message):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'file': filename, 'error': message})
+
+    seen = set(
+        EventPhoto.objects.filter(event=event).exclude(content_hash='')
+        .values_list('content_hash', flat=True))
+    photos, in_flight = [], deque()
+
+    def collect():
+        filename, content_hash, future = in_flight.popleft()
+        try:
+            name, taken_at = future.result()
+        except (UnidentifiedImageError, Image.DecompressionBombError,
+                OSError, ValueError, SyntaxError) as exc:
+            fail(filename, f'Not a readable image ({type(exc).__name__})')
+            return
+        photos.append(EventPhoto(
+            event=event, image=name, photographer=photographer,
+            taken_at=taken_at, content_hash=content_hash))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for info in entries:
+            read = _read_entry(archive, info)
+            if read is None:
+                fail(info.filename, 'Image is too large')
+                continue
+            data, content_hash = read
+            if content_hash in seen:
+                report['duplicates'] += 1
+                continue
+            seen.add(content_hash)
+            in_flight.append(
+                (info.filename, content_hash, pool.submit(_store, info.filename, data)))
+            # Bound the number of decoded photos held in memory
+            if len(in_flight) >= max(1, workers) * 2:
+                collect()
+        while in_flight:
+            collect()
+
+    try:
+        with transaction.atomic():
+            created = EventPhoto.objects.bulk_create(photos, batch_size=500)
+            # bulk_create bypasses the signals that queue display variants
+            EventImageJob.objects.bulk_create([
+                EventImageJob(model=EventPhoto._meta.label_lower,
+                              object_id=photo.pk, field='image',
+                              source=photo.image.name)
+                for photo in created
+            ], batch_size=500, ignore_conflicts=True)
+    except Exception:
+        queue_deletions(photo.image.name for photo in photos)
+        raise
+    if created:
+        bump_event_versions([event.pk])
+
+    report['created'] = len(created)
+    report['photo_ids'] = [photo.pk for photo in created]
+    return report
@@ -0,0 +1,120 @@
+"""
+Atomic seat allocation for event registration.
+
+Capacity is enforced against the event's EventStats row. A registration
+first runs a conditional UPDATE that only matches while a seat is free;
+the UPDATE takes the row's write lock (on SQLite, the database write lock,
+as it is the first statement of the transaction), so concurrent
+registrations for the same event queue behind each other and re-check
+the condition against the committed counters (the participant insert
+bumps them inside the same transaction through the stats signal
+handlers). Registrations that find no free seat go to the waitlist, and
+freed seats are handed to the waitlist in registration order.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from event.models import EventParticipant, EventStats
+from event.services.notifications import (notify_registration_received,
+                                          notify_waitlist_promoted)
+from event.services.stats import refresh_event_stats
+
+
+def claim_seat(event):
+    """
+    Lock the event's stats row if a seat is free.
+    Must run inside a transaction; returns False when the event is full.
+    """
+    if not event.max_participants:
+        return True
+
+    free_seats = (
+        event.max_participants - F('confirmed_count') - F('attended_count')
+    )
+    claimable = EventStats.objects.filter(
+        event_id=event.pk, registered_count__lt=free_seats)
+    if claimable.update(updated_at=timezone.now()):
+        return True
+
+    # First registration for an event without a stats row yet
+    if not EventStats.objects.filter(event_id=event.pk).exists():
+        refresh_event_stats([event.pk])
+        return bool(claimable.update(updated_at=timezone.now()))
+    return False
+
+
+def claim_seats(event, wanted):
+    """
+    Lock the event's stats row and return how many of ``wanted`` seats
+    are free. Must run inside a transaction; the caller must bring the
+    counters up to date once the seats are filled.
+    """
+    if not wanted or not event.max_participants:
+        return wanted
+    if not claim_seat(event):
+        return 0
+    stats = EventStats.objects.get(event_id=event.pk)
+    free_seats = (
+        event.max_participants - stats.registered_count -
+        stats.confirmed_count - stats.attended_count
+    )
+    return min(wanted, free_seats)
+
+
+def register_participant(event, **fields):
+    """
+    Create a participant as ``registered`` when a seat is free,
+    otherwise as ``waitlist``, and queue the acknowledgement email.
+    """
+    with transaction.atomic():
+        fields['status'] = 'registered' if claim_seat(event) else 'waitlist'
+        participant = EventParticipant.objects.create(event=event, **fields)
+        notify_registration_received(participant)
+    return participant
+
+
+def promote_waitlist(event):
+    """
+    Move the oldest waitlisted participants into free seats and queue
+    their emails. Returns the promoted participants.
+    """
+    promoted = []
+    with transaction.atomic():
+        while True:
+            # Claim first so the write lock is taken before any read
+            if not claim_seat(event):
+                break
+            candidate = (
+                EventParticipant.objects.select_for_update(skip_locked=True)
+                .filter(event_id=event.pk, status='waitlist')
+                .order_by('registration_date', 'pk')
+                .first()
+            )
+            if candidate is None:
+                break
+            candidate.status = 'registered'
+            candidate.save(update_fields=['status'])
+            notify_waitlist_promoted(candidate)
+            promoted.append(candidate)
+    return promoted
+
+
+def cancel_participant(participant, notes=None):
+    """
+    Cancel a registration and give a freed seat to the waitlist.
+    Returns the promoted participants.
+    """
+    with transaction.atomic():
+        held_seat = participant.status in EventParticipant.SEAT_STATUSES
+        participant.status = 'cancelled'
+        update_fields = ['status']
+        if notes is not None:
+            participant.notes = notes
+            update_fields.append('notes')
+        participant.save(update_fields=update_fields)
+
+        if not held_seat:
+            return []
+        return promote_waitlist(participant.event)
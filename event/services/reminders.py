@@ -0,0 +1,99 @@
+"""
+"Event starts soon" reminders.
+
+Events starting within the lead time are found with a range scan on the
+``start_datetime`` index. Their participants who still expect to attend
+and have no reminder yet are handled in chunks ordered by id: each chunk
+queues its emails in the notification outbox and flips ``reminder_sent``
+with one ``UPDATE ... WHERE id IN (...)``, in a single transaction. A
+crash therefore loses or repeats nothing: the next run resumes with the
+participants whose flag is still unset, and the outbox dedupe key stops a
+reminder from being queued twice even if a flag is reset by hand.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from event.models import Event, EventNotification, EventParticipant
+from event.services.notifications import event_context
+
+REMINDER_LEAD = timedelta(hours=24)
+CHUNK_SIZE = 1000
+
+# Participants who hold a seat and have not attended yet
+REMINDER_STATUSES = ('registered', 'confirmed')
+
+
+def due_events(now=None, lead=REMINDER_LEAD):
+    """Active events starting within ``lead`` of ``now``"""
+    now = now or timezone.now()
+    return Event.objects.filter(
+        status__in=Event.ACTIVE_STATUSES,
+        start_datetime__gt=now,
+        start_datetime__lte=now + lead,
+    )
+
+
+def _reminder_context(event):
+    return {
+        **event_context(event),
+        'location': event.location_name or event.address_line_1,
+        'virtual_meeting_url': event.virtual_meeting_url or '',
+    }
+
+
+def send_chunk(event, context, chunk_size=CHUNK_SIZE):
+    """
+    Queue reminders for the next ``chunk_size`` unreminded participants
+    of ``event`` and mark them reminded. Returns the number handled.
+    """
+    with transaction.atomic():
+        chunk = list(
+            EventParticipant.objects.filter(
+                event_id=event.pk, reminder_sent=False,
+                status__in=REMINDER_STATUSES,
+            ).order_by('id').values_list('id', 'name', 'email')[:chunk_size]
+        )
+        if not chunk:
+            return 0
+
+        EventNotification.objects.bulk_create([
+            EventNotification(
+                kind='event_reminder',
+                event_id=event.pk,
+                recipient=recipient,
+                context={**context, 'name': name},
+                dedupe_key=f'event_reminder:{participant_id}:{recipient}',
+            )
+            for participant_id, name, recipient in (
+                (pk, name, email.strip().lower()) for pk, name, email in chunk)
+            if recipient
+        ], ignore_conflicts=True)
+        EventParticipant.objects.filter(
+            id__in=[participant_id for participant_id, _, _ in chunk]
+        ).update(reminder_sent=True)
+    return len(chunk)
+
+
+def schedule_reminders(now=None, lead=REMINDER_LEAD, chunk_size=CHUNK_SIZE):
+    """
+    Queue reminders for every event starting within ``lead``.
+    Returns counts of events seen and participants reminded.
+    """
+    events = due_events(now, lead).only(
+        'pk', 'title', 'slug', 'start_datetime', 'location_name',
+        'address_line_1', 'virtual_meeting_url',
+    ).order_by('start_datetime', 'pk')
+
+    counts = {'events': 0, 'reminded': 0}
+    for event in events.iterator():
+        counts['events'] += 1
+        context = _reminder_context(event)
+        while True:
+            handled = send_chunk(event, context, chunk_size)
+            counts['reminded'] += handled
+            if handled < chunk_size:
+                break
+    return counts
@@ -0,0 +1,240 @@
+"""
+Incremental maintenance of the EventStats read model.
+
+Every tracked row (participant, sponsor, expense, feedback) contributes a
+small set of counters to its event's stats. Signal handlers remember the
+contribution a row had when it was loaded and, on save/delete, apply the
+difference to the stats row with a single F-expression UPDATE inside the
+writer's transaction.
+
+Bulk writes that bypass signals (``QuerySet.update``, ``bulk_create``)
+must call ``refresh_event_stats`` for the affected events.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, F, Sum
+
+from event.models import (EventExpense, EventFeedback, EventParticipant,
+                          EventSponsor, EventStats)
+from event.services.detail_cache import bump_event_versions
+
+PARTICIPANT_STATUS_FIELDS = {
+    'registered': 'registered_count',
+    'waitlist': 'waitlist_count',
+    'confirmed': 'confirmed_count',
+    'attended': 'attended_count',
+    'no-show': 'no_show_count',
+    'cancelled': 'cancelled_count',
+}
+
+COUNTER_FIELDS = [
+    *PARTICIPANT_STATUS_FIELDS.values(),
+    'sponsor_count', 'public_sponsor_count', 'sponsorship_total',
+    'approved_expense_count', 'approved_expense_total',
+    'pending_expense_count', 'pending_expense_total',
+    'rating_count', 'rating_sum',
+    *(f'rating_{star}_count' for star in range(1, 6)),
+]
+
+ZERO = Decimal('0')
+
+
+def participant_contribution(participant):
+    """Counters one participant adds to its event"""
+    field = PARTICIPANT_STATUS_FIELDS.get(participant.status)
+    return {field: 1} if field else {}
+
+
+def sponsor_contribution(sponsor):
+    """Counters one sponsor adds to its event"""
+    return {
+        'sponsor_count': 1,
+        'public_sponsor_count': 1 if sponsor.is_public else 0,
+        'sponsorship_total': Decimal(sponsor.contribution_amount or ZERO),
+    }
+
+
+def expense_contribution(expense):
+    """Counters one expense adds to its event"""
+    amount = Decimal(expense.amount or ZERO)
+    if expense.status == 'approved':
+        return {'approved_expense_count': 1, 'approved_expense_total': amount}
+    if expense.status == 'pending':
+        return {'pending_expense_count': 1, 'pending_expense_total': amount}
+    return {}
+
+
+def feedback_contribution(feedback):
+    """Counters one feedback entry adds to its event (public only)"""
+    rating = feedback.overall_rating
+    if not feedback.is_public or rating not in range(1, 6):
+        return {}
+    return {
+        'rating_count': 1,
+        'rating_sum': rating,
+        f'rating_{rating}_count': 1,
+    }
+
+
+CONTRIBUTIONS = {
+    EventParticipant: (participant_contribution, ['status']),
+    EventSponsor: (sponsor_contribution, ['is_public', 'contribution_amount']),
+    EventExpense: (expense_contribution, ['status', 'amount']),
+    EventFeedback: (feedback_contribution, ['is_public', 'overall_rating']),
+}
+
+
+def contribution_of(instance):
+    """(event_id, counters) for a tracked instance"""
+    contribute, _ = CONTRIBUTIONS[type(instance)]
+    return instance.event_id, contribute(instance)
+
+
+def apply_delta(event_id, delta, create_missing=True):
+    """
+    Add ``delta`` to the event's counters with one UPDATE.
+
+    When the stats row does not exist yet it is built from the source
+    tables instead (which already include the current write).
+    """
+    delta = {field: value for field, value in delta.items() if value}
+    if event_id is None or not delta:
+        return
+
+    updated = EventStats.objects.filter(event_id=event_id).update(**{
+        field: F(field) + value for field, value in delta.items()
+    })
+    if not updated and create_missing:
+        refresh_event_stats([event_id])
+
+
+def apply_change(old, new, create_missing=True):
+    """Apply the difference between two (event_id, counters) snapshots"""
+    old_event, old_counters = old or (None, {})
+    new_event, new_counters = new or (None, {})
+
+    if old_event == new_event:
+        fields = set(old_counters) | set(new_counters)
+        apply_delta(new_event, {
+            field: new_counters.get(field, 0) - old_counters.get(field, 0)
+            for field in fields
+        }, create_missing=create_missing)
+        return
+
+    apply_delta(old_event, {
+        field: -value for field, value in old_counters.items()
+    }, create_missing=create_missing)
+    apply_delta(new_event, new_counters, create_missing=create_missing)
+
+
+def compute_event_stats(event_ids):
+    """
+    Compute counters for many events from the source tables.
+    Runs one grouped query per source table regardless of batch size.
+    """
+    event_ids = list(event_ids)
+    stats = {
+        event_id: {field: 0 for field in COUNTER_FIELDS}
+        for event_id in event_ids
+    }
+
+    participants = (
+        EventParticipant.objects.filter(event_id__in=event_ids)
+        .order_by().values('event_id', 'status').annotate(total=Count('pk'))
+    )
+    for row in participants:
+        field = PARTICIPANT_STATUS_FIELDS.get(row['status'])
+        if field:
+            stats[row['event_id']][field] = row['total']
+
+    sponsors = (
+        EventSponsor.objects.filter(event_id__in=event_ids)
+        .order_by().values('event_id', 'is_public')
+        .annotate(total=Count('pk'), amount=Sum('contribution_amount'))
+    )
+    for row in sponsors:
+        counters = stats[row['event_id']]
+        counters['sponsor_count'] += row['total']
+        counters['sponsorship_total'] += row['amount'] or ZERO
+        if row['is_public']:
+            counters['public_sponsor_count'] += row['total']
+
+    expenses = (
+        EventExpense.objects.filter(
+            event_id__in=event_ids, status__in=['approved', 'pending'])
+        .order_by().values('event_id', 'status')
+        .annotate(total=Count('pk'), amount=Sum('amount'))
+    )
+    for row in expenses:
+        prefix = 'approved' if row['status'] == 'approved' else 'pending'
+        counters = stats[row['event_id']]
+        counters[f'{prefix}_expense_count'] = row['total']
+        counters[f'{prefix}_expense_total'] = row['amount'] or ZERO
+
+    feedback = (
+        EventFeedback.objects.filter(
+            event_id__in=event_ids, is_public=True,
+            overall_rating__range=(1, 5))
+        .order_by().values('event_id', 'overall_rating')
+        .annotate(total=Count('pk'))
+    )
+    for row in feedback:
+        counters = stats[row['event_id']]
+        rating = row['overall_rating']
+        counters['rating_count'] += row['total']
+        counters['rating_sum'] += rating * row['total']
+        counters[f'rating_{rating}_count'] = row['total']
+
+    return stats
+
+
+def refresh_event_stats(event_ids):
+    """
+    Recompute and upsert stats rows for the given events.
+    Returns the ids whose stored counters differed (drift).
+    """
+    computed = compute_event_stats(event_ids)
+    if not computed:
+        return []
+
+    existing = {
+        row.event_id: row
+        for row in EventStats.objects.filter(event_id__in=computed)
+    }
+
+    drifted = []
+    rows = []
+    for event_id, counters in computed.items():
+        current = existing.get(event_id)
+        if current is not None and all(
+            getattr(current, field) == value for field, value in counters.items()
+        ):
+            continue
+        drifted.append(event_id)
+        rows.append(EventStats(event_id=event_id, **counters))
+
+    if rows:
+        EventStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['event'],
+            update_fields=[*COUNTER_FIELDS, 'updated_at'],
+        )
+        bump_event_versions(drifted)
+    return drifted
+
+
+def get_event_stats(event):
+    """
+    Return the stats row of an event, building it on first access.
+    Uses the row loaded through select_related('stats') when available.
+    """
+    try:
+        return event.stats
+    except EventStats.DoesNotExist:
+        pass
+    refresh_event_stats([event.pk])
+    stats = EventStats.objects.get(event_id=event.pk)
+    event.stats = stats
+    return stats
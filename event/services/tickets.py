@@ -0,0 +1,173 @@
+"""
+Ticket inventory reservations.
+
+Inventory is guarded by conditional UPDATEs on the ticket row rather than
+a lock held across the checkout: a hold only succeeds while
+``quantity_sold + quantity_held + requested <= quantity``, and the row
+write lock serializes concurrent buyers of the same ticket only for the
+duration of that single statement. Reservations move out of ``held``
+with another conditional UPDATE, so confirmation, release and the expiry
+sweeper can race safely: exactly one of them wins and adjusts the
+ticket counters.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from event.models import EventTicket, TicketReservation
+from event.services.detail_cache import bump_event_versions
+
+HOLD_DURATION = timedelta(minutes=10)
+SWEEP_BATCH_SIZE = 500
+
+
+class TicketUnavailable(Exception):
+    """Not enough inventory left for the requested quantity"""
+
+
+class ReservationNotActive(Exception):
+    """Reservation was already confirmed, released or expired"""
+
+
+def _on_sale(now):
+    """Ticket rows that can currently be bought"""
+    return (
+        Q(status='active') &
+        (Q(sale_start__isnull=True) | Q(sale_start__lte=now)) &
+        (Q(sale_end__isnull=True) | Q(sale_end__gte=now))
+    )
+
+
+def _take_inventory(ticket, quantity, field, now):
+    """Add ``quantity`` to ``field`` if that many tickets are left"""
+    taken = EventTicket.objects.filter(
+        _on_sale(now),
+        pk=ticket.pk,
+        quantity__gte=F('quantity_sold') + F('quantity_held') + quantity,
+    ).update(**{field: F(field) + quantity, 'updated_at': now})
+    if taken:
+        bump_event_versions([ticket.event_id])
+    return taken
+
+
+def _invalidate_tickets(ticket_ids):
+    """Bump the detail versions of the events owning ``ticket_ids``"""
+    bump_event_versions(
+        EventTicket.objects.filter(pk__in=ticket_ids)
+        .values_list('event_id', flat=True).distinct())
+
+
+def _check_quantity(ticket, quantity):
+    """Enforce the per-order limit"""
+    if quantity < 1 or quantity > ticket.max_per_order:
+        raise TicketUnavailable(
+            f'Quantity must be between 1 and {ticket.max_per_order}')
+
+
+def _claim(ticket, quantity, field, now):
+    """Take inventory, reclaiming this ticket's lapsed holds on a miss"""
+    if _take_inventory(ticket, quantity, field, now):
+        return
+    if expire_reservations(now=now, ticket=ticket) and \
+            _take_inventory(ticket, quantity, field, now):
+        return
+    raise TicketUnavailable(f'Ticket "{ticket.name}" is not available')
+
+
+def reserve_tickets(ticket, quantity=1, user=None, hold_for=HOLD_DURATION):
+    """Hold ``quantity`` tickets for ``hold_for``; raises TicketUnavailable"""
+    _check_quantity(ticket, quantity)
+    now = timezone.now()
+    with transaction.atomic():
+        _claim(ticket, quantity, 'quantity_held', now)
+        return TicketReservation.objects.create(
+            ticket=ticket,
+            user=user if user is not None and user.is_authenticated else None,
+            quantity=quantity,
+            expires_at=now + hold_for,
+        )
+
+
+def sell_tickets(ticket, quantity=1):
+    """Sell tickets directly without a hold; raises TicketUnavailable"""
+    _check_quantity(ticket, quantity)
+    _claim(ticket, quantity, 'quantity_sold', timezone.now())
+
+
+def _finish(reservation, status, sold):
+    """Move a held reservation to ``status`` and return its inventory"""
+    now = timezone.now()
+    active = TicketReservation.objects.filter(pk=reservation.pk, status='held')
+    if status == 'confirmed':
+        active = active.filter(expires_at__gt=now)
+
+    with transaction.atomic():
+        changes = {'status': status}
+        if status == 'confirmed':
+            changes['confirmed_at'] = now
+        if not active.update(**changes):
+            raise ReservationNotActive('Reservation is no longer active')
+
+        counters = {'quantity_held': F('quantity_held') - reservation.quantity}
+        if sold:
+            counters['quantity_sold'] = F('quantity_sold') + reservation.quantity
+        EventTicket.objects.filter(pk=reservation.ticket_id).update(
+            updated_at=now, **counters)
+        _invalidate_tickets([reservation.ticket_id])
+
+    for field, value in changes.items():
+        setattr(reservation, field, value)
+    return reservation
+
+
+def confirm_reservation(reservation):
+    """Convert an unexpired hold into sold tickets"""
+    return _finish(reservation, 'confirmed', sold=True)
+
+
+def release_reservation(reservation):
+    """Give held tickets back before the hold expires"""
+    return _finish(reservation, 'released', sold=False)
+
+
+def expire_reservations(batch_size=SWEEP_BATCH_SIZE, now=None, ticket=None):
+    """
+    Expire stale holds in batches and return their inventory.
+    Each batch is one transaction: the reservations are flipped with a
+    single UPDATE and every affected ticket gets one counter UPDATE.
+    Returns the number of reservations expired.
+    """
+    now = now or timezone.now()
+    stale = TicketReservation.objects.filter(status='held', expires_at__lte=now)
+    if ticket is not None:
+        stale = stale.filter(ticket=ticket)
+
+    expired = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                stale.select_for_update(skip_locked=True)
+                .order_by('expires_at')
+                .values_list('pk', 'ticket_id', 'quantity')[:batch_size]
+            )
+            if not batch:
+                return expired
+
+            TicketReservation.objects.filter(
+                pk__in=[pk for pk, _, _ in batch], status='held'
+            ).update(status='expired')
+
+            released = defaultdict(int)
+            for _, ticket_id, quantity in batch:
+                released[ticket_id] += quantity
+            for ticket_id, quantity in released.items():
+                EventTicket.objects.filter(pk=ticket_id).update(
+                    quantity_held=F('quantity_held') - quantity,
+                    updated_at=now,
+                )
+            _invalidate_tickets(released)
+        expired += len(batch)
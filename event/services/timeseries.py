@@ -0,0 +1,260 @@
+"""
+Hourly and daily activity rollups behind the organizer charts.
+
+Each participant and sponsor contributes to a few ``(metric, moment)``
+points: a registration at ``registration_date``, a check-in at
+``check_in_time`` and a sponsorship at ``contributed_at``. Every point
+lands in one hourly and one daily EventTimeSeries bucket (in the site's
+time zone). As with EventStats, signal handlers remember the points a
+row had when it was loaded and apply the difference with F-expression
+UPDATEs inside the writer's transaction.
+
+Bulk writes that bypass signals must call ``refresh_event_timeseries``
+for the affected events, or ``apply_check_ins`` when they only move
+check-in times they already know. Reads only touch the buckets of the requested
+range, so a chart costs the same however many rows it summarises.
+"""
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from event.models import EventParticipant, EventSponsor, EventTimeSeries
+
+GRANULARITIES = {'hour': TruncHour, 'day': TruncDay}
+METRICS = ('registrations', 'check_ins', 'sponsor_count', 'sponsorship_amount')
+# Largest number of buckets served by one request
+MAX_POINTS = 2000
+DEFAULT_RANGE = {'hour': timedelta(hours=48), 'day': timedelta(days=30)}
+
+
+class TimeSeriesQueryError(ValueError):
+    """A range that is invalid or needs too many buckets"""
+
+
+def participant_points(participant):
+    """``{(metric, moment): value}`` one participant contributes"""
+    points = {}
+    if participant.registration_date:
+        points[('registrations', participant.registration_date)] = 1
+    if participant.check_in_time:
+        points[('check_ins', participant.check_in_time)] = 1
+    return points
+
+
+def sponsor_points(sponsor):
+    """``{(metric, moment): value}`` one sponsor contributes"""
+    if not sponsor.contributed_at:
+        return {}
+    return {
+        ('sponsor_count', sponsor.contributed_at): 1,
+        ('sponsorship_amount', sponsor.contributed_at):
+            Decimal(sponsor.contribution_amount or 0),
+    }
+
+
+SERIES_SOURCES = {
+    EventParticipant: (participant_points, ['registration_date', 'check_in_time']),
+    EventSponsor: (sponsor_points, ['contribution_amount', 'contributed_at']),
+}
+
+
+def points_of(instance):
+    """(event_id, points) for a tracked instance"""
+    contribute, _ = SERIES_SOURCES[type(instance)]
+    return instance.event_id, contribute(instance)
+
+
+def bucket_start(moment, granularity):
+    """Start of the hour or (local) day containing ``moment``"""
+    local = timezone.localtime(moment)
+    if granularity == 'hour':
+        return local.replace(minute=0, second=0, microsecond=0)
+    return timezone.make_aware(datetime.combine(local.date(), time.min))
+
+
+def _bucket_deltas(points, sign, deltas):
+    for (metric, moment), value in points.items():
+        for granularity in GRANULARITIES:
+            counters = deltas.setdefault(
+                (granularity, bucket_start(moment, granularity)), {})
+            counters[metric] = counters.get(metric, 0) + sign * value
+
+
+def apply_bucket_delta(event_id, granularity, bucket, delta, create_missing=True):
+    """Add ``delta`` to one bucket with one UPDATE, creating it if needed"""
+    delta = {metric: value for metric, value in delta.items() if value}
+    if event_id is None or not delta:
+        return
+    rows = EventTimeSeries.objects.filter(
+        event_id=event_id, granularity=granularity, bucket=bucket)
+    changes = {metric: F(metric) + value for metric, value in delta.items()}
+    if rows.update(**changes) or not create_missing:
+        return
+    # Concurrent writers may race to create the bucket; one insert wins
+    EventTimeSeries.objects.bulk_create([EventTimeSeries(
+        event_id=event_id, granularity=granularity, bucket=bucket,
+    )], ignore_conflicts=True)
+    rows.update(**changes)
+
+
+def apply_series_change(old, new, create_missing=True):
+    """Apply the difference between two (event_id, points) snapshots"""
+    by_event = {}
+    for snapshot, sign in ((old, -1), (new, 1)):
+        if snapshot is None or snapshot[0] is None:
+            continue
+        event_id, points = snapshot
+        _bucket_deltas(points, sign, by_event.setdefault(event_id, {}))
+    for event_id, deltas in by_event.items():
+        for (granularity, bucket), delta in sorted(deltas.items()):
+            apply_bucket_delta(event_id, granularity, bucket, delta,
+                               create_missing=create_missing)
+
+
+def apply_check_ins(event_id, moves):
+    """
+    Move check-ins of one event between buckets; ``moves`` holds
+    ``(old check_in_time or None, new check_in_time)`` pairs
+    """
+    old, new = {}, {}
+    for before, after in moves:
+        for points, moment in ((old, before), (new, after)):
+            if moment is not None:
+                key = ('check_ins', moment)
+                points[key] = points.get(key, 0) + 1
+    apply_series_change((event_id, old), (event_id, new))
+
+
+def compute_event_timeseries(event_ids):
+    """
+    Rollup rows for many events from the source tables, as
+    ``{(event_id, granularity, bucket): counters}``. Runs a fixed number
+    of grouped queries regardless of batch size.
+    """
+    event_ids = list(event_ids)
+    tzinfo = timezone.get_current_timezone()
+    sources = (
+        (EventParticipant.objects.filter(registration_date__isnull=False),
+         'registration_date', {'registrations': Count('pk')}),
+        (EventParticipant.objects.filter(check_in_time__isnull=False),
+         'check_in_time', {'check_ins': Count('pk')}),
+        (EventSponsor.objects.all(), 'contributed_at',
+         {'sponsor_count': Count('pk'),
+          'sponsorship_amount': Sum('contribution_amount')}),
+    )
+    rows = {}
+    for queryset, field, aggregates in sources:
+        for granularity, trunc in GRANULARITIES.items():
+            grouped = (
+                queryset.filter(event_id__in=event_ids).order_by()
+                .annotate(bucket=trunc(field, tzinfo=tzinfo))
+                .values('event_id', 'bucket').annotate(**aggregates)
+            )
+            for row in grouped:
+                counters = rows.setdefault(
+                    (row['event_id'], granularity, row['bucket']), {})
+                for metric in aggregates:
+                    counters[metric] = row[metric] or 0
+    return rows
+
+
+def refresh_event_timeseries(event_ids):
+    """Replace the rollup rows of the given events; returns rows written"""
+    event_ids = list(event_ids)
+    rows = [
+        EventTimeSeries(event_id=event_id, granularity=granularity,
+                        bucket=bucket, **counters)
+        for (event_id, granularity, bucket), counters
+        in compute_event_timeseries(event_ids).items()
+    ]
+    with transaction.atomic():
+        EventTimeSeries.objects.filter(event_id__in=event_ids).delete()
+        EventTimeSeries.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def parse_moment(value):
+    """An ISO date or datetime (local time when naive); None when blank"""
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = day and datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise TimeSeriesQueryError(f'Invalid date: {value}')
+    return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+
+def _buckets(start, end, granularity):
+    """Starts of every bucket from ``start`` to ``end``, inclusive"""
+    first = bucket_start(start, granularity)
+    last = bucket_start(end, granularity)
+    if first > last:
+        raise TimeSeriesQueryError('start must not be after end')
+    if granularity == 'hour':
+        count = int((last - first) / timedelta(hours=1)) + 1
+    else:
+        count = (timezone.localtime(last).date() -
+                 timezone.localtime(first).date()).days + 1
+    if count > MAX_POINTS:
+        raise TimeSeriesQueryError(
+            f'Range too large: at most {MAX_POINTS} {granularity} buckets')
+    if granularity == 'hour':
+        return [first + timedelta(hours=step) for step in range(count)]
+    first_day = timezone.localtime(first).date()
+    return [
+        timezone.make_aware(datetime.combine(first_day + timedelta(days=step), time.min))
+        for step in range(count)
+    ]
+
+
+def event_timeseries(event, granularity='day', start=None, end=None):
+    """
+    Zero-filled buckets of ``event`` from ``start`` to ``end`` (default:
+    a recent window ending now) with totals over the range.
+    Raises TimeSeriesQueryError for invalid or oversized ranges.
+    """
+    if granularity not in GRANULARITIES:
+        raise TimeSeriesQueryError('granularity must be "hour" or "day"')
+    end = end or timezone.now()
+    start = start or end - DEFAULT_RANGE[granularity]
+    buckets = _buckets(start, end, granularity)
+
+    stored = {
+        row['bucket']: row
+        for row in EventTimeSeries.objects.filter(
+            event_id=event.pk, granularity=granularity,
+            bucket__gte=buckets[0], bucket__lte=buckets[-1],
+        ).values('bucket', *METRICS)
+    }
+    totals = {metric: 0 for metric in METRICS}
+    points = []
+    for bucket in buckets:
+        row = stored.get(bucket, {})
+        point = {'bucket': bucket.isoformat()}
+        for metric in METRICS:
+            value = row.get(metric) or 0
+            totals[metric] += value
+            point[metric] = value
+        points.append(point)
+
+    for counters in (totals, *points):
+        counters['sponsorship_amount'] = str(
+            Decimal(counters['sponsorship_amount']).quantize(Decimal('0.01')))
+    return {
+        'granularity': granularity,
+        'start': buckets[0].isoformat(),
+        'end': buckets[-1].isoformat(),
+        'points': points,
+        'totals': totals,
+    }
@@ -1,60 +1,251 @@
 """
 Event app signal handlers.
 
-Handles automatic cleanup of old image files when Event instances are updated or deleted.
+Queues renditions of newly uploaded images and deferred removal of
+replaced or deleted image files, keeps the EventStats read model and the
+hourly/daily activity rollups in sync with their source rows, refreshes
+each event's full-text search document and invalidates cached event
+detail payloads, map tiles and the cached category tree.
 """
 
-from django.core.files.storage import default_storage
-from django.db.models.signals import post_delete, pre_save
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_save)
 from django.dispatch import receiver
-from django.core.exceptions import ObjectDoesNotExist
 
-from event.models import Event
+from event.models import (Event, EventCategory, EventExpense, EventFeedback,
+                          EventImpact, EventMilestone, EventOrganizer,
+                          EventParticipant, EventPhoto, EventSponsor,
+                          EventStats, EventTicket, EventUpdate)
+from event.services.category_tree import bump_tree_version
+from event.services.detail_cache import bump_event_versions
+from event.services.event_map import MAP_FIELDS, bump_map_version
+from event.services.event_search import index_event
+from event.services.images import (image_fields, queue_deletions,
+                                   queue_images, variant_names)
+from event.services.stats import (CONTRIBUTIONS, apply_change,
+                                  contribution_of)
+from event.services.timeseries import (SERIES_SOURCES, apply_series_change,
+                                       points_of)
 
+# Marks a loaded row whose tracked fields were deferred at load time
+_UNKNOWN_ORIGIN = object()
 
-@receiver(pre_save, sender=Event)
-def delete_old_event_images_on_change(sender, instance, **kwargs):
+# Event fields copied into the search document
+SEARCH_FIELDS = {'title', 'tags', 'short_description', 'description'}
+
+# Models whose image fields go through the rendition pipeline
+IMAGE_MODELS = (Event, EventPhoto, EventUpdate)
+
+# Child rows rendered into (or counted by) the event detail payload
+DETAIL_SOURCES = (
+    EventOrganizer, EventParticipant, EventSponsor, EventExpense, EventTicket,
+    EventPhoto, EventUpdate, EventMilestone, EventFeedback, EventImpact,
+)
+
+
+def remember_replaced_images(sender, instance, raw=False,
+                             update_fields=None, **kwargs):
+    """
+    Note which stored images (and their renditions) a save replaces, and
+    drop the stale rendition entries. Storage is not touched here.
     """
-    Delete old banner_image and thumbnail_image when they are changed.
+    instance._replaced_files = []
+    fields = list(image_fields(sender))
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    if raw or not instance.pk or not fields:
+        return
 
-    This prevents orphaned files from accumulating in storage when users
-    upload new images to replace existing ones.
+    stored = sender.objects.filter(pk=instance.pk).values(
+        *fields, 'image_variants').first()
+    if stored is None:
+        return
+    for field in fields:
+        old_name = stored[field]
+        if old_name and old_name != getattr(instance, field).name:
+            instance._replaced_files += [
+                old_name, *variant_names(stored['image_variants'].get(field))]
+            instance.image_variants.pop(field, None)
+
+
+def queue_image_work(sender, instance, raw=False, update_fields=None, **kwargs):
     """
-    if not instance.pk:
-        # New instance, no old images to delete
+    Queue replaced files for deletion and new images for rendering,
+    in the transaction of the save.
+    """
+    if raw:
         return
+    queue_deletions(getattr(instance, '_replaced_files', ()))
+    instance._replaced_files = []
+
+    fields = image_fields(sender)
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    stale = [
+        field for field in fields
+        if getattr(instance, field) and
+        instance.image_variants.get(field, {}).get('source') !=
+        getattr(instance, field).name
+    ]
+    if stale:
+        queue_images(instance, stale)
 
-    try:
-        old_instance = Event.objects.get(pk=instance.pk)
-    except ObjectDoesNotExist: 
-        # Instance doesn't exist yet, nothing to delete
+
+def queue_deleted_images(sender, instance, **kwargs):
+    """Queue a deleted row's images and renditions for removal"""
+    names = []
+    for field in image_fields(sender):
+        if getattr(instance, field):
+            names += [getattr(instance, field).name,
+                      *variant_names(instance.image_variants.get(field))]
+    queue_deletions(names)
+
+
+for image_model in IMAGE_MODELS:
+    pre_save.connect(
+        remember_replaced_images, sender=image_model,
+        dispatch_uid=f'event_images_pre_save_{image_model.__name__}')
+    post_save.connect(
+        queue_image_work, sender=image_model,
+        dispatch_uid=f'event_images_save_{image_model.__name__}')
+    post_delete.connect(
+        queue_deleted_images, sender=image_model,
+        dispatch_uid=f'event_images_delete_{image_model.__name__}')
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_category_tree(sender, raw=False, **kwargs):
+    """Any category change invalidates the cached tree"""
+    if not raw:
+        bump_tree_version()
+
+
+def _map_values(event):
+    return {field: getattr(event, field) for field in MAP_FIELDS}
+
+
+@receiver(post_init, sender=Event)
+def remember_map_values(sender, instance, **kwargs):
+    """Snapshot the mapped fields of a loaded event"""
+    if instance.pk is None or instance.get_deferred_fields() & MAP_FIELDS:
+        instance._map_origin = _UNKNOWN_ORIGIN
         return
+    instance._map_origin = _map_values(instance)
 
-    # Check and delete old banner_image if changed
-    if old_instance.banner_image and old_instance.banner_image != instance.banner_image:
-        if default_storage.exists(old_instance.banner_image.name):
-            default_storage.delete(old_instance.banner_image.name)
 
-    # Check and delete old thumbnail_image if changed
-    if old_instance.thumbnail_image and old_instance.thumbnail_image != instance.thumbnail_image:
-        if default_storage.exists(old_instance.thumbnail_image.name):
-            default_storage.delete(old_instance.thumbnail_image.name)
+@receiver(post_save, sender=Event)
+def invalidate_event_map(sender, instance, created, raw=False, **kwargs):
+    """Changes to mapped fields invalidate the cached map tiles"""
+    if raw:
+        return
+    values = _map_values(instance)
+    if created or getattr(instance, '_map_origin', _UNKNOWN_ORIGIN) != values:
+        bump_map_version()
+    instance._map_origin = values
 
 
 @receiver(post_delete, sender=Event)
-def delete_event_images_on_delete(sender, instance, **kwargs):
-    """
-    Delete banner_image and thumbnail_image when Event instance is deleted.
+def invalidate_event_map_on_delete(sender, **kwargs):
+    """A deleted event leaves the map"""
+    bump_map_version()
+
+
+@receiver(post_save, sender=Event)
+def create_event_stats(sender, instance, created, raw=False, **kwargs):
+    """Start every new event with an empty statistics row"""
+    if created and not raw:
+        EventStats.objects.get_or_create(event=instance)
 
-    This ensures that image files are removed from storage when the event
-    is permanently deleted from the database.
+
+@receiver(post_save, sender=Event)
+def update_event_search_document(sender, instance, raw=False,
+                                 update_fields=None, **kwargs):
+    """Keep the full-text search document in step with the event"""
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & SEARCH_FIELDS:
+        return
+    index_event(instance)
+
+
+def track_contributions(label, sources, snapshot, apply):
+    """
+    Keep a read model in step with the rows of ``sources`` (model ->
+    ``(contribute, tracked fields)``). What a row contributes is
+    snapshotted when it is loaded (``snapshot(instance)``), and saves and
+    deletes hand ``apply(old, new)`` the difference.
     """
-    # Delete banner_image if it exists
-    if instance.banner_image:
-        if default_storage.exists(instance.banner_image.name):
-            default_storage.delete(instance.banner_image.name)
-
-    # Delete thumbnail_image if it exists
-    if instance.thumbnail_image:
-        if default_storage.exists(instance.thumbnail_image.name):
-            default_storage.delete(instance.thumbnail_image.name)
+    origin_attr = f'_{label}_origin'
+
+    def remember_origin(sender, instance, **kwargs):
+        """Snapshot what a loaded row contributes"""
+        if instance.pk is None:
+            setattr(instance, origin_attr, None)
+            return
+        _, tracked_fields = sources[sender]
+        if instance.get_deferred_fields() & {'event_id', *tracked_fields}:
+            setattr(instance, origin_attr, _UNKNOWN_ORIGIN)
+            return
+        setattr(instance, origin_attr, snapshot(instance))
+
+    def load_origin(sender, instance, raw=False, **kwargs):
+        """Read the stored contribution when it was not loaded"""
+        if raw or instance.pk is None:
+            return
+        origin = getattr(instance, origin_attr, _UNKNOWN_ORIGIN)
+        if origin is _UNKNOWN_ORIGIN or origin is None:
+            stored = sender.objects.filter(pk=instance.pk).first()
+            setattr(instance, origin_attr,
+                    snapshot(stored) if stored else None)
+
+    def apply_on_save(sender, instance, created, raw=False, **kwargs):
+        """Apply the change of contribution"""
+        if raw:
+            return
+        old = None if created else getattr(instance, origin_attr, None)
+        new = snapshot(instance)
+        apply(old, new)
+        setattr(instance, origin_attr, new)
+
+    def apply_on_delete(sender, instance, **kwargs):
+        """Remove the row's contribution without recreating missing rows"""
+        origin = getattr(instance, origin_attr, _UNKNOWN_ORIGIN)
+        if origin is _UNKNOWN_ORIGIN or origin is None:
+            origin = snapshot(instance)
+        apply(origin, None, create_missing=False)
+
+    # The handlers are closures, so the signals must hold strong references
+    for model in sources:
+        for signal, handler, action in (
+                (post_init, remember_origin, 'init'),
+                (pre_save, load_origin, 'pre_save'),
+                (post_save, apply_on_save, 'save'),
+                (post_delete, apply_on_delete, 'delete')):
+            signal.connect(
+                handler, sender=model, weak=False,
+                dispatch_uid=f'event_{label}_{action}_{model.__name__}')
+
+
+# EventStats counters, updated with F-expression UPDATEs
+track_contributions('stats', CONTRIBUTIONS, contribution_of, apply_change)
+# Hourly/daily rollup buckets
+track_contributions(
+    'series', SERIES_SOURCES, points_of, apply_series_change)
+
+
+def invalidate_event_detail(sender, instance, raw=False, **kwargs):
+    """Bump the cached detail version of the affected event"""
+    if raw:
+        return
+    event_id = instance.pk if sender is Event else instance.event_id
+    bump_event_versions([event_id])
+
+
+for detail_model in (Event, *DETAIL_SOURCES):
+    post_save.connect(
+        invalidate_event_detail, sender=detail_model,
+        dispatch_uid=f'event_detail_save_{detail_model.__name__}')
+    post_delete.connect(
+        invalidate_event_detail, sender=detail_model,
+        dispatch_uid=f'event_detail_delete_{detail_model.__name__}')
@@ -1,3 +1,1793 @@
-from django.test import TestCase
+"""
+Tests for the event app
+"""
 
-# Create your tests here.
+import csv
+import hashlib
+import json
+import math
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api.serializers.event import EventPhotoSerializer
+from event.models import (Event, EventCategory, EventDocumentBatch,
+                          EventExpense, EventFeedback, EventFileDeletion,
+                          EventImageJob, EventNotification, EventOrganizer,
+                          EventParticipant, EventPhoto, EventSponsor,
+                          EventStats, EventTicket, EventTimeSeries, EventType,
+                          EventUpdate, TicketReservation)
+from event.permissions import (EventPermissionChecker, EventPermissionContext,
+                               get_user_event_permissions)
+from event.services.category_tree import get_tree_version
+from event.services.certificates import process_batches
+from event.services.checkin import (hash_code, load_manifest, sync_scans,
+                                    ticket_code)
+from event.services.event_map import get_map_version
+from event.services.geo_search import (ProximitySearch, covering_cells,
+                                       encode_geohash, haversine_km)
+from event.services.images import process_pending, variant_names
+from event.services.lifecycle import advance_lifecycle
+from event.services.notifications import (deliver_batch, deliver_pending,
+                                          enqueue,
+                                          notify_registration_received)
+from event.services.reminders import schedule_reminders
+from event.services.registration import (cancel_participant,
+                                         register_participant)
+from event.services.stats import compute_event_stats
+from event.services.tickets import (ReservationNotActive, TicketUnavailable,
+                                    confirm_reservation, expire_reservations,
+                                    release_reservation, reserve_tickets)
+from event.services.timeseries import (compute_event_timeseries,
+                                       refresh_event_timeseries)
+from geo.models import Country
+
+User = get_user_model()
+
+
+def destination(latitude, longitude, distance_km, bearing):
+    """Point reached from a coordinate along a bearing (spherical earth)"""
+    angular = distance_km / 6371.0088
+    lat1, lng1, theta = map(math.radians, (latitude, longitude, bearing))
+    lat2 = math.asin(math.sin(lat1) * math.cos(angular) +
+                     math.cos(lat1) * math.sin(angular) * math.cos(theta))
+    lng2 = lng1 + math.atan2(
+        math.sin(theta) * math.sin(angular) * math.cos(lat1),
+        math.cos(angular) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lng2) + 540) % 360 - 180
+
+
+def create_event(created_by, **kwargs):
+    """Create a minimal valid physical event"""
+    event_type = EventType.objects.first()
+    if event_type is None:
+        category = EventCategory.objects.create(
+            name="Education", slug="education")
+        event_type = EventType.objects.create(
+            name="Workshop", slug="workshop", category=category)
+    country = Country.objects.first() or Country.objects.create(
+        name="Cambodia", code="KHM")
+
+    start = kwargs.pop('start_datetime', timezone.now() + timedelta(days=7))
+    index = Event.objects.count() + 1
+    defaults = {
+        'title': f"Event {index}",
+        'slug': f"event-{index}",
+        'description': "Test event",
+        'event_type': event_type,
+        'country': country,
+        'address_line_1': "Main street",
+        'start_datetime': start,
+        'end_datetime': start + timedelta(hours=3),
+        'status': 'published',
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(created_by=created_by, **defaults)
+
+
+class EventPermissionContextTestCase(TestCase):
+    """Permission evaluation should cost at most one query per event"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.organizer = User.objects.create_user(
+            username="organizer", email="org@example.com", password="pass12345")
+        self.stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        EventOrganizer.objects.create(
+            event=self.event, user=self.organizer, role='finance-manager',
+            can_manage_finances=True, can_upload_media=False)
+
+    def test_owner_checks_need_no_query(self):
+        """Ownership is read from the loaded event row"""
+        with self.assertNumQueries(0):
+            EventPermissionChecker.require_edit_permission(self.owner, self.event)
+            EventPermissionChecker.require_finance_management(
+                self.owner, self.event)
+        with self.assertNumQueries(1):
+            permissions = get_user_event_permissions(self.owner, self.event)
+        self.assertTrue(permissions['is_owner'])
+        self.assertTrue(permissions['can_manage_organizers'])
+        self.assertEqual(permissions['role'], 'owner')
+
+    def test_all_checks_share_one_query(self):
+        """Every helper reuses the memoized organizer row"""
+        reloaded = Event.objects.get(pk=self.event.pk)
+        with self.assertNumQueries(1):
+            EventPermissionChecker.require_finance_management(
+                self.organizer, self.event)
+            permissions = get_user_event_permissions(
+                self.organizer, self.event)
+            self.assertFalse(
+                EventPermissionChecker.can_upload_media(self.organizer, reloaded))
+        self.assertTrue(permissions['is_organizer'])
+        self.assertFalse(permissions['is_lead_organizer'])
+        self.assertFalse(permissions['can_edit_event'])
+        self.assertEqual(permissions['role'], 'finance-manager')
+
+    def test_stranger_and_anonymous(self):
+        """Users without a role get no capabilities"""
+        permissions = get_user_event_permissions(self.stranger, self.event)
+        self.assertFalse(any(
+            value for key, value in permissions.items() if key != 'role'))
+        self.assertIsNone(permissions['role'])
+        self.assertEqual(get_user_event_permissions(None, self.event), {})
+
+    def test_organizer_changes_drop_cached_contexts(self):
+        """A lead who demotes themselves loses lead rights right away"""
+        lead = EventOrganizer.objects.create(
+            event=self.event, user=self.stranger, role='lead')
+        client = APIClient()
+        # force_authenticate reuses one user object, and so its contexts
+        client.force_authenticate(self.stranger)
+        url = (f'/api/v1/event-organizers/{lead.pk}/update_permissions/'
+               f'?event={self.event.pk}')
+        self.assertEqual(
+            client.patch(url, {'role': 'finance-manager'}).status_code, 200)
+        self.assertEqual(client.patch(url, {'role': 'lead'}).status_code, 403)
+
+    def test_prime_resolves_many_events_at_once(self):
+        """List endpoints resolve all rows with a single query"""
+        events = [self.event, create_event(self.owner), create_event(self.owner)]
+        with self.assertNumQueries(1):
+            EventPermissionContext.prime(self.organizer, events)
+            for event in events:
+                get_user_event_permissions(self.organizer, event)
+
+
+class EventProximitySearchTestCase(TestCase):
+    """Radius search over the geohash index"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        # Phnom Penh, ~5 km away, Siem Reap (~230 km) and an equator pair
+        self.phnom_penh = self._event_at('11.556400', '104.928200')
+        self.nearby = self._event_at('11.590000', '104.900000')
+        self.siem_reap = self._event_at('13.367100', '103.844800')
+        self.equator = self._event_at('0.000000', '0.010000')
+        self.client = APIClient()
+
+    def _event_at(self, latitude, longitude):
+        return create_event(
+            self.owner, latitude=Decimal(latitude), longitude=Decimal(longitude))
+
+    def test_geohash_is_maintained_on_save(self):
+        """Known reference value and refresh on coordinate change"""
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertTrue(self.phnom_penh.geohash.startswith('w64'))
+        self.phnom_penh.latitude = Decimal('13.367100')
+        self.phnom_penh.longitude = Decimal('103.844800')
+        self.phnom_penh.save(update_fields=['latitude', 'longitude'])
+        self.phnom_penh.refresh_from_db()
+        self.assertEqual(self.phnom_penh.geohash, self.siem_reap.geohash)
+
+    def test_cells_cover_the_circle(self):
+        """Every point on the search circle falls in one of the cells"""
+        for latitude, longitude in [(11.5, 104.9), (0.0, 0.0), (60.0, 179.99)]:
+            cells = covering_cells(latitude, longitude, 25)
+            self.assertTrue(1 <= len(cells) <= 9)
+            for bearing in range(0, 360, 10):
+                point_lat, point_lng = destination(latitude, longitude, 24.9, bearing)
+                point_hash = encode_geohash(point_lat, point_lng)
+                self.assertTrue(
+                    any(point_hash.startswith(cell) for cell in cells),
+                    (latitude, longitude, bearing))
+
+    def test_search_refines_and_sorts_by_distance(self):
+        """Only events inside the radius are returned, nearest first"""
+        search = ProximitySearch('11.5564', '104.9282', 50)
+        ids, distances = search.search(
+            Event.objects.order_by('-start_datetime'), sort_by_distance=True)
+        self.assertEqual(ids, [self.phnom_penh.pk, self.nearby.pk])
+        self.assertAlmostEqual(distances[self.phnom_penh.pk], 0, places=3)
+        self.assertAlmostEqual(
+            distances[self.nearby.pk],
+            float(haversine_km(11.5564, 104.9282, [11.59], [104.9])[0]),
+            places=6)
+
+    def test_search_near_the_equator(self):
+        """The old bounding box divided by zero at latitude 0"""
+        ids, _ = ProximitySearch(0, 0, 5).search(Event.objects.all())
+        self.assertEqual(ids, [self.equator.pk])
+
+    def test_list_endpoint_returns_distance(self):
+        """?sort=distance orders the list and exposes distance_km"""
+        response = self.client.get('/api/v1/events/', {
+            'latitude': '11.5564', 'longitude': '104.9282',
+            'radius_km': '300', 'sort': 'distance',
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(
+            [item['id'] for item in results],
+            [self.phnom_penh.pk, self.nearby.pk, self.siem_reap.pk])
+        self.assertLess(results[0]['distance_km'], results[1]['distance_km'])
+        self.assertEqual(response.data['count'], 3)
+
+
+class EventListQueryCountTestCase(TestCase):
+    """List pages must not issue per-row count queries"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.client = APIClient()
+
+    def _populate(self, count):
+        for _ in range(count):
+            event = create_event(self.owner, max_participants=2)
+            for index in range(2):
+                EventParticipant.objects.create(
+                    event=event, name=f"Guest {index}",
+                    email=f"guest{index}-{event.pk}@example.com")
+            EventSponsor.objects.create(
+                event=event, sponsor_name="Sponsor", sponsor_type='gold')
+            EventSponsor.objects.create(
+                event=event, sponsor_name="Hidden", sponsor_type='gold',
+                is_public=False)
+
+    def _list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/events/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        """Query count does not grow with the number of events listed"""
+        self._populate(2)
+        _, small_page = self._list_queries()
+        self._populate(10)
+        response, large_page = self._list_queries()
+
+        self.assertEqual(small_page, large_page)
+        self.assertLessEqual(large_page, 2)
+        for item in response.data['results']:
+            self.assertEqual(item['participants_count'], 2)
+            self.assertEqual(item['sponsors_count'], 1)
+            self.assertTrue(item['is_full'])
+
+    def test_annotations_match_python_fallback(self):
+        """Annotated and unannotated instances agree"""
+        self._populate(1)
+        event = Event.objects.get()
+        annotated = Event.objects.with_counts().get()
+        with self.assertNumQueries(0):
+            self.assertTrue(annotated.is_full)
+            self.assertEqual(annotated.registered_count, 2)
+            self.assertEqual(annotated.public_sponsor_count, 1)
+        self.assertTrue(event.is_full)
+        event.participants.update(status='cancelled')
+        self.assertFalse(Event.objects.with_counts().get().is_full)
+
+
+class EventStatsTestCase(TestCase):
+    """The EventStats read model follows every write path"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.other = create_event(self.owner)
+
+    def _stats(self, event=None):
+        return EventStats.objects.get(event=event or self.event)
+
+    def _assert_consistent(self):
+        for event in (self.event, self.other):
+            stats = self._stats(event)
+            expected = compute_event_stats([event.pk])[event.pk]
+            for field, value in expected.items():
+                self.assertEqual(getattr(stats, field), value, field)
+
+    def _participant(self, index, **kwargs):
+        return EventParticipant.objects.create(
+            event=self.event, name=f"Guest {index}",
+            email=f"guest{index}@example.com", **kwargs)
+
+    def test_participant_lifecycle(self):
+        """Status changes move counts between buckets"""
+        first = self._participant(1)
+        self._participant(2, status='waitlist')
+        self.assertEqual(self._stats().registered_count, 1)
+
+        first.status = 'attended'
+        first.save()
+        stats = self._stats()
+        self.assertEqual(
+            (stats.registered_count, stats.attended_count, stats.waitlist_count),
+            (0, 1, 1))
+
+        # A row loaded separately still applies the right delta
+        reloaded = EventParticipant.objects.get(pk=first.pk)
+        reloaded.event = self.other
+        reloaded.save()
+        self.assertEqual(self._stats().attended_count, 0)
+        self.assertEqual(self._stats(self.other).attended_count, 1)
+
+        reloaded.delete()
+        self.assertEqual(self._stats(self.other).total_participants, 0)
+        self._assert_consistent()
+
+    def test_sponsors_expenses_and_feedback(self):
+        """Sums and rating histogram are maintained incrementally"""
+        sponsor = EventSponsor.objects.create(
+            event=self.event, sponsor_name="Acme", sponsor_type='gold',
+            contribution_amount=Decimal('150.00'))
+        EventSponsor.objects.create(
+            event=self.event, sponsor_name="Quiet", sponsor_type='gold',
+            contribution_amount=Decimal('50.00'), is_public=False)
+        expense = EventExpense.objects.create(
+            event=self.event, category='venue', title="Hall",
+            description="Hall rental", amount=Decimal('80.00'),
+            expense_date=timezone.now().date(), submitted_by=self.owner)
+        participant = self._participant(1)
+        feedback = EventFeedback.objects.create(
+            event=self.event, participant=participant, overall_rating=4)
+        EventFeedback.objects.create(
+            event=self.event, participant=self._participant(2),
+            overall_rating=2)
+
+        sponsor.contribution_amount = Decimal('200.00')
+        sponsor.save()
+        expense.status = 'approved'
+        expense.save()
+        feedback.overall_rating = 5
+        feedback.save()
+
+        stats = self._stats()
+        self.assertEqual(stats.sponsor_count, 2)
+        self.assertEqual(stats.public_sponsor_count, 1)
+        self.assertEqual(stats.sponsorship_total, Decimal('250.00'))
+        self.assertEqual(stats.approved_expense_total, Decimal('80.00'))
+        self.assertEqual(stats.pending_expense_count, 0)
+        self.assertEqual(stats.average_rating, 3.5)
+        self.assertEqual(stats.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+        self._assert_consistent()
+
+    def test_rebuild_repairs_drift(self):
+        """Bulk updates bypass signals; the rebuild command repairs them"""
+        self._participant(1)
+        self._participant(2)
+        EventParticipant.objects.update(status='attended')
+        EventStats.objects.filter(event=self.other).delete()
+        self.assertEqual(self._stats().attended_count, 0)
+
+        call_command('rebuild_event_stats', stdout=StringIO())
+        self.assertEqual(self._stats().attended_count, 2)
+        self._assert_consistent()
+
+    def test_detail_reads_stats_row(self):
+        """Detail serializer counters come from the joined stats row"""
+        self._participant(1)
+        self._participant(2, status='attended')
+        response = APIClient().get(f'/api/v1/events/{self.event.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['participants_count'], 2)
+        self.assertEqual(response.data['attended_count'], 1)
+
+
+class EventRegistrationTestCase(TestCase):
+    """Seat allocation, waitlist placement and FIFO promotion"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner, max_participants=2)
+
+    def _register(self, index):
+        return register_participant(
+            self.event, name=f"Guest {index}", email=f"guest{index}@example.com")
+
+    def test_full_event_waitlists(self):
+        """Confirmed and attended participants hold seats too"""
+        first = self._register(1)
+        first.status = 'confirmed'
+        first.save()
+        self.assertEqual(self._register(2).status, 'registered')
+        self.assertEqual(self._register(3).status, 'waitlist')
+        self.assertTrue(Event.objects.with_counts().get().is_full)
+
+    def test_zero_capacity_means_unlimited(self):
+        """max_participants=0 never fills, in SQL and in Python"""
+        # Rejected by full_clean, but legacy rows and bulk updates hold it
+        Event.objects.filter(pk=self.event.pk).update(max_participants=0)
+        self.event.refresh_from_db()
+        self.assertEqual(self._register(1).status, 'registered')
+        self.assertFalse(Event.objects.with_counts().get().is_full)
+        self.assertFalse(Event.objects.get().is_full)
+
+    def test_cancel_promotes_in_registration_order(self):
+        """Cancelling and rejecting hand the seat to the oldest waitlister"""
+        first, second = self._register(1), self._register(2)
+        waitlisted = [self._register(index) for index in range(3, 6)]
+
+        self.assertEqual(
+            [p.pk for p in cancel_participant(first)], [waitlisted[0].pk])
+        self.assertEqual(
+            [p.pk for p in cancel_participant(second, notes="Rejected")],
+            [waitlisted[1].pk])
+        # Cancelling a waitlisted participant frees no seat
+        self.assertEqual(cancel_participant(waitlisted[2]), [])
+
+        statuses = dict(EventParticipant.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[waitlisted[0].pk], 'registered')
+        self.assertEqual(statuses[waitlisted[1].pk], 'registered')
+        self.assertEqual(statuses[waitlisted[2].pk], 'cancelled')
+        self.assertEqual(EventStats.objects.get(event=self.event).registered_count, 2)
+        self.assertEqual(
+            set(EventNotification.objects.filter(
+                kind='waitlist_promoted').values_list('recipient', flat=True)),
+            {waitlisted[0].email, waitlisted[1].email})
+
+    def test_confirm_waitlisted_needs_seat(self):
+        """Confirming a waitlister claims a seat and fails when full"""
+        first = self._register(1)
+        self._register(2)
+        waitlisted = self._register(3)
+        client = APIClient()
+        client.force_authenticate(self.owner)
+
+        def confirm(participant):
+            return client.post(
+                f'/api/v1/event-participants/{participant.pk}/confirm/'
+                f'?event={self.event.pk}')
+
+        self.assertEqual(confirm(waitlisted).status_code, 409)
+        waitlisted.refresh_from_db()
+        self.assertEqual(waitlisted.status, 'waitlist')
+        # A participant who already holds a seat needs no new one
+        self.assertEqual(confirm(first).data['status'], 'confirmed')
+
+        first.status = 'cancelled'
+        first.save()
+        response = confirm(waitlisted)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'confirmed')
+        self.assertEqual(confirm(self._register(4)).status_code, 409)
+
+
+class ConcurrentRegistrationTestCase(TransactionTestCase):
+    """Simultaneous registrations never oversell an event"""
+
+    def test_no_overbooking_under_load(self):
+        """Hundreds of concurrent registrations fill exactly the capacity"""
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        event = create_event(owner, max_participants=25)
+        registrations = 200
+        barrier = threading.Barrier(20)
+
+        def register(index):
+            try:
+                if index < 20:
+                    barrier.wait()
+                return register_participant(
+                    event, name=f"Guest {index}",
+                    email=f"guest{index}@example.com").status
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            statuses = list(executor.map(register, range(registrations)))
+
+        self.assertEqual(statuses.count('registered'), 25)
+        self.assertEqual(statuses.count('waitlist'), registrations - 25)
+        self.assertEqual(
+            EventParticipant.objects.filter(status='registered').count(), 25)
+        stats = EventStats.objects.get(event=event)
+        self.assertEqual(
+            (stats.registered_count, stats.waitlist_count),
+            (25, registrations - 25))
+
+
+class TicketReservationTestCase(TestCase):
+    """Timed holds against limited ticket inventory"""
+
+    def setUp(self):
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.ticket = EventTicket.objects.create(
+            event=create_event(owner), name="General", price=Decimal('5.00'),
+            quantity=3, max_per_order=3)
+
+    def _ticket(self):
+        return EventTicket.objects.get(pk=self.ticket.pk)
+
+    def test_holds_count_against_inventory(self):
+        """Held tickets cannot be sold twice; confirmation sells them"""
+        first = reserve_tickets(self.ticket, 2)
+        with self.assertRaises(TicketUnavailable):
+            reserve_tickets(self.ticket, 2)
+        self.assertEqual(self._ticket().remaining_quantity, 1)
+
+        confirm_reservation(first)
+        ticket = self._ticket()
+        self.assertEqual((ticket.quantity_sold, ticket.quantity_held), (2, 0))
+        with self.assertRaises(ReservationNotActive):
+            release_reservation(first)
+
+    def test_expired_holds_are_swept_and_reclaimed(self):
+        """The sweeper returns lapsed holds; confirming them fails"""
+        stale = reserve_tickets(self.ticket, 3, hold_for=timedelta(seconds=-1))
+        self.assertEqual(expire_reservations(batch_size=1), 1)
+        with self.assertRaises(ReservationNotActive):
+            confirm_reservation(stale)
+
+        reserve_tickets(self.ticket, 3, hold_for=timedelta(seconds=-1))
+        # A buyer hitting an empty shelf reclaims lapsed holds inline
+        reserve_tickets(self.ticket, 3)
+        ticket = self._ticket()
+        self.assertEqual((ticket.quantity_sold, ticket.quantity_held), (0, 3))
+        self.assertEqual(
+            TicketReservation.objects.filter(status='expired').count(), 2)
+
+    def test_reserve_endpoint(self):
+        """Reserve then confirm through the API by token"""
+        client = APIClient()
+        url = f'/api/v1/event-tickets/{self.ticket.pk}/'
+        response = client.post(f'{url}reserve/', {'quantity': 2})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            client.post(f'{url}reserve/', {'quantity': 2}).status_code, 409)
+
+        token = response.data['token']
+        response = client.post(
+            '/api/v1/event-tickets/confirm_reservation/', {'token': token})
+        self.assertEqual(response.data['status'], 'confirmed')
+        self.assertEqual(self._ticket().quantity_sold, 2)
+
+
+class ConcurrentTicketReservationTestCase(TransactionTestCase):
+    """Contended checkout never oversells a limited ticket"""
+
+    def test_no_overselling_under_load(self):
+        """Only the available quantity is ever held or sold"""
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        ticket = EventTicket.objects.create(
+            event=create_event(owner), name="Limited", price=Decimal('5.00'),
+            quantity=10)
+
+        def checkout(index):
+            try:
+                reservation = reserve_tickets(ticket, 1 + index % 2)
+                confirm_reservation(reservation)
+                return reservation.quantity
+            except TicketUnavailable:
+                return 0
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            sold = sum(executor.map(checkout, range(100)))
+
+        ticket.refresh_from_db()
+        self.assertEqual(sold, 10)
+        self.assertEqual((ticket.quantity_sold, ticket.quantity_held), (10, 0))
+
+
+class ParticipantExportImportTestCase(TestCase):
+    """Streaming export and chunked CSV import"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.url = f'/api/v1/events/{self.event.pk}/participants/'
+        self.client = APIClient()
+
+    def test_export_streams_projection(self):
+        """Organizers get contact details, the public projection does not"""
+        for index, status in enumerate(['confirmed', 'registered', 'attended']):
+            EventParticipant.objects.create(
+                event=self.event, name=f"Guest {index}", status=status,
+                email=f"guest{index}@example.com", phone="012345678")
+
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.client.force_authenticate(stranger)
+        response = self.client.get(f'{self.url}export/', {'export_format': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(
+            response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['name'] for row in rows], ["Guest 0", "Guest 2"])
+        self.assertNotIn('email', rows[0])
+
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(f'{self.url}export/')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        header = next(csv.reader(lines[:1]))
+        self.assertIn('email', header)
+        self.assertEqual(len(lines), 4)
+
+    def test_public_payload_keys(self):
+        """Non-organizers get exactly the public participant projection"""
+        EventParticipant.objects.create(
+            event=self.event, name="Guest", status='confirmed',
+            email="guest@example.com", phone="012345678", notes="VIP")
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.client.force_authenticate(stranger)
+        response = self.client.get(
+            f'/api/v1/events/{self.event.pk}/participants_list/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), {
+            'id', 'event', 'name', 'role', 'status',
+            'organization_name', 'registration_date'})
+
+    def test_import_validates_in_chunks(self):
+        """Invalid and duplicate rows are reported, the rest bulk created"""
+        EventParticipant.objects.create(
+            event=self.event, name="Existing", email="dup@example.com")
+        content = "\n".join([
+            "Name,Email,Phone",
+            "Ann,ann@example.com,",
+            "Bob,not-an-email,",
+            "Dup,DUP@example.com,",
+            "Cat,cat@example.com,",
+            "Ann again,ann@example.com,",
+        ]).encode()
+        upload = SimpleUploadedFile("guests.csv", content, content_type="text/csv")
+
+        self.client.force_authenticate(self.owner)
+        with patch('event.services.participant_import.IMPORT_CHUNK_SIZE', 2):
+            response = self.client.post(
+                f'{self.url}import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data['created'], response.data['duplicates'],
+             response.data['failed']), (2, 2, 1))
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertEqual(EventStats.objects.get(event=self.event).registered_count, 3)
+
+    def test_import_respects_capacity(self):
+        """Imported rows fill free seats in order, the rest are waitlisted"""
+        Event.objects.filter(pk=self.event.pk).update(max_participants=3)
+        self.event.refresh_from_db()
+        EventParticipant.objects.create(
+            event=self.event, name="Existing", email="first@example.com")
+        content = "\n".join([
+            "Name,Email,Status",
+            "Ann,ann@example.com,attended",
+            "Bob,bob@example.com,confirmed",
+            "Cat,cat@example.com,registered",
+            "Dan,dan@example.com,attended",
+        ]).encode()
+        upload = SimpleUploadedFile("guests.csv", content, content_type="text/csv")
+
+        self.client.force_authenticate(self.owner)
+        with patch('event.services.participant_import.IMPORT_CHUNK_SIZE', 1):
+            response = self.client.post(
+                f'{self.url}import/', {'file': upload}, format='multipart')
+        self.assertEqual(
+            (response.data['created'], response.data['waitlisted']), (4, 2))
+        self.assertEqual(
+            dict(EventParticipant.objects.values_list('name', 'status')), {
+                "Existing": 'registered', "Ann": 'registered',
+                "Bob": 'registered', "Cat": 'waitlist', "Dan": 'waitlist'})
+        stats = EventStats.objects.get(event=self.event)
+        self.assertEqual((stats.registered_count, stats.waitlist_count), (3, 2))
+
+
+class OfflineCheckInTestCase(TestCase):
+    """Kiosk manifest download and batched scan sync"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.guests = [
+            EventParticipant.objects.create(
+                event=self.event, name=f"Guest {index}", status=status,
+                email=f"guest{index}@example.com")
+            for index, status in enumerate(['registered', 'confirmed', 'waitlist'])
+        ]
+        self.url = f'/api/v1/events/{self.event.pk}/check-in/'
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def _scan(self, participant, minutes_ago):
+        return {
+            'participant': participant.pk,
+            'code': ticket_code(participant.pk, self.event.pk),
+            'scanned_at': (timezone.now() - timedelta(minutes=minutes_ago)).isoformat(),
+        }
+
+    def test_manifest_is_signed_and_etagged(self):
+        """Hashes map to participants; unchanged manifests return 304"""
+        response = self.client.get(f'{self.url}manifest/')
+        self.assertEqual(response.status_code, 200)
+        manifest = load_manifest(response.data['manifest'])
+        code = ticket_code(self.guests[0].pk, self.event.pk)
+        self.assertIn([hash_code(code), self.guests[0].pk, 'registered'],
+                      manifest['entries'])
+        self.assertNotIn(code, response.data['manifest'])
+
+        etag = response['ETag']
+        with patch('api.views.events_viewset.build_manifest') as build:
+            response = self.client.get(
+                f'{self.url}manifest/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        build.assert_not_called()
+        # Kiosks may send several cached versions
+        response = self.client.get(
+            f'{self.url}manifest/', HTTP_IF_NONE_MATCH=f'"stale", {etag}')
+        self.assertEqual(response.status_code, 304)
+        self.guests[2].status = 'registered'
+        self.guests[2].save()
+        response = self.client.get(
+            f'{self.url}manifest/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_sync_is_idempotent(self):
+        """Earliest scan wins; replays and bad codes change nothing"""
+        first, second, waitlisted = self.guests
+        forged = dict(self._scan(second, 1), code='0' * 20)
+        scans = [
+            self._scan(first, 5), self._scan(first, 10),
+            self._scan(second, 3), self._scan(waitlisted, 2), forged,
+        ]
+        response = self.client.post(
+            f'{self.url}sync/', {'scans': scans}, format='json')
+        self.assertEqual(response.data['applied'], 2)
+        self.assertEqual(response.data['duplicates'], 1)
+        self.assertEqual(
+            [item['reason'] for item in response.data['rejected']],
+            ['participant is waitlist', 'invalid ticket code'])
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'attended')
+        self.assertEqual(
+            first.check_in_time.replace(microsecond=0),
+            parse_datetime(scans[1]['scanned_at']).replace(microsecond=0))
+        self.assertEqual(EventStats.objects.get(event=self.event).attended_count, 2)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                f'{self.url}sync/', {'scans': scans[:3]}, format='json')
+        self.assertFalse(any(
+            query['sql'].startswith('UPDATE') for query in context.captured_queries))
+        self.assertEqual(response.data['applied'], 0)
+        self.assertEqual(response.data['duplicates'], 3)
+
+
+class EventFullTextSearchTestCase(TestCase):
+    """Ranked ?q= search over the event search index"""
+
+    def setUp(self):
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.robotics = create_event(
+            owner, title="Robotics workshop", tags=["STEM", "Coding Club"],
+            description="Build a line follower")
+        self.mention = create_event(
+            owner, title="Science fair",
+            description="Includes a short robotics demo")
+        self.draft = create_event(
+            owner, title="Robotics planning", status='draft', tags=["stem"])
+        self.client = APIClient()
+
+    def _ids(self, **params):
+        response = self.client.get('/api/v1/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data['results']]
+
+    def test_ranked_prefix_matches(self):
+        """Title hits outrank body hits; terms match as prefixes"""
+        self.assertEqual(
+            self._ids(q='robot', status='published'),
+            [self.robotics.pk, self.mention.pk])
+        self.assertEqual(self._ids(q='robot follow'), [self.robotics.pk])
+        self.assertEqual(self._ids(q='"; DROP TABLE'), [])
+
+    def test_tag_filter_and_index_refresh(self):
+        """Tags filter exactly and the index follows saves and deletes"""
+        self.assertEqual(
+            sorted(self._ids(tag='stem')), [self.robotics.pk, self.draft.pk])
+        self.assertEqual(self._ids(tag='coding club', q='workshop'),
+                         [self.robotics.pk])
+        self.assertEqual(self._ids(tag='coding'), [])
+
+        self.mention.title = "Astronomy night"
+        self.mention.description = "Telescopes"
+        self.mention.save()
+        self.robotics.delete()
+        self.assertEqual(self._ids(q='robot'), [self.draft.pk])
+        self.assertEqual(self._ids(q='telescope'), [self.mention.pk])
+
+    def test_rebuild_command(self):
+        """The rebuild command restores documents written around save()"""
+        Event.objects.filter(pk=self.mention.pk).update(title="Chess open")
+        call_command('rebuild_event_search_index', stdout=StringIO())
+        self.assertEqual(self._ids(q='chess'), [self.mention.pk])
+
+
+class EventLifecycleTestCase(TestCase):
+    """Set-based lifecycle transitions driven by next_transition_at"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.now = timezone.now()
+
+    def _reload(self, event):
+        return Event.objects.get(pk=event.pk)
+
+    def test_save_records_next_transition(self):
+        """Upcoming events are due at the earliest window boundary"""
+        event = create_event(
+            self.owner, start_datetime=self.now + timedelta(days=3),
+            registration_start=self.now + timedelta(days=1))
+        self.assertFalse(event.registration_open)
+        self.assertEqual(event.next_transition_at, event.registration_start)
+
+        event.status = 'draft'
+        event.save(update_fields=['status'])
+        self.assertIsNone(self._reload(event).next_transition_at)
+
+    def test_scheduler_advances_due_events(self):
+        """published -> ongoing -> completed, one UPDATE per transition"""
+        running = create_event(
+            self.owner, start_datetime=self.now + timedelta(minutes=5))
+        finished = create_event(
+            self.owner, start_datetime=self.now + timedelta(minutes=5))
+        untouched = create_event(
+            self.owner, start_datetime=self.now + timedelta(days=5))
+        self.assertTrue(running.registration_open)
+
+        later = self.now + timedelta(minutes=10)
+        counts = advance_lifecycle(now=later)
+        self.assertEqual(counts['started'], 2)
+        self.assertEqual(self._reload(running).status, 'ongoing')
+        self.assertEqual(
+            self._reload(running).next_transition_at, running.end_datetime)
+        self.assertEqual(
+            self._reload(untouched).next_transition_at, untouched.start_datetime)
+
+        Event.objects.filter(pk=finished.pk).update(
+            end_datetime=later + timedelta(minutes=1),
+            next_transition_at=later + timedelta(minutes=1))
+        with self.assertNumQueries(9):
+            counts = advance_lifecycle(now=later + timedelta(hours=4))
+        self.assertEqual(counts['completed'], 2)
+        self.assertEqual(counts['registration_closed'], 2)
+        finished = self._reload(finished)
+        self.assertEqual(
+            (finished.status, finished.registration_open,
+             finished.next_transition_at), ('completed', False, None))
+        self.assertEqual(self._reload(untouched).status, 'published')
+
+    def test_listing_filters_on_stored_flag(self):
+        """registration_open is filterable without time arithmetic"""
+        open_event = create_event(self.owner)
+        create_event(
+            self.owner, registration_start=self.now + timedelta(days=1))
+        response = APIClient().get(
+            '/api/v1/events/', {'registration_open': 'true'})
+        self.assertEqual(
+            [item['id'] for item in response.data['results']], [open_event.pk])
+
+
+class EventDetailCacheTestCase(TestCase):
+    """Versioned detail payloads with ETag revalidation"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.client = APIClient()
+        self.url = f'/api/v1/events/{self.event.pk}/'
+
+    def test_cached_payload_and_not_modified(self):
+        """Repeat hits skip rendering; a matching ETag costs no queries"""
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('user_permissions', first.data)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        with self.assertNumQueries(0):
+            revalidated = self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_child_changes_invalidate(self):
+        """Saving the event or a child row changes the payload and ETag"""
+        etag = self.client.get(self.url)['ETag']
+        EventUpdate.objects.create(
+            event=self.event, title="Venue moved", content="Room 2",
+            posted_by=self.owner)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updates'][0]['title'], "Venue moved")
+
+        self.event.title = "Renamed"
+        self.event.save()
+        response = self.client.get(
+            f'/api/v1/events/by-slug/{self.event.slug}/')
+        self.assertEqual(response.data['title'], "Renamed")
+
+        ticket = EventTicket.objects.create(
+            event=self.event, name="General", price=Decimal('5'), quantity=10)
+        etag = self.client.get(self.url)['ETag']
+        reserve_tickets(ticket, 2)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data['tickets'][0]['quantity_held'], 2)
+
+    def test_permissions_overlay_is_per_user(self):
+        """The shared payload is reused; permissions differ per viewer"""
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com",
+            password="pass12345")
+        url = f'/api/v1/events/by-slug/{self.event.slug}/'
+        self.client.force_authenticate(self.owner)
+        owner_view = self.client.get(url)
+        self.assertTrue(owner_view.data['user_permissions']['is_owner'])
+
+        self.client.force_authenticate(stranger)
+        stranger_view = self.client.get(url)
+        self.assertFalse(stranger_view.data['user_permissions']['is_owner'])
+        self.assertNotEqual(owner_view['ETag'], stranger_view['ETag'])
+        self.assertEqual(stranger_view['Cache-Control'], 'private, no-cache')
+
+        self.assertNotIn('user_permissions', self.client.get(self.url).data)
+
+        missing = self.client.get('/api/v1/events/999999/')
+        self.assertEqual(missing.status_code, 404)
+
+    def test_registration_window_is_evaluated_per_request(self):
+        """A cached payload still reports registration closing on time"""
+        deadline = timezone.now() + timedelta(days=1)
+        Event.objects.filter(pk=self.event.pk).update(
+            registration_deadline=deadline)
+        cache.clear()
+        first = self.client.get(self.url)
+        self.assertTrue(first.data['is_registration_open'])
+
+        later = deadline + timedelta(minutes=1)
+        with patch('api.views.events_viewset.timezone.now',
+                   return_value=later), self.assertNumQueries(0):
+            closed = self.client.get(
+                self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(closed.status_code, 200)
+        self.assertFalse(closed.data['is_registration_open'])
+        self.assertNotEqual(closed['ETag'], first['ETag'])
+
+
+class MyEventsTestCase(TestCase):
+    """Owned and organized events in one keyset-paginated query"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="member", email="member@example.com", password="pass12345")
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="pass12345")
+        start = timezone.now() + timedelta(days=1)
+        self.expected = {}
+        for _ in range(3):
+            event = create_event(self.user, start_datetime=start)
+            self.expected[event.pk] = 'owner'
+        for index in range(2):
+            event = create_event(
+                other, start_datetime=start + timedelta(days=index))
+            EventOrganizer.objects.create(
+                event=event, user=self.user, role='volunteer-coordinator')
+            self.expected[event.pk] = 'volunteer-coordinator'
+        owned_and_organized = create_event(
+            self.user, start_datetime=start - timedelta(days=1))
+        EventOrganizer.objects.create(
+            event=owned_and_organized, user=self.user, role='lead')
+        self.expected[owned_and_organized.pk] = 'owner'
+        create_event(other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _walk(self, url):
+        rows = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(queries), 1)
+            rows.extend(response.data['results'])
+            last = response
+            url = response.data['next']
+        return rows, last
+
+    def test_pages_cover_each_event_once_in_order(self):
+        """Ties on start_datetime are broken by id across page boundaries"""
+        rows, last = self._walk('/api/v1/events/my_events/?page_size=2')
+        self.assertEqual(
+            {row['id']: row['user_role'] for row in rows}, self.expected)
+        keys = [(parse_datetime(row['start_datetime']), row['id'])
+                for row in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+        previous = self.client.get(last.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in previous.data['results']],
+            [row['id'] for row in rows[-4:-2]])
+
+        invalid = self.client.get('/api/v1/events/my_events/?cursor=bogus')
+        self.assertEqual(invalid.status_code, 404)
+
+    def test_organizer_endpoint_adds_permissions(self):
+        """The organizer variant shares the query and adds permissions"""
+        response = self.client.get('/api/v1/event-organizers/my_events/')
+        self.assertEqual(len(response.data['results']), len(self.expected))
+        for row in response.data['results']:
+            self.assertEqual(
+                row['user_permissions']['role'], self.expected[row['id']])
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Opt-in cursor pages on the event list; counts only on request"""
+
+    def setUp(self):
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        start = timezone.now() + timedelta(days=2)
+        self.events = [
+            create_event(owner, start_datetime=start + timedelta(days=index % 3))
+            for index in range(7)
+        ]
+        self.client = APIClient()
+
+    def test_cursor_walk_without_count(self):
+        """Pages follow (start_datetime, id) and never run COUNT(*)"""
+        url = '/api/v1/events/?cursor=&page_size=3'
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any(
+                'COUNT(*)' in query['sql'] and 'AS "__count"' in query['sql']
+                for query in queries))
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        expected = sorted(
+            self.events, key=lambda event: (event.start_datetime, event.pk),
+            reverse=True)
+        self.assertEqual(seen, [event.pk for event in expected])
+
+        counted = self.client.get(
+            '/api/v1/events/?cursor=&count=true&ordering=title&page_size=3')
+        self.assertEqual(counted.data['count'], 7)
+
+        # A cursor issued for another ordering is rejected
+        cursor = parse_qs(urlparse(counted.data['next']).query)['cursor'][0]
+        stale = self.client.get('/api/v1/events/', {'cursor': cursor})
+        self.assertEqual(stale.status_code, 404)
+
+    def test_page_numbers_by_default(self):
+        """Requests without a cursor keep page numbers and the count"""
+        response = self.client.get('/api/v1/events/')
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+    def test_relevance_ordering_falls_back_to_pages(self):
+        """Search results ranked by an annotation use page numbers"""
+        response = self.client.get('/api/v1/events/', {'q': 'event'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+
+
+class EventCategoryTreeTestCase(TestCase):
+    """Materialized category paths and the cached tree payload"""
+
+    def setUp(self):
+        cache.clear()
+        self.root = EventCategory.objects.create(name="Education", slug="education")
+        self.stem = EventCategory.objects.create(
+            name="STEM", slug="stem", parent_category=self.root)
+        self.arts = EventCategory.objects.create(
+            name="Arts", slug="arts", parent_category=self.root)
+        self.robotics = EventCategory.objects.create(
+            name="Robotics", slug="robotics", parent_category=self.stem)
+        EventCategory.objects.create(
+            name="Archived", slug="archived", parent_category=self.root,
+            is_active=False)
+        self.client = APIClient()
+
+    def _reload(self, category):
+        return EventCategory.objects.get(pk=category.pk)
+
+    def test_paths_follow_moves(self):
+        """Moving a category rewrites its subtree's paths and depths"""
+        robotics = self._reload(self.robotics)
+        self.assertEqual(
+            robotics.path,
+            f'{self.root.pk}/{self.stem.pk}/{self.robotics.pk}/')
+        self.assertEqual(robotics.depth, 2)
+
+        self.stem.parent_category = self.arts
+        self.stem.save()
+        robotics = self._reload(self.robotics)
+        self.assertEqual(
+            robotics.path,
+            f'{self.root.pk}/{self.arts.pk}/{self.stem.pk}/{self.robotics.pk}/')
+        self.assertEqual(robotics.depth, 3)
+
+        stem = self._reload(self.stem)
+        stem.parent_category = robotics
+        with self.assertRaises(ValidationError):
+            stem.full_clean()
+        with self.assertRaises(ValidationError):
+            stem.save()
+        self.assertEqual(
+            EventCategory.objects.get(pk=stem.pk).parent_category_id,
+            self.arts.pk)
+
+    def test_tree_endpoint_is_cached_and_versioned(self):
+        """One query builds the tree; later requests and 304s cost none"""
+        with self.assertNumQueries(1):
+            first = self.client.get('/api/v1/event-categories/tree/')
+        self.assertEqual([node['slug'] for node in first.data], ['education'])
+        self.assertEqual(
+            [node['slug'] for node in first.data[0]['subcategories']],
+            ['arts', 'stem'])
+        self.assertEqual(
+            first.data[0]['subcategories'][1]['subcategories'][0]['slug'],
+            'robotics')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(
+                '/api/v1/event-categories/tree/',
+                HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        self.arts.is_active = False
+        self.arts.save()
+        changed = self.client.get(
+            '/api/v1/event-categories/tree/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(
+            [node['slug'] for node in changed.data[0]['subcategories']],
+            ['stem'])
+
+    def test_version_is_bumped_again_on_commit(self):
+        """A tree built before the change commits is not served after it"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.arts.name = 'Fine Arts'
+            self.arts.save()
+            # What a concurrent request would cache from pre-commit rows
+            stale_version = get_tree_version()
+        self.assertNotEqual(get_tree_version(), stale_version)
+
+    def test_list_has_no_per_category_queries(self):
+        """Subcategories come from the cached tree, not per-row queries"""
+        self.client.get('/api/v1/event-categories/')
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/event-categories/')
+        by_slug = {row['slug']: row for row in response.data['results']}
+        self.assertEqual(
+            [node['slug'] for node in by_slug['stem']['subcategories']],
+            ['robotics'])
+
+
+class EventNotificationTestCase(TestCase):
+    """Outbox rows are written with the change and sent in batches"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner, title="Science Fair")
+
+    def test_registration_is_queued_and_delivered_once(self):
+        """Registering queues one email; the worker sends it exactly once"""
+        participant = register_participant(
+            self.event, name="Guest", email="Guest@Example.com")
+        # Queuing again under the same dedupe key is a no-op
+        notify_registration_received(participant)
+        self.assertEqual(len(mail.outbox), 0)
+        queued = EventNotification.objects.get()
+        self.assertEqual(
+            (queued.kind, queued.recipient, queued.status),
+            ('registration_received', 'guest@example.com', 'pending'))
+
+        counts = deliver_pending(batch_size=10)
+        self.assertEqual((counts['claimed'], counts['sent']), (1, 1))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Science Fair", mail.outbox[0].subject)
+        self.assertEqual(mail.outbox[0].to, ['guest@example.com'])
+        self.assertEqual(EventNotification.objects.get().status, 'sent')
+        self.assertEqual(deliver_pending()['claimed'], 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        """A failing send goes back to pending with a growing delay"""
+        enqueue('registration_confirmed', ['a@example.com'], event=self.event,
+                context={'event_title': self.event.title, 'name': "A"})
+        with patch('event.services.notifications.EmailMessage.send',
+                   side_effect=OSError("connection refused")):
+            counts = deliver_batch()
+        self.assertEqual(counts['retried'], 1)
+        row = EventNotification.objects.get()
+        self.assertEqual((row.status, row.attempts), ('pending', 1))
+        self.assertIn("connection refused", row.last_error)
+        self.assertGreater(row.available_at, timezone.now())
+        # Not due yet, so nothing is claimed until the delay passes
+        self.assertEqual(deliver_batch()['claimed'], 0)
+        later = row.available_at + timedelta(seconds=1)
+        self.assertEqual(deliver_batch(now=later)['sent'], 1)
+
+    def test_workflow_actions_queue_recipients(self):
+        """Expense decisions and organizer invites notify the right people"""
+        member = User.objects.create_user(
+            username="member", email="member@example.com", password="pass12345")
+        expense = EventExpense.objects.create(
+            event=self.event, category='food', title="Lunch",
+            description="Lunch", amount=Decimal('20'),
+            expense_date=timezone.now().date(), submitted_by=member)
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.post(
+            f'/api/v1/event-expenses/{expense.pk}/reject/', {'reason': "No receipt"})
+        self.assertEqual(response.status_code, 200)
+        response = client.post('/api/v1/event-organizers/', {
+            'event': self.event.pk, 'user': member.pk, 'role': 'logistics'})
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(
+            sorted(EventNotification.objects.values_list('kind', 'recipient')),
+            [('expense_rejected', 'member@example.com'),
+             ('organizer_invited', 'member@example.com')])
+        deliver_pending()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertTrue(any("No receipt" in message.body for message in mail.outbox))
+
+
+class EventReminderTestCase(TestCase):
+    """Chunked, idempotent reminder scheduling"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.soon = create_event(
+            self.owner, start_datetime=timezone.now() + timedelta(hours=5))
+        self.later = create_event(
+            self.owner, start_datetime=timezone.now() + timedelta(days=5))
+        for event in (self.soon, self.later):
+            EventParticipant.objects.bulk_create(
+                EventParticipant(event=event, name=f"Guest {index}",
+                                 email=f"guest{index}@example.com",
+                                 status='cancelled' if index == 0 else 'confirmed')
+                for index in range(7)
+            )
+
+    def test_reminds_each_participant_once(self):
+        """Only due events are reminded, in chunks, and re-runs are no-ops"""
+        counts = schedule_reminders(chunk_size=3)
+        self.assertEqual(counts, {'events': 1, 'reminded': 6})
+        queued = EventNotification.objects.filter(kind='event_reminder')
+        self.assertEqual(queued.count(), 6)
+        self.assertEqual(set(queued.values_list('event_id', flat=True)),
+                         {self.soon.pk})
+        self.assertFalse(EventParticipant.objects.filter(
+            event=self.soon, status='confirmed', reminder_sent=False).exists())
+
+        self.assertEqual(schedule_reminders()['reminded'], 0)
+        # A flag reset by hand does not queue a second email
+        EventParticipant.objects.filter(event=self.soon).update(reminder_sent=False)
+        schedule_reminders()
+        self.assertEqual(queued.count(), 6)
+
+        deliver_pending()
+        self.assertEqual(len(mail.outbox), 6)
+        self.assertIn("starts soon", mail.outbox[0].subject)
+
+
+def image_upload(name, size=(800, 400), color=(200, 30, 30)):
+    """An in-memory JPEG upload"""
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class EventImagePipelineTestCase(TestCase):
+    """Deferred rendition and file cleanup for event images"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(STORAGES={
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.media_root},
+            },
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = default_storage
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+
+    def _upload(self, name):
+        """Save a photo the way a request would, without touching cleanup"""
+        photo = EventPhoto(event=self.event)
+        photo.image.save(name, image_upload(name), save=False)
+        photo.save()
+        return photo
+
+    def test_variants_are_rendered_off_request(self):
+        """Uploads queue a job; the worker records WebP/JPEG srcsets"""
+        photo = self._upload("stage.jpg")
+        self.assertEqual(EventImageJob.objects.get().source, photo.image.name)
+        self.assertIsNone(EventPhotoSerializer(photo).data['srcset'])
+
+        counts = process_pending()
+        self.assertEqual(counts['processed'], 1)
+        photo.refresh_from_db()
+        entry = photo.image_variants['image']
+        # Widths above the 800px original are not upscaled
+        self.assertEqual([width for width, _ in entry['webp']], [320, 640, 800])
+        for _, name in entry['webp'] + entry['jpeg']:
+            self.assertTrue(self.storage.exists(name))
+        srcset = EventPhotoSerializer(photo).data['srcset']
+        self.assertTrue(srcset['webp'].endswith('-800w.webp 800w'))
+        self.assertIn('-320w.jpeg 320w', srcset['jpeg'])
+
+    def test_replaced_files_are_deleted_by_the_worker(self):
+        """Saves only queue old files; the worker removes them"""
+        photo = self._upload("first.jpg")
+        process_pending()
+        photo.refresh_from_db()
+        old_files = [photo.image.name, *variant_names(photo.image_variants['image'])]
+
+        with patch.object(self.storage, 'delete') as delete:
+            photo.image.save("second.jpg", image_upload("second.jpg"), save=False)
+            photo.save()
+            delete.assert_not_called()
+        self.assertCountEqual(
+            EventFileDeletion.objects.values_list('name', flat=True), old_files)
+        self.assertNotIn('image', EventPhoto.objects.get().image_variants)
+
+        counts = process_pending()
+        self.assertEqual((counts['processed'], counts['deleted']), (1, 7))
+        for name in old_files:
+            self.assertFalse(self.storage.exists(name))
+        self.assertTrue(self.storage.exists(photo.image.name))
+
+
+class EventMapTestCase(TestCase):
+    """Tile-cached marker clustering"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        # Two groups in Phnom Penh and one event in Siem Reap
+        self.phnom_penh = [
+            create_event(self.owner, latitude=Decimal('11.5564') + Decimal(index) / 1000,
+                         longitude=Decimal('104.9282'))
+            for index in range(4)
+        ]
+        self.siem_reap = create_event(
+            self.owner, latitude=Decimal('13.3633'), longitude=Decimal('103.8564'))
+        create_event(self.owner, latitude=Decimal('13.36'),
+                     longitude=Decimal('103.85'), status='draft')
+        self.client = APIClient()
+        self.url = '/api/v1/events/map/'
+
+    def test_clusters_are_cached_per_tile(self):
+        """Low zoom groups events; a repeat request runs no queries"""
+        params = {'bbox': '102,10,108,15', 'zoom': 6}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        counts = sorted(cluster['count'] for cluster in response.data['clusters'])
+        self.assertEqual(counts, [1, 4])
+        big = max(response.data['clusters'], key=lambda cluster: cluster['count'])
+        self.assertAlmostEqual(big['latitude'], 11.5579, places=3)
+        self.assertEqual(big['ids'], [event.pk for event in self.phnom_penh[:3]])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url, params)
+
+        self.siem_reap.status = 'cancelled'
+        self.siem_reap.save()
+        response = self.client.get(self.url, params)
+        self.assertEqual(
+            [cluster['count'] for cluster in response.data['clusters']], [4])
+
+    def test_only_mapped_field_changes_invalidate(self):
+        """Description edits keep the tiles; moves bump again on commit"""
+        version = get_map_version()
+        event = Event.objects.get(pk=self.siem_reap.pk)
+        event.description = 'Updated description'
+        event.save()
+        self.assertEqual(get_map_version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.latitude = Decimal('13.4')
+            event.save()
+            stale_version = get_map_version()
+        self.assertNotEqual(stale_version, version)
+        self.assertNotEqual(get_map_version(), stale_version)
+
+    def test_high_zoom_returns_points_and_validates(self):
+        """Close up, events come back individually"""
+        response = self.client.get(
+            self.url, {'bbox': '104.92,11.55,104.94,11.565', 'zoom': 15})
+        self.assertEqual(response.data['clusters'], [])
+        self.assertEqual(
+            sorted(point['id'] for point in response.data['points']),
+            sorted(event.pk for event in self.phnom_penh))
+
+        self.assertEqual(
+            self.client.get(self.url, {'bbox': '1,2,3', 'zoom': 3}).status_code, 400)
+        self.assertEqual(
+            self.client.get(self.url, {'bbox': '-180,-85,180,85', 'zoom': 12}).status_code,
+            400)
+
+
+class EventDocumentBatchTestCase(TestCase):
+    """Bulk certificate and badge archives"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(STORAGES={
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.media_root},
+            },
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner, title="Robotics Day")
+        EventParticipant.objects.bulk_create(
+            EventParticipant(event=self.event, name=name, email=f"p{index}@example.com",
+                             status=status)
+            for index, (name, status) in enumerate([
+                ("Sok Dara", 'attended'), ("ចាន់ សុភា", 'attended'),
+                ("Late Guest", 'confirmed'), ("No Show", 'cancelled'),
+            ])
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/v1/events/{self.event.pk}/documents/'
+
+    def test_dashboard_request_is_rendered_into_a_zip(self):
+        """Queued from the API, rendered by the worker with progress"""
+        response = self.client.post(self.url, {'kind': 'all'})
+        self.assertEqual(response.status_code, 202)
+        # Asking again while queued returns the same batch
+        again = self.client.post(self.url, {'kind': 'all'})
+        self.assertEqual((again.status_code, again.data['id']),
+                         (200, response.data['id']))
+
+        counts = process_batches(chunk_size=2)
+        self.assertEqual(counts, {'batches': 1, 'documents': 5, 'failed': 0})
+        batch = EventDocumentBatch.objects.get()
+        self.assertEqual((batch.status, batch.total, batch.progress),
+                         ('done', 5, 1.0))
+
+        with default_storage.open(batch.archive.name) as stored, \
+                zipfile.ZipFile(stored) as archive:
+            names = sorted(archive.namelist())
+            self.assertEqual(
+                [name.split('/')[0] for name in names],
+                ['badges'] * 3 + ['certificates'] * 2)
+            self.assertTrue(all(
+                archive.read(name).startswith(b'%PDF') for name in names))
+
+        dashboard = self.client.get(
+            f'/api/v1/events/{self.event.pk}/management_dashboard/')
+        self.assertEqual(dashboard.data['document_batches'][0]['status'], 'done')
+
+    def test_requires_participant_management(self):
+        """Strangers can neither queue nor list batches"""
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.post(self.url, {'kind': 'badges'}).status_code, 403)
+        self.assertFalse(EventDocumentBatch.objects.exists())
+
+
+class EventPhotoBulkUploadTestCase(TestCase):
+    """Zip uploads into an event gallery"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(STORAGES={
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.media_root},
+            },
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = '/api/v1/event-photos/bulk-upload/'
+
+    @staticmethod
+    def _exif_jpeg(size=(60, 30)):
+        """A JPEG rotated by its EXIF orientation, with a capture time"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees clockwise
+        exif[0x010F] = 'Camera Maker'
+        exif.get_ifd(0x8769)[36867] = '2024:05:01 09:30:00'
+        buffer = BytesIO()
+        Image.new('RGB', size, (10, 120, 200)).save(buffer, 'JPEG', exif=exif)
+        return buffer.getvalue()
+
+    def _zip(self, entries):
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name, data in entries.items():
+                archive.writestr(name, data)
+        return SimpleUploadedFile('photos.zip', buffer.getvalue(),
+                                  content_type='application/zip')
+
+    def test_zip_is_imported_without_duplicates_or_metadata(self):
+        """New images are stored cleaned; repeated bytes are skipped"""
+        stage = image_upload('stage.jpg').read()
+        upload = self._zip({
+            'day1/stage.jpg': stage,
+            'day1/stage-copy.jpg': stage,
+            'day1/portrait.jpg': self._exif_jpeg(),
+            'day1/notes.txt': b'not a photo',
+            '__MACOSX/day1/._stage.jpg': b'resource fork',
+            'day1/broken.png': b'not really a png',
+        })
+        response = self.client.post(
+            self.url, {'event': self.event.pk, 'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data['created'], response.data['duplicates'],
+             response.data['failed']), (2, 1, 1))
+        self.assertEqual(response.data['errors'][0]['file'], 'day1/broken.png')
+
+        portrait = EventPhoto.objects.get(image__contains='portrait')
+        self.assertEqual(portrait.photographer, self.owner)
+        self.assertEqual(
+            timezone.localtime(portrait.taken_at).strftime('%Y-%m-%d %H:%M'),
+            '2024-05-01 09:30')
+        with default_storage.open(portrait.image.name) as stored, \
+                Image.open(stored) as image:
+            # Orientation applied to the pixels, metadata dropped
+            self.assertEqual(image.size, (30, 60))
+            self.assertEqual(len(image.getexif()), 0)
+        # bulk_create skips signals, so variants are queued explicitly
+        self.assertEqual(
+            EventImageJob.objects.filter(field='image').count(), 2)
+
+        again = self.client.post(
+            self.url, {'event': self.event.pk, 'file': self._zip({'a.jpg': stage})},
+            format='multipart')
+        self.assertEqual((again.data['created'], again.data['duplicates']), (0, 1))
+        self.assertEqual(EventPhoto.objects.count(), 2)
+
+    def test_single_uploads_are_hashed(self):
+        """A photo uploaded on its own is a duplicate for later zips"""
+        stage = image_upload('stage.jpg').read()
+        response = self.client.post(
+            '/api/v1/event-photos/',
+            {'event': self.event.pk,
+             'image': SimpleUploadedFile('stage.jpg', stage,
+                                         content_type='image/jpeg')},
+            format='multipart')
+        self.assertEqual(response.status_code, 201)
+        photo = EventPhoto.objects.get()
+        self.assertEqual(photo.content_hash, hashlib.sha256(stage).hexdigest())
+
+        # Saving without a new file keeps the hash
+        photo.caption = "Stage"
+        photo.save(update_fields=['caption'])
+        photo.refresh_from_db()
+        self.assertEqual(photo.content_hash, hashlib.sha256(stage).hexdigest())
+
+        again = self.client.post(
+            self.url, {'event': self.event.pk, 'file': self._zip({'a.jpg': stage})},
+            format='multipart')
+        self.assertEqual((again.data['created'], again.data['duplicates']), (0, 1))
+
+    def test_rejects_non_zip_and_strangers(self):
+        """Bad archives are a 400; uploads need media permission"""
+        bad = SimpleUploadedFile('photos.zip', b'plain text')
+        response = self.client.post(
+            self.url, {'event': self.event.pk, 'file': bad}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.client.force_authenticate(stranger)
+        response = self.client.post(
+            self.url, {'event': self.event.pk, 'file': self._zip({'a.jpg': b'x'})},
+            format='multipart')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(EventPhoto.objects.exists())
+
+
+class EventTimeSeriesTestCase(TestCase):
+    """Hourly/daily rollups follow the write paths and serve charts"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="pass12345")
+        self.event = create_event(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/v1/events/{self.event.pk}/timeseries/'
+
+    def _stored(self):
+        return {
+            (row.event_id, row.granularity, row.bucket): {
+                metric: value for metric, value in (
+                    ('registrations', row.registrations),
+                    ('check_ins', row.check_ins),
+                    ('sponsor_count', row.sponsor_count),
+                    ('sponsorship_amount', row.sponsorship_amount),
+                ) if value
+            }
+            for row in EventTimeSeries.objects.all()
+        }
+
+    def _assert_consistent(self):
+        computed = compute_event_timeseries([self.event.pk])
+        self.assertEqual(
+            {key: value for key, value in self._stored().items() if value},
+            {key: {m: v for m, v in value.items() if v}
+             for key, value in computed.items()})
+
+    def test_write_paths_keep_buckets_in_sync(self):
+        """Registrations, check-ins and sponsors move between buckets"""
+        guests = [
+            EventParticipant.objects.create(
+                event=self.event, name=f"Guest {index}",
+                email=f"guest{index}@example.com")
+            for index in range(3)
+        ]
+        EventSponsor.objects.create(
+            event=self.event, sponsor_name="Sponsor", sponsor_type='gold',
+            contribution_amount=Decimal('150.00'))
+        checked_in = timezone.now() - timedelta(hours=5)
+        guests[0].check_in_time = checked_in
+        guests[0].save()
+        self._assert_consistent()
+
+        # A row loaded separately still moves its check-in
+        reloaded = EventParticipant.objects.get(pk=guests[0].pk)
+        reloaded.check_in_time = checked_in - timedelta(days=2)
+        reloaded.save()
+        guests[1].delete()
+        self._assert_consistent()
+        self.assertEqual(
+            EventTimeSeries.objects.filter(granularity='day').aggregate(
+                total=Sum('registrations'))['total'], 2)
+
+        # Bulk paths repair through the rebuild
+        EventParticipant.objects.filter(pk=guests[2].pk).update(
+            check_in_time=checked_in)
+        refresh_event_timeseries([self.event.pk])
+        self._assert_consistent()
+
+    def test_check_in_paths_apply_deltas(self):
+        """Kiosk syncs and bulk check-ins update buckets without a rebuild"""
+        guests = [
+            EventParticipant.objects.create(
+                event=self.event, name=f"Guest {index}",
+                email=f"guest{index}@example.com")
+            for index in range(3)
+        ]
+        bucket_ids = set(EventTimeSeries.objects.values_list('pk', flat=True))
+        scanned_at = timezone.now() - timedelta(hours=3)
+        sync_scans(self.event, [
+            {'participant': guest.pk, 'code': ticket_code(guest.pk, self.event.pk),
+             'scanned_at': scanned_at.isoformat()}
+            for guest in guests[:2]
+        ])
+        self._assert_consistent()
+
+        response = self.client.post('/api/v1/event-participants/bulk_check_in/', {
+            'event': self.event.pk,
+            'participant_ids': [guest.pk for guest in guests],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(EventTimeSeries.objects.filter(
+            granularity='day').aggregate(total=Sum('check_ins'))['total'], 3)
+        self._assert_consistent()
+        # Existing buckets were updated in place, not deleted and re-inserted
+        self.assertTrue(bucket_ids <= set(
+            EventTimeSeries.objects.values_list('pk', flat=True)))
+
+    def test_timeseries_action_is_zero_filled(self):
+        """The API serves a dense range from the rollups alone"""
+        EventParticipant.objects.create(
+            event=self.event, name="Guest", email="guest@example.com")
+        EventSponsor.objects.create(
+            event=self.event, sponsor_name="Sponsor", sponsor_type='gold',
+            contribution_amount=Decimal('80.50'))
+        today = timezone.localdate()
+        start = (today - timedelta(days=6)).isoformat()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'start': start})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(
+            'event_eventparticipant' in query['sql'] for query in queries))
+        points = response.data['points']
+        self.assertEqual(len(points), 7)
+        self.assertEqual(points[-1]['registrations'], 1)
+        self.assertEqual(points[0]['registrations'], 0)
+        self.assertEqual(response.data['totals']['sponsorship_amount'], '80.50')
+
+        hourly = self.client.get(self.url, {'granularity': 'hour'})
+        self.assertEqual(hourly.data['totals']['registrations'], 1)
+        self.assertEqual(len(hourly.data['points']), 49)
+
+        for params in ({'granularity': 'week'}, {'start': 'soon'},
+                       {'granularity': 'hour', 'start': '2000-01-01'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.data)
+
+        stranger = User.objects.create_user(
+            username="stranger", email="stranger@example.com", password="pass12345")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
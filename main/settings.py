@@ -230,6 +230,28 @@ if DEBUG:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # Wait for the write lock instead of failing while concurrent
+            # registrations queue (see event.services.registration)
+            "OPTIONS": {
+                "timeout": 20,
+            },
+            # File-backed test database so threaded tests get real locking
+            "TEST": {
+                "NAME": BASE_DIR / "test_db.sqlite3",
+            },
+        }
+    }
+
+
+# Cached payloads are invalidated by bumping version counters in the cache
+# (see shared.cache_versions), so every worker must use the same
+# cache. The local-memory default is only correct for a single process
+# such as runserver; set REDIS_URL when running several workers.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
         }
     }
 
@@ -0,0 +1,139 @@
+"""
+Management command comparing substring scans with the n-gram name index.
+
+Seeds villages with mixed Khmer and accented Latin names (and their name
+search entries) inside a transaction that is rolled back, then times
+``icontains`` over name/local_name against ``search_names`` for a few
+Khmer substrings and Latin words.
+
+Usage examples:
+    python manage.py benchmark_text_search
+    python manage.py benchmark_text_search --rows 500000 --repeat 3
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from geo.models import City, Country, State, Village
+from schools.models import NameSearchEntry
+from schools.services.name_search import entry_terms, search_names
+
+# Khmer syllables (consonant, optional subscript, vowel sign) and Latin
+# stems with diacritics, combined into multi-syllable names
+KHMER_CONSONANTS = "កខគចជដតទនបពមរលវសហអ"
+KHMER_SUBSCRIPTS = ("", "", "្រ", "្ដ", "្ន")
+KHMER_VOWELS = ("", "ា", "ិ", "ុ", "េ", "ោ", "ាំ", "ំ")
+LATIN_STEMS = (
+    "Phum", "Krâng", "Thmey", "Chăs", "Tuŏl", "Prêk", "Kôh", "Sâmraông",
+    "Ângkor", "Réang", "Svay", "Trâpeăng", "Bœng", "Kampóng", "Ta", "Srê",
+)
+
+PAGE_SIZE = 20
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded rows"""
+
+
+class Command(BaseCommand):
+    """
+    ``icontains`` cannot use an index and scans every name; unspaced
+    Khmer also defeats word tokenizers. The name index stores cluster
+    bigrams, so a Khmer substring or an unaccented Latin prefix is an
+    index lookup whose cost follows the number of matches.
+    """
+    help = 'Benchmark icontains vs the n-gram name search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=1)
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options['rows'], options['repeat'],
+                          random.Random(options['seed']))
+                raise Rollback
+        except Rollback:
+            pass
+
+    @staticmethod
+    def _khmer_name(rng):
+        return "".join(
+            rng.choice(KHMER_CONSONANTS) + rng.choice(KHMER_SUBSCRIPTS)
+            + rng.choice(KHMER_VOWELS)
+            for _ in range(rng.randint(2, 5))
+        )
+
+    @staticmethod
+    def _latin_name(rng):
+        return " ".join(rng.sample(LATIN_STEMS, rng.randint(2, 3)))
+
+    def _run(self, rows, repeat, rng):
+        self.stdout.write(f'Seeding {rows} villages...')
+        country = Country.objects.create(name='Benchmark', code='BMK')
+        state = State.objects.create(name='Benchmark', country=country)
+        city = City.objects.create(name='Benchmark', state=state)
+
+        batch = 5000
+        khmer_names = []
+        for start in range(0, rows, batch):
+            villages = []
+            for index in range(start, min(start + batch, rows)):
+                local_name = self._khmer_name(rng)
+                khmer_names.append(local_name)
+                villages.append(Village(
+                    name=f'{self._latin_name(rng)} {index}',
+                    local_name=local_name, city=city))
+            # bulk_create skips the signal that writes the entries
+            Village.objects.bulk_create(villages)
+            NameSearchEntry.objects.bulk_create(
+                NameSearchEntry(model='geo.village', object_id=village.pk,
+                                terms=entry_terms(village))
+                for village in villages
+            )
+
+        queries = [
+            rng.choice(khmer_names)[2:8],
+            rng.choice(khmer_names),
+            'tuol',
+            'Trâpeăng Svay',
+        ]
+        villages = Village.objects.filter(city=city)
+
+        self.stdout.write(
+            f"{'query':>16} {'matches':>9} {'icontains ms':>14} {'index ms':>10}")
+        for text in queries:
+            scan = villages.filter(
+                Q(name__icontains=text) | Q(local_name__icontains=text))
+            indexed = search_names(villages, text).order_by('-search_rank', 'pk')
+
+            def by_scan():
+                scan.count()
+                list(scan.order_by('pk')[:PAGE_SIZE])
+
+            def by_index():
+                indexed.count()
+                list(indexed[:PAGE_SIZE])
+
+            self.stdout.write(
+                f'{text:>16} {indexed.count():>9} '
+                f'{self._time(by_scan, repeat):>14.2f} '
+                f'{self._time(by_index, repeat):>10.2f}')
+
+    @staticmethod
+    def _time(fetch, repeat):
+        """Median wall time of ``fetch`` in milliseconds"""
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,70 @@
+"""
+Management command to build the related-schools nearest-neighbour table.
+
+Usage examples:
+    python manage.py build_related_schools --full       # Rebuild every list (e.g. nightly)
+    python manage.py build_related_schools              # Drain queued refreshes once
+    python manage.py build_related_schools --loop       # Long-running worker
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from schools.services.related_schools import (REFRESH_BATCH_SIZE,
+                                              process_refresh_queue,
+                                              rebuild_related_schools)
+
+
+class Command(BaseCommand):
+    """
+    Vectorize schools from their types, levels, degrees, majors and
+    geography and store each school's top-k most similar schools. Without
+    --full only schools queued by signals, and the lists they affect, are
+    recomputed.
+    """
+    help = 'Build or incrementally refresh the related-schools table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute the neighbours of every school',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=REFRESH_BATCH_SIZE,
+            help='Queued schools refreshed per batch',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, polling the queue when it is empty',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=30,
+            help='Pause between polls of an empty queue in --loop mode (seconds)',
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        if options['full']:
+            schools, rows = rebuild_related_schools()
+            self.stdout.write(self.style.SUCCESS(
+                f'Built related schools for {schools} schools ({rows} rows)'))
+            return
+
+        while True:
+            processed, rewritten = process_refresh_queue(
+                max(1, options['batch_size']))
+            if processed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Refreshed {processed} queued schools '
+                    f'({rewritten} neighbour lists rewritten)'))
+            if not options['loop']:
+                return
+            if not processed:
+                time.sleep(options['sleep'])
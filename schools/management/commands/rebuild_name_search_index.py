@@ -0,0 +1,80 @@
+"""
+Management command to rebuild the place and scholarship name search index.
+
+Usage examples:
+    python manage.py rebuild_name_search_index
+    python manage.py rebuild_name_search_index --model geo.village
+    python manage.py rebuild_name_search_index --batch-size 1000
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from schools.models import NameSearchEntry
+from schools.services.name_search import NAME_FIELDS, entry_terms
+
+
+class Command(BaseCommand):
+    """
+    Rewrite the NameSearchEntry of every country, state, city, village and
+    scholarship, and drop entries whose row no longer exists. Needed after
+    bulk writes that bypass save() (QuerySet.update, raw SQL, fixtures) and
+    after changing the text analyzer.
+    """
+    help = "Rebuild name search entries for places and scholarships"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="labels",
+            help="Only rebuild the given model label, e.g. geo.city (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of entries written per batch",
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        labels = [label.lower() for label in options["labels"] or NAME_FIELDS]
+        unknown = sorted(set(labels) - set(NAME_FIELDS))
+        if unknown:
+            raise CommandError(f"No name search index for: {', '.join(unknown)}")
+
+        batch_size = max(1, options["batch_size"])
+        for label in labels:
+            model = apps.get_model(label)
+            rows = model.objects.order_by("pk").only("pk", *NAME_FIELDS[label])
+
+            indexed = 0
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(NameSearchEntry(
+                    model=label, object_id=row.pk, terms=entry_terms(row)))
+                if len(batch) >= batch_size:
+                    indexed += self._write(batch)
+                    batch = []
+            if batch:
+                indexed += self._write(batch)
+
+            stale, _ = NameSearchEntry.objects.filter(model=label).exclude(
+                object_id__in=model.objects.values("pk")).delete()
+            self.stdout.write(self.style.SUCCESS(
+                f"Indexed {indexed} {label} rows ({stale} stale entries removed)"
+            ))
+
+    @staticmethod
+    def _write(entries):
+        """Upsert one batch of entries"""
+        with transaction.atomic():
+            NameSearchEntry.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=["model", "object_id"],
+                update_fields=["terms", "updated_at"],
+            )
+        return len(entries)
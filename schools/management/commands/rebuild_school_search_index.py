@@ -0,0 +1,62 @@
+"""
+Management command to rebuild the school full-text search index.
+
+Usage examples:
+    python manage.py rebuild_school_search_index
+    python manage.py rebuild_school_search_index --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from schools.models import School, SchoolSearchDocument
+from schools.services.school_search import document_fields
+
+
+class Command(BaseCommand):
+    """
+    Rewrite every SchoolSearchDocument from its school. Needed after bulk
+    writes that bypass School.save (QuerySet.update, raw SQL, fixtures)
+    and after changing the text analyzer.
+    """
+    help = "Rebuild full-text search documents for all schools"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of documents written per batch",
+        )
+
+    # pylint: disable=unused-argument
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        schools = School.objects.order_by("pk").only(
+            "pk", "name", "local_name", "short_name", "code", "founder",
+            "president", "location", "motto", "description")
+
+        indexed = 0
+        batch = []
+        for school in schools.iterator(chunk_size=batch_size):
+            batch.append(SchoolSearchDocument(
+                school_id=school.pk, **document_fields(school)))
+            if len(batch) >= batch_size:
+                indexed += self._write(batch)
+                batch = []
+        if batch:
+            indexed += self._write(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} schools"))
+
+    @staticmethod
+    def _write(documents):
+        """Upsert one batch of documents"""
+        with transaction.atomic():
+            SchoolSearchDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=["school"],
+                update_fields=["names", "details", "body", "updated_at"],
+            )
+        return len(documents)
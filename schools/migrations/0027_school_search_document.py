@@ -0,0 +1,129 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Kept in sync with schools.services.school_search
+FTS_TABLE = "schools_search_fts"
+DOCUMENT_TABLE = "schools_schoolsearchdocument"
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', names), 'A') || "
+    "setweight(to_tsvector('simple', details), 'B') || "
+    "setweight(to_tsvector('simple', body), 'C')"
+)
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        names, details, body,
+        content='{DOCUMENT_TABLE}', content_rowid='school_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, names, details, body)
+        VALUES (new.school_id, new.names, new.details, new.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, names, details, body)
+        VALUES ('delete', old.school_id, old.names, old.details, old.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, names, details, body)
+        VALUES ('delete', old.school_id, old.names, old.details, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, names, details, body)
+        VALUES (new.school_id, new.names, new.details, new.body);
+    END""",
+]
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_FORWARD = [
+    f"CREATE INDEX schools_search_vector_gin ON {DOCUMENT_TABLE} "
+    f"USING gin (({POSTGRES_VECTOR}))",
+]
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS schools_search_vector_gin"]
+
+
+def _run(schema_editor, statements):
+    """Execute raw DDL statements in order"""
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """Database-specific full-text index over the document table"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    """Reverse of create_search_index"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+def backfill_documents(apps, schema_editor):
+    """Index existing schools (mirrors school_search.document_fields)"""
+    School = apps.get_model("schools", "School")
+    SchoolSearchDocument = apps.get_model("schools", "SchoolSearchDocument")
+
+    def join(*parts):
+        return "\n".join(str(part) for part in parts if part)
+
+    batch = []
+    for school in School.objects.order_by("pk").iterator(chunk_size=1000):
+        batch.append(SchoolSearchDocument(
+            school_id=school.pk,
+            names=join(school.name, school.local_name, school.short_name, school.code),
+            details=join(school.founder, school.president, school.location, school.motto),
+            body=join(school.description),
+        ))
+        if len(batch) >= 1000:
+            SchoolSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        SchoolSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0026_add_resume_platforms"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchoolSearchDocument",
+            fields=[
+                (
+                    "school",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="schools.school",
+                        verbose_name="school",
+                    ),
+                ),
+                ("names", models.TextField(blank=True, default="")),
+                ("details", models.TextField(blank=True, default="")),
+                ("body", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "school search document",
+                "verbose_name_plural": "school search documents",
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
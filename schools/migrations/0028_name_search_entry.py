@@ -0,0 +1,208 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:41
+
+from django.db import migrations, models
+
+# The analyzer is plain Python (no models), so the backfill uses it directly;
+# stored terms must be produced by the same code that analyzes queries
+from schools.services.text_analysis import get_analyzer
+
+# Kept in sync with schools.services.school_search and .name_search
+SCHOOL_FTS = "schools_search_fts"
+SCHOOL_TABLE = "schools_schoolsearchdocument"
+NAME_FTS = "schools_name_search_fts"
+NAME_TABLE = "schools_namesearchentry"
+
+
+def terms_vector(column, weight=None):
+    vector = f"array_to_tsvector(array_remove(string_to_array({column}, ' '), ''))"
+    if weight:
+        vector = f"setweight({vector}, '{weight}')"
+    return vector
+
+
+OLD_SCHOOL_VECTOR = (
+    "setweight(to_tsvector('simple', names), 'A') || "
+    "setweight(to_tsvector('simple', details), 'B') || "
+    "setweight(to_tsvector('simple', body), 'C')"
+)
+SCHOOL_VECTOR = " || ".join((
+    terms_vector("names", "A"),
+    terms_vector("details", "B"),
+    terms_vector("body", "C"),
+))
+NAME_VECTOR = terms_vector("terms")
+
+NAME_FIELDS = {
+    ("geo", "Country"): ("name", "local_name", "code"),
+    ("geo", "State"): ("name", "local_name", "code"),
+    ("geo", "City"): ("name", "local_name", "code"),
+    ("geo", "Village"): ("name", "local_name", "code"),
+    ("schools", "Scholarship"): ("name", "local_name", "provider"),
+}
+
+
+def sqlite_fts(fts, table, rowid, columns):
+    """External-content FTS5 table over analyzed terms, with sync triggers"""
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE {fts} USING fts5(
+            {names}, content='{table}', content_rowid='{rowid}',
+            tokenize='ascii'
+        )""",
+        f"""CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.{rowid}, {new});
+        END""",
+        f"""CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names})
+            VALUES ('delete', old.{rowid}, {old});
+        END""",
+        f"""CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names})
+            VALUES ('delete', old.{rowid}, {old});
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.{rowid}, {new});
+        END""",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def sqlite_drop(fts):
+    return [
+        f"DROP TRIGGER IF EXISTS {fts}_au",
+        f"DROP TRIGGER IF EXISTS {fts}_ad",
+        f"DROP TRIGGER IF EXISTS {fts}_ai",
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+
+def _run(schema_editor, statements):
+    """Execute raw DDL statements in order"""
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_school_index(apps, schema_editor):
+    """Drop the word-tokenized school index before re-analyzing"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, sqlite_drop(SCHOOL_FTS))
+    elif vendor == "postgresql":
+        _run(schema_editor, ["DROP INDEX IF EXISTS schools_search_vector_gin"])
+
+
+def restore_school_index(apps, schema_editor):
+    """Reverse of drop_school_index (documents keep analyzed terms)"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = sqlite_fts(
+            SCHOOL_FTS, SCHOOL_TABLE, "school_id", ("names", "details", "body"))
+        _run(schema_editor, [
+            statements[0].replace("'ascii'", "'unicode61 remove_diacritics 2'"),
+            *statements[1:],
+        ])
+    elif vendor == "postgresql":
+        _run(schema_editor, [
+            f"CREATE INDEX schools_search_vector_gin ON {SCHOOL_TABLE} "
+            f"USING gin (({OLD_SCHOOL_VECTOR}))",
+        ])
+
+
+def analyze_documents(apps, schema_editor):
+    """Rewrite school documents and index names with analyzed terms"""
+    analyzer = get_analyzer()
+    School = apps.get_model("schools", "School")
+    SchoolSearchDocument = apps.get_model("schools", "SchoolSearchDocument")
+    NameSearchEntry = apps.get_model("schools", "NameSearchEntry")
+
+    SchoolSearchDocument.objects.all().delete()
+    batch = []
+    for school in School.objects.order_by("pk").iterator(chunk_size=1000):
+        batch.append(SchoolSearchDocument(
+            school_id=school.pk,
+            names=analyzer.index_text(
+                school.name, school.local_name, school.short_name, school.code),
+            details=analyzer.index_text(
+                school.founder, school.president, school.location, school.motto),
+            body=analyzer.index_text(school.description),
+        ))
+        if len(batch) >= 1000:
+            SchoolSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        SchoolSearchDocument.objects.bulk_create(batch)
+
+    for (app_label, model_name), fields in NAME_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        label = f"{app_label}.{model_name.lower()}"
+        batch = []
+        for row in model.objects.order_by("pk").only("pk", *fields).iterator(
+            chunk_size=1000
+        ):
+            batch.append(NameSearchEntry(
+                model=label,
+                object_id=row.pk,
+                terms=analyzer.index_text(*(getattr(row, f) for f in fields)),
+            ))
+            if len(batch) >= 1000:
+                NameSearchEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            NameSearchEntry.objects.bulk_create(batch)
+
+
+def create_search_indexes(apps, schema_editor):
+    """Term indexes over the analyzed school documents and name entries"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, sqlite_fts(
+            SCHOOL_FTS, SCHOOL_TABLE, "school_id", ("names", "details", "body")))
+        _run(schema_editor, sqlite_fts(NAME_FTS, NAME_TABLE, "id", ("terms",)))
+    elif vendor == "postgresql":
+        _run(schema_editor, [
+            f"CREATE INDEX schools_search_vector_gin ON {SCHOOL_TABLE} "
+            f"USING gin (({SCHOOL_VECTOR}))",
+            f"CREATE INDEX schools_name_search_gin ON {NAME_TABLE} "
+            f"USING gin (({NAME_VECTOR}))",
+        ])
+
+
+def drop_search_indexes(apps, schema_editor):
+    """Reverse of create_search_indexes"""
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, sqlite_drop(NAME_FTS) + sqlite_drop(SCHOOL_FTS))
+    elif vendor == "postgresql":
+        _run(schema_editor, [
+            "DROP INDEX IF EXISTS schools_name_search_gin",
+            "DROP INDEX IF EXISTS schools_search_vector_gin",
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geo", "0003_city_created_by_country_created_by_state_created_by_and_more"),
+        ("schools", "0027_school_search_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NameSearchEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model", models.CharField(max_length=64)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("terms", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "name search entry",
+                "verbose_name_plural": "name search entries",
+                "unique_together": {("model", "object_id")},
+            },
+        ),
+        migrations.RunPython(drop_school_index, restore_school_index),
+        migrations.RunPython(analyze_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("schools", "0028_name_search_entry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedSchoolRefresh",
+            fields=[
+                (
+                    "school",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="schools.school",
+                        verbose_name="school",
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "related school refresh",
+                "verbose_name_plural": "related school refreshes",
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedSchool",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="schools.school",
+                        verbose_name="related school",
+                    ),
+                ),
+                (
+                    "school",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="schools.school",
+                        verbose_name="school",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "related school",
+                "verbose_name_plural": "related schools",
+                "ordering": ["school", "rank"],
+                "unique_together": {("school", "rank")},
+            },
+        ),
+    ]
@@ -16,6 +16,8 @@ from .school import (
     OrganizationScholarship,
 )
 from .online_profile import Platform, PlatformProfile
+from .related import RelatedSchool, RelatedSchoolRefresh
+from .search import NameSearchEntry, SchoolSearchDocument
 
 __all__ = [
     "DefaultField",
@@ -36,4 +38,8 @@ __all__ = [
     "Platform",
     "PlatformProfile",
     "Scholarship",
+    "SchoolSearchDocument",
+    "NameSearchEntry",
+    "RelatedSchool",
+    "RelatedSchoolRefresh",
 ]
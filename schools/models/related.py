@@ -0,0 +1,65 @@
+"""
+Precomputed nearest-neighbour lists of related schools.
+"""
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class RelatedSchool(models.Model):
+    """
+    One of the top-k most similar schools of a school, by rank (see
+    schools.services.related_schools). Built offline; read by the detail
+    page with a single indexed lookup on (school, rank).
+    """
+
+    school = models.ForeignKey(
+        "schools.School",
+        on_delete=models.CASCADE,
+        related_name="related_entries",
+        verbose_name=_("school"),
+    )
+    related = models.ForeignKey(
+        "schools.School",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("related school"),
+    )
+    rank = models.PositiveSmallIntegerField()
+    # Cosine similarity of the two schools' feature vectors
+    score = models.FloatField()
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("related school")
+        verbose_name_plural = _("related schools")
+        unique_together = ["school", "rank"]
+        ordering = ["school", "rank"]
+
+    def __str__(self):
+        return f"{self.school_id} -> {self.related_id} (#{self.rank})"
+
+
+class RelatedSchoolRefresh(models.Model):
+    """
+    A school whose attributes changed since its neighbours were computed.
+    Queued by signals and drained by ``build_related_schools``.
+    """
+
+    school = models.OneToOneField(
+        "schools.School",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+        verbose_name=_("school"),
+    )
+    queued_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("related school refresh")
+        verbose_name_plural = _("related school refreshes")
+
+    def __str__(self):
+        return f"Refresh related schools ({self.school_id})"
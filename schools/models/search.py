@@ -0,0 +1,64 @@
+"""
+Denormalized full-text search document for schools.
+"""
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SchoolSearchDocument(models.Model):
+    """
+    Text of a school as indexed for search (see schools.services.school_search).
+    Columns hold space-separated terms from schools.services.text_analysis.
+
+    The database-specific index is built on top of this table by migration:
+    a GIN index over a weighted tsvector expression on PostgreSQL, or an
+    external-content FTS5 table kept in sync by triggers on SQLite.
+    """
+
+    school = models.OneToOneField(
+        "schools.School",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+        verbose_name=_("school"),
+    )
+    # Name, local name, short name and code
+    names = models.TextField(default="", blank=True)
+    # Founder, president, location and motto
+    details = models.TextField(default="", blank=True)
+    body = models.TextField(default="", blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("school search document")
+        verbose_name_plural = _("school search documents")
+
+    def __str__(self):
+        return f"Search document ({self.school_id})"
+
+
+class NameSearchEntry(models.Model):
+    """
+    Analyzed names of one row of a lookup table (countries, states,
+    cities, villages, scholarships) as indexed for search (see
+    schools.services.name_search). Rows are keyed by model label so one
+    full-text index serves every table; it is built on top of this table
+    by migration like the school search index.
+    """
+
+    model = models.CharField(max_length=64)
+    object_id = models.PositiveBigIntegerField()
+    terms = models.TextField(default="", blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("name search entry")
+        verbose_name_plural = _("name search entries")
+        unique_together = ["model", "object_id"]
+
+    def __str__(self):
+        return f"Search entry ({self.model} {self.object_id})"
@@ -0,0 +1,163 @@
+"""
+Facet counts for school browsing.
+
+The facet base holds, for every facet (type, educational level, degree,
+country, state, city), two parallel NumPy arrays: the position of each
+school in the sorted array of school ids and the index of the value it
+is tagged with. It is read straight from the M2M through tables and the
+school foreign key columns, then cached under a version number that
+school and lookup signals bump.
+
+Counting a filtered school set is then one ``values_list('pk')`` query
+and, per facet, a mask lookup and a ``bincount``. That replaces one
+GROUP BY per facet, each joining through an M2M table.
+"""
+
+import numpy as np
+from django.core.cache import cache
+
+from geo.models import City, Country, State
+from schools.models import EducationalLevel, EducationDegree, School, SchoolType
+from shared.cache_versions import bump_versions, get_version
+
+FACET_CACHE_TIMEOUT = 60 * 60 * 24
+_VERSION_KEY = 'school-facets:version'
+
+
+def _through(field):
+    """``(through model, school column, value column)`` of an M2M field"""
+    field = School._meta.get_field(field)
+    return (field.remote_field.through, field.m2m_column_name(),
+            field.m2m_reverse_name())
+
+
+# name -> (query parameter, source, label model, label field). The source
+# is an M2M field name or a School foreign key column.
+FACETS = {
+    'types': ('type', 'type', SchoolType, 'type'),
+    'educational_levels': (
+        'educational_level', 'educational_levels', EducationalLevel, 'level_name'),
+    'degrees': ('degree', 'degree_levels', EducationDegree, 'degree_name'),
+    'countries': ('country', 'country_id', Country, 'name'),
+    'states': ('state', 'state_id', State, 'name'),
+    'cities': ('city', 'city_id', City, 'name'),
+}
+
+
+def get_facet_version():
+    """Current version of the facet base, initializing it if missing"""
+    return get_version(_VERSION_KEY)
+
+
+def bump_facet_version():
+    """
+    Invalidate the cached facet base, now and again on commit (a School
+    and its tags are often saved in one transaction)
+    """
+    bump_versions([_VERSION_KEY])
+
+
+def _pairs(source):
+    """``(school ids, value ids)`` arrays of one facet source"""
+    if source.endswith('_id'):
+        rows = School.objects.filter(**{f'{source}__isnull': False}).values_list(
+            'pk', source)
+    else:
+        through, school_column, value_column = _through(source)
+        rows = through.objects.values_list(school_column, value_column)
+    pairs = np.array(list(rows), dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def load_facet_base():
+    """
+    ``{'school_ids': sorted ids, 'facets': {name: facet}}`` where a facet
+    holds ``positions`` (into school_ids), ``codes`` (into ``values``),
+    ``values`` (value ids) and ``labels`` (value id -> label).
+    """
+    school_ids = np.array(
+        list(School.objects.order_by('pk').values_list('pk', flat=True)),
+        dtype=np.int64)
+    facets = {}
+    for name, (_param, source, model, label_field) in FACETS.items():
+        schools, value_ids = _pairs(source)
+        values, codes = np.unique(value_ids, return_inverse=True)
+        positions = np.searchsorted(school_ids, schools)
+        labels = dict(model.objects.filter(pk__in=values.tolist()).values_list(
+            'pk', label_field))
+        facets[name] = {
+            'positions': positions.astype(np.int32),
+            'codes': codes.astype(np.int32),
+            'values': values,
+            'labels': labels,
+        }
+    return {'school_ids': school_ids, 'facets': facets}
+
+
+def cached_facet_base():
+    """The facet base, loaded on a cache miss"""
+    key = f'school-facets:{get_facet_version()}'
+    base = cache.get(key)
+    if base is None:
+        base = load_facet_base()
+        cache.set(key, base, FACET_CACHE_TIMEOUT)
+    return base
+
+
+def count_facets(base, school_ids):
+    """
+    ``{name: [{'id', 'name', 'count'}, ...]}`` for the given school ids,
+    most frequent values first. Ids missing from the base are ignored.
+    """
+    all_ids = base['school_ids']
+    selected = np.zeros(len(all_ids), dtype=bool)
+    ids = np.asarray(school_ids, dtype=np.int64)
+    if len(all_ids) and len(ids):
+        positions = np.minimum(np.searchsorted(all_ids, ids), len(all_ids) - 1)
+        selected[positions[all_ids[positions] == ids]] = True
+
+    result = {}
+    for name, facet in base['facets'].items():
+        codes = facet['codes'][selected[facet['positions']]]
+        counts = np.bincount(codes, minlength=len(facet['values']))
+        rows = [
+            {
+                'id': int(facet['values'][code]),
+                'name': facet['labels'].get(int(facet['values'][code]), ''),
+                'count': int(counts[code]),
+            }
+            for code in np.flatnonzero(counts)
+        ]
+        rows.sort(key=lambda row: (-row['count'], str(row['name'])))
+        result[name] = rows
+    return result
+
+
+def school_facets(queryset):
+    """Facet counts of the schools in ``queryset``, in one query"""
+    ids = queryset.order_by().values_list('pk', flat=True)
+    return count_facets(cached_facet_base(), np.fromiter(ids, dtype=np.int64))
+
+
+def filter_by_facets(queryset, params):
+    """
+    Restrict a School queryset by facet query parameters (``?degree=3``;
+    repeat a parameter to match any of several values). Invalid ids are
+    ignored.
+    """
+    for _name, (param, source, _model, _label) in FACETS.items():
+        values = []
+        for value in params.getlist(param):
+            try:
+                values.append(int(value))
+            except (TypeError, ValueError):
+                continue
+        if not values:
+            continue
+        if source.endswith('_id'):
+            queryset = queryset.filter(**{f'{source}__in': values})
+        else:
+            through, school_column, value_column = _through(source)
+            queryset = queryset.filter(pk__in=through.objects.filter(
+                **{f'{value_column}__in': values}).values(school_column))
+    return queryset
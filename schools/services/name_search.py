@@ -0,0 +1,125 @@
+"""
+Full-text search over the names of countries, states, cities, villages
+and scholarships.
+
+Each indexed row has a NameSearchEntry holding the analyzed terms of its
+name fields (see ``schools.services.text_analysis``), so Khmer local
+names match as substrings and Latin names without their accents. The
+entries of all models share one index, built like the school search
+index: an external-content FTS5 table on SQLite and a GIN index over a
+``tsvector`` of the terms on PostgreSQL. Other backends fall back to
+unranked substring matching of the terms.
+"""
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+from schools.models import NameSearchEntry
+from schools.services.school_search import (fts_match, parse_query,
+                                            phrase_condition,
+                                            postgres_tsquery, terms_vector)
+from schools.services.text_analysis import get_analyzer
+
+FTS_TABLE = "schools_name_search_fts"
+
+# Shared with the migration that creates the GIN index
+POSTGRES_VECTOR = terms_vector("terms")
+
+# Indexed name fields per model label
+NAME_FIELDS = {
+    "geo.country": ("name", "local_name", "code"),
+    "geo.state": ("name", "local_name", "code"),
+    "geo.city": ("name", "local_name", "code"),
+    "geo.village": ("name", "local_name", "code"),
+    "schools.scholarship": ("name", "local_name", "provider"),
+}
+
+
+def entry_terms(instance):
+    """Analyzed terms of an instance's name fields"""
+    fields = NAME_FIELDS[instance._meta.label_lower]
+    return get_analyzer().index_text(
+        *(getattr(instance, field) for field in fields))
+
+
+def index_names(instance):
+    """Create or refresh the search entry of one row"""
+    NameSearchEntry.objects.update_or_create(
+        model=instance._meta.label_lower,
+        object_id=instance.pk,
+        defaults={"terms": entry_terms(instance)},
+    )
+
+
+def remove_names(instance):
+    """Delete the search entry of a deleted row"""
+    NameSearchEntry.objects.filter(
+        model=instance._meta.label_lower, object_id=instance.pk
+    ).delete()
+
+
+def _postgres_search(queryset, label, clauses):
+    tsquery = postgres_tsquery(clauses)
+    entries = NameSearchEntry.objects.filter(model=label).filter(RawSQL(
+        f"({POSTGRES_VECTOR}) @@ %s::tsquery", [tsquery],
+        output_field=BooleanField()))
+    phrases = phrase_condition(clauses, ("terms",))
+    if phrases is not None:
+        entries = entries.filter(phrases)
+    rank = entries.filter(object_id=OuterRef("pk")).annotate(
+        rank=RawSQL(
+            f"ts_rank({POSTGRES_VECTOR}, %s::tsquery)", [tsquery],
+            output_field=FloatField())
+    ).values("rank")
+    return queryset.filter(
+        pk__in=entries.values("object_id")
+    ).annotate(search_rank=Subquery(rank, output_field=FloatField()))
+
+
+def _sqlite_search(queryset, label, clauses):
+    match = fts_match(clauses)
+    entries = NameSearchEntry._meta.db_table
+    table = queryset.model._meta.db_table
+    # CROSS JOIN keeps the FTS table as the outer loop
+    matches = (
+        f"FROM {FTS_TABLE} CROSS JOIN {entries} "
+        f"ON {entries}.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND {entries}.model = %s"
+    )
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT {entries}.object_id {matches}", [match, label])
+    ).annotate(search_rank=RawSQL(
+        # Scored once per query, as in school_search._sqlite_search
+        f"(SELECT score FROM (SELECT {entries}.object_id AS id, "
+        f"-bm25({FTS_TABLE}) AS score {matches} LIMIT -1) "
+        f'WHERE id = "{table}"."id")',
+        [match, label], output_field=FloatField()))
+
+
+def _fallback_search(queryset, label, clauses):
+    condition = Q(model=label)
+    for clause in clauses:
+        for term in clause.terms:
+            condition &= Q(terms__contains=term)
+    return queryset.filter(
+        pk__in=NameSearchEntry.objects.filter(condition).values("object_id")
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_names(queryset, text):
+    """
+    Restrict a queryset of an indexed model to name matches of ``text``
+    and annotate ``search_rank`` (higher is more relevant).
+    """
+    label = queryset.model._meta.label_lower
+    if label not in NAME_FIELDS:
+        raise ValueError(f"{label} has no name search index")
+    clauses = parse_query(text)
+    if not clauses:
+        return queryset.none()
+    if connection.vendor == "postgresql":
+        return _postgres_search(queryset, label, clauses)
+    if connection.vendor == "sqlite":
+        return _sqlite_search(queryset, label, clauses)
+    return _fallback_search(queryset, label, clauses)
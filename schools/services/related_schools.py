@@ -0,0 +1,271 @@
+"""
+Related schools by nearest-neighbour search.
+
+Every school is vectorized from its types, educational levels, degrees
+(declared and offered), majors offered and geography (country, state,
+city). Each feature group is a one-hot block scaled to unit length and
+then by the group weight, and the full vector is normalized, so the dot
+product of two vectors is their weighted cosine similarity. The top
+``TOP_K`` neighbours of each school are stored as RelatedSchool rows,
+which the detail page and the API read with one indexed lookup.
+
+Neighbours are searched with faiss (exact inner product) when it is
+installed and with blocked NumPy matrix products otherwise.
+
+Changes to a school queue it in RelatedSchoolRefresh (see
+``schools.signals``). Draining the queue recomputes the changed schools
+and only those other schools whose lists they enter or leave.
+
+The table is filled by ``manage.py build_related_schools --full`` and
+kept current by a worker running ``build_related_schools --loop``.
+Schools without stored neighbours (before the first build, or queued and
+not yet processed) fall back to schools sharing a level, type or location.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from schools.models import RelatedSchool, RelatedSchoolRefresh, School
+from schools.models.levels import SchoolDegreeOffering, SchoolMajorOffering
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - NumPy search is used instead
+    faiss = None
+
+TOP_K = 8
+BLOCK_SIZE = 1024
+REFRESH_BATCH_SIZE = 500
+
+
+def _m2m(field):
+    def load():
+        field_ = School._meta.get_field(field)
+        return field_.remote_field.through.objects.values_list(
+            field_.m2m_column_name(), field_.m2m_reverse_name())
+    return load
+
+
+def _column(column):
+    def load():
+        return School.objects.filter(**{f"{column}__isnull": False}).values_list(
+            "pk", column)
+    return load
+
+
+def _degrees():
+    yield from _m2m("degree_levels")()
+    yield from SchoolDegreeOffering.objects.values_list("school_id", "degree_id")
+
+
+def _majors():
+    return SchoolMajorOffering.objects.values_list("school_id", "major_id")
+
+
+# (name, weight, loader of (school id, value id) pairs)
+FEATURE_GROUPS = (
+    ("types", 1.0, _m2m("type")),
+    ("educational_levels", 1.0, _m2m("educational_levels")),
+    ("degrees", 0.8, _degrees),
+    ("majors", 1.2, _majors),
+    ("country", 0.3, _column("country_id")),
+    ("state", 0.6, _column("state_id")),
+    ("city", 0.8, _column("city_id")),
+)
+
+
+def load_vectors():
+    """``(school ids, unit feature vectors)``, rows in school id order"""
+    school_ids = np.array(
+        list(School.objects.order_by("pk").values_list("pk", flat=True)),
+        dtype=np.int64)
+    blocks = []
+    for _name, weight, load in FEATURE_GROUPS:
+        pairs = np.array(list(load()), dtype=np.int64).reshape(-1, 2)
+        values, codes = np.unique(pairs[:, 1], return_inverse=True)
+        block = np.zeros((len(school_ids), len(values)), dtype=np.float32)
+        block[np.searchsorted(school_ids, pairs[:, 0]), codes] = 1.0
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        blocks.append(block * (weight / np.maximum(norms, 1.0e-12)))
+    vectors = (np.hstack(blocks) if blocks
+               else np.zeros((len(school_ids), 0), dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.ascontiguousarray(vectors / np.maximum(norms, 1.0e-12))
+    return school_ids, vectors.astype(np.float32)
+
+
+def nearest(vectors, rows, k=TOP_K):
+    """
+    ``(indexes, scores)`` of the ``k`` most similar other rows for each of
+    ``rows``, best first; entries without a positive score are -1 / 0.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    count = min(k + 1, len(vectors))
+    if faiss is not None and len(vectors) and vectors.shape[1]:
+        index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors)
+        scores, indexes = index.search(vectors[rows], count)
+    else:
+        scores = np.empty((len(rows), count), dtype=np.float32)
+        indexes = np.empty((len(rows), count), dtype=np.int64)
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = rows[start:start + BLOCK_SIZE]
+            similarity = vectors[block] @ vectors.T
+            top = np.argpartition(-similarity, count - 1, axis=1)[:, :count]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            indexes[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(
+                top_scores, order, axis=1)
+
+    result_indexes = np.full((len(rows), k), -1, dtype=np.int64)
+    result_scores = np.zeros((len(rows), k), dtype=np.float32)
+    for position, row in enumerate(rows):
+        keep = (indexes[position] != row) & (scores[position] > 1.0e-6) \
+            & (indexes[position] >= 0)
+        found = indexes[position][keep][:k]
+        result_indexes[position, :len(found)] = found
+        result_scores[position, :len(found)] = scores[position][keep][:k]
+    return result_indexes, result_scores
+
+
+def _write(school_ids, rows, indexes, scores):
+    """Replace the stored neighbour lists of ``rows``"""
+    owners = school_ids[rows].tolist()
+    entries = [
+        RelatedSchool(school_id=owner, related_id=int(school_ids[index]),
+                      rank=rank, score=float(score))
+        for owner, row_indexes, row_scores in zip(owners, indexes, scores)
+        for rank, (index, score) in enumerate(zip(row_indexes, row_scores), 1)
+        if index >= 0
+    ]
+    with transaction.atomic():
+        RelatedSchool.objects.filter(school_id__in=owners).delete()
+        RelatedSchool.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+def rebuild_related_schools(batch_size=BLOCK_SIZE):
+    """Recompute every school's neighbours; returns ``(schools, rows)``"""
+    school_ids, vectors = load_vectors()
+    # One search over all rows, so a faiss index is built only once
+    indexes, scores = nearest(vectors, np.arange(len(school_ids)))
+    written = 0
+    for start in range(0, len(school_ids), batch_size):
+        rows = np.arange(start, min(start + batch_size, len(school_ids)))
+        written += _write(school_ids, rows, indexes[rows], scores[rows])
+    RelatedSchool.objects.exclude(school_id__in=school_ids.tolist()).delete()
+    return len(school_ids), written
+
+
+def affected_rows(school_ids, vectors, changed_ids):
+    """
+    Rows whose neighbour lists may change when ``changed_ids`` change:
+    the changed schools, schools that list one of them, and schools a
+    changed school now beats the weakest stored neighbour of.
+    """
+    changed_rows = np.searchsorted(school_ids, changed_ids)
+    changed_rows = changed_rows[
+        (changed_rows < len(school_ids))
+        & (school_ids[np.minimum(changed_rows, len(school_ids) - 1)] == changed_ids)]
+
+    # Any positive similarity qualifies for a list that is not full
+    thresholds = np.full(len(school_ids), 1.0e-6, dtype=np.float32)
+    full_lists = RelatedSchool.objects.values("school_id").annotate(
+        entries=Count("pk"), weakest=Min("score")).filter(entries__gte=TOP_K)
+    for row in full_lists:
+        position = np.searchsorted(school_ids, row["school_id"])
+        if position < len(school_ids) and school_ids[position] == row["school_id"]:
+            thresholds[position] = row["weakest"]
+
+    affected = set(changed_rows.tolist())
+    if len(changed_rows):
+        similarity = vectors[changed_rows] @ vectors.T
+        affected.update(np.flatnonzero((similarity > thresholds).any(axis=0)).tolist())
+    listing = RelatedSchool.objects.filter(
+        related_id__in=changed_ids.tolist()).values_list("school_id", flat=True)
+    positions = np.searchsorted(school_ids, np.fromiter(listing, dtype=np.int64))
+    positions = positions[positions < len(school_ids)]
+    affected.update(positions.tolist())
+    return np.array(sorted(affected), dtype=np.int64)
+
+
+def refresh_related_schools(changed_ids):
+    """
+    Incrementally recompute neighbours after ``changed_ids`` changed;
+    returns the number of neighbour lists rewritten.
+    """
+    changed_ids = np.unique(np.asarray(list(changed_ids), dtype=np.int64))
+    if not len(changed_ids):
+        return 0
+    school_ids, vectors = load_vectors()
+    if not len(school_ids):
+        return 0
+    rows = affected_rows(school_ids, vectors, changed_ids)
+    if len(rows):
+        indexes, scores = nearest(vectors, rows)
+        _write(school_ids, rows, indexes, scores)
+    return len(rows)
+
+
+def queue_refresh(school_ids):
+    """
+    Mark schools whose neighbours must be recomputed. Schools already
+    queued get a new ``queued_at``, so a batch that claimed them before
+    this change does not dequeue them.
+    """
+    school_ids = {school_id for school_id in school_ids if school_id is not None}
+    RelatedSchoolRefresh.objects.bulk_create(
+        [RelatedSchoolRefresh(school_id=school_id) for school_id in school_ids],
+        update_conflicts=True, unique_fields=["school"],
+        update_fields=["queued_at"])
+
+
+def process_refresh_queue(batch_size=REFRESH_BATCH_SIZE):
+    """
+    Drain the refresh queue in batches. Returns ``(queued schools
+    processed, neighbour lists rewritten)``.
+    """
+    processed = rewritten = 0
+    while True:
+        with transaction.atomic():
+            claimed_at = timezone.now()
+            claimed = list(
+                RelatedSchoolRefresh.objects.select_for_update(skip_locked=True)
+                .order_by("queued_at", "pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not claimed:
+                break
+            rewritten += refresh_related_schools(claimed)
+            # Schools re-queued meanwhile stay for the next batch
+            RelatedSchoolRefresh.objects.filter(
+                pk__in=claimed, queued_at__lte=claimed_at).delete()
+        processed += len(claimed)
+    return processed, rewritten
+
+
+def fallback_related_schools(school, limit=TOP_K):
+    """Schools sharing a level, type or location, for unbuilt lists"""
+    condition = (
+        Q(educational_levels__in=school.educational_levels.all())
+        | Q(type__in=school.type.all())
+    )
+    if school.location:
+        condition |= Q(location=school.location)
+    return list(
+        School.objects.exclude(pk=school.pk).filter(condition).distinct()[:limit])
+
+
+def related_schools(school, limit=TOP_K):
+    """
+    The stored neighbours of ``school``, most similar first, or the
+    fallback when it has none
+    """
+    related = [
+        entry.related for entry in RelatedSchool.objects.filter(
+            school=school).select_related("related").order_by("rank")[:limit]
+    ]
+    return related or fallback_related_schools(school, limit)
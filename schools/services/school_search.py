@@ -0,0 +1,216 @@
+"""
+Full-text search over schools.
+
+Each school has a SchoolSearchDocument row (names, details, body) written
+on save. Its columns hold the terms produced by the text analyzer
+(``schools.services.text_analysis``), which also analyzes queries, so the
+database index only has to split on spaces:
+
+* PostgreSQL: a GIN index over a weighted ``tsvector`` built directly
+  from the terms, queried with a ``tsquery`` of the same terms and ranked
+  with ``ts_rank``. The vector has no positions, so phrases are then
+  checked against the stored terms.
+* SQLite: an external-content FTS5 table (``ascii`` tokenizer) kept in
+  sync by triggers, queried with ``MATCH`` and ranked with ``bm25``.
+
+Other backends fall back to substring matching without ranking.
+
+Words match as prefixes (``univ`` finds "Université"); quoted text
+matches as an exact phrase; Khmer and other unspaced text matches as a
+substring through cluster n-grams. ``SearchPaginator`` reads a page of
+results together with the total number of matches in one windowed query.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import (BooleanField, Count, FloatField, OuterRef, Q,
+                              Subquery, Value, Window)
+from django.db.models.expressions import RawSQL
+
+from schools.models import SchoolSearchDocument
+from schools.services.text_analysis import get_analyzer
+
+FTS_TABLE = "schools_search_fts"
+
+
+def terms_vector(column, weight=None):
+    """tsvector of a column of space-separated terms, without re-parsing"""
+    vector = f"array_to_tsvector(array_remove(string_to_array({column}, ' '), ''))"
+    if weight:
+        vector = f"setweight({vector}, '{weight}')"
+    return vector
+
+
+# Shared with the migration that creates the GIN index; the query must use
+# the identical expression for PostgreSQL to pick the index
+POSTGRES_VECTOR = " || ".join((
+    terms_vector("names", "A"),
+    terms_vector("details", "B"),
+    terms_vector("body", "C"),
+))
+
+# Column weights for bm25 (names, details, body)
+SQLITE_WEIGHTS = (10.0, 3.0, 1.0)
+
+
+def document_fields(school):
+    """Column values of a school's search document"""
+    analyzer = get_analyzer()
+    return {
+        "names": analyzer.index_text(
+            school.name, school.local_name, school.short_name, school.code),
+        "details": analyzer.index_text(
+            school.founder, school.president, school.location, school.motto),
+        "body": analyzer.index_text(school.description),
+    }
+
+
+def index_school(school):
+    """Create or refresh the search document of one school"""
+    SchoolSearchDocument.objects.update_or_create(
+        school_id=school.pk, defaults=document_fields(school)
+    )
+
+
+def parse_query(text):
+    """Clauses of a user query, analyzed like the indexed text"""
+    return get_analyzer().parse_query(text)
+
+
+def fts_match(clauses):
+    """FTS5 MATCH expression: each clause a phrase, optionally a prefix"""
+    return " ".join(
+        f'"{" ".join(clause.terms)}"' + ("*" if clause.prefix else "")
+        for clause in clauses
+    )
+
+
+def postgres_tsquery(clauses):
+    """
+    tsquery text of the clauses. The vectors carry no positions, so the
+    terms of a clause are ANDed here and their order is checked by
+    ``phrase_condition``.
+    """
+    lexemes = []
+    for clause in clauses:
+        last = len(clause.terms) - 1
+        for index, term in enumerate(clause.terms):
+            # Terms hold letters, digits and marks only; nothing to escape
+            prefix = clause.prefix and index == last
+            lexemes.append(f"'{term}'" + (":*" if prefix else ""))
+    return " & ".join(lexemes)
+
+
+def phrase_condition(clauses, columns):
+    """
+    Condition that every clause of several terms appears as consecutive
+    terms in one of ``columns``, or None if there is no such clause.
+    Applied after the index match, which narrows the rows first.
+    """
+    conditions, params = [], []
+    for clause in clauses:
+        if len(clause.terms) < 2:
+            continue
+        # Terms hold no LIKE wildcards; the spaces anchor whole terms
+        pattern = "% " + " ".join(clause.terms) + ("%" if clause.prefix else " %")
+        conditions.append("(" + " OR ".join(
+            f"(' ' || {column} || ' ') LIKE %s" for column in columns) + ")")
+        params.extend([pattern] * len(columns))
+    if not conditions:
+        return None
+    return RawSQL(" AND ".join(conditions), params, output_field=BooleanField())
+
+
+def _postgres_search(queryset, clauses):
+    """GIN-indexed tsvector match ranked with ts_rank"""
+    tsquery = postgres_tsquery(clauses)
+    documents = SchoolSearchDocument.objects.filter(RawSQL(
+        f"({POSTGRES_VECTOR}) @@ %s::tsquery", [tsquery],
+        output_field=BooleanField()))
+    phrases = phrase_condition(clauses, ("names", "details", "body"))
+    if phrases is not None:
+        documents = documents.filter(phrases)
+    rank = documents.filter(school_id=OuterRef("pk")).annotate(
+        rank=RawSQL(
+            f"ts_rank({POSTGRES_VECTOR}, %s::tsquery)", [tsquery],
+            output_field=FloatField())
+    ).values("rank")
+    return queryset.filter(
+        pk__in=documents.values("school_id")
+    ).annotate(search_rank=Subquery(rank, output_field=FloatField()))
+
+
+def _sqlite_search(queryset, clauses):
+    """FTS5 match ranked with bm25"""
+    match = fts_match(clauses)
+    table = queryset.model._meta.db_table
+    weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+    return queryset.filter(
+        pk__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    ).annotate(search_rank=RawSQL(
+        # bm25 is lower-is-better; negate so higher ranks sort first. LIMIT -1
+        # stops SQLite flattening the scores into the correlated lookup, so
+        # they are computed once per query instead of once per row
+        f"(SELECT score FROM (SELECT rowid AS id, -bm25({FTS_TABLE}, {weights}) "
+        f"AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s LIMIT -1) "
+        f'WHERE id = "{table}"."id")',
+        [match], output_field=FloatField()))
+
+
+def _fallback_search(queryset, clauses):
+    """Unranked substring match for backends without full-text support"""
+    condition = Q()
+    for clause in clauses:
+        for term in clause.terms:
+            condition &= (
+                Q(search_document__names__contains=term)
+                | Q(search_document__details__contains=term)
+                | Q(search_document__body__contains=term)
+            )
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField()))
+
+
+def search_schools(queryset, text):
+    """
+    Restrict a School queryset to matches of ``text`` (every clause) and
+    annotate ``search_rank`` (higher is more relevant).
+    """
+    clauses = parse_query(text)
+    if not clauses:
+        return queryset.none()
+    if connection.vendor == "postgresql":
+        return _postgres_search(queryset, clauses)
+    if connection.vendor == "sqlite":
+        return _sqlite_search(queryset, clauses)
+    return _fallback_search(queryset, clauses)
+
+
+class SearchPaginator(Paginator):
+    """
+    Paginator that reads a page and the total row count in one query,
+    by annotating every row with ``COUNT(*) OVER ()``. Falls back to the
+    usual COUNT query when the requested page is empty or out of range.
+    """
+
+    def page(self, number):
+        if "count" not in self.__dict__ and not self.orphans and hasattr(
+            self.object_list, "annotate"
+        ):
+            try:
+                page_number = int(number)
+            except (TypeError, ValueError):
+                page_number = 0
+            if page_number >= 1:
+                bottom = (page_number - 1) * self.per_page
+                rows = list(
+                    self.object_list.annotate(search_total=Window(Count("pk")))[
+                        bottom:bottom + self.per_page
+                    ]
+                )
+                if rows:
+                    # Paginator.count is a cached_property
+                    self.__dict__["count"] = rows[0].search_total
+                    return self._get_page(rows, page_number, self)
+        return super().page(number)
@@ -0,0 +1,194 @@
+"""
+Text analysis for the school, place and scholarship search indexes.
+
+The same analyzer runs at index time and at query time, so stored terms
+and query terms always agree:
+
+1. Normalization: NFKC, case folding, removal of zero-width and other
+   invisible characters, and folding of diacritics on Latin letters
+   (``Université`` -> ``universite``). Marks on other scripts (Khmer
+   vowel signs, subscripts) are part of the spelling and are kept.
+2. Segmentation into runs of letters, digits and marks. Runs in scripts
+   written with spaces are words. Runs in scripts written without spaces
+   between words (Khmer, Thai, Lao, Myanmar, CJK) are split into
+   character clusters (a base letter with its marks and subscript
+   consonants) and indexed as overlapping cluster bigrams, plus the
+   run's last cluster so every cluster begins some term.
+3. Terms are joined by single spaces; the full-text index then only has
+   to split on spaces (see ``school_search``).
+
+A query becomes clauses of consecutive terms. Words match as prefixes,
+quoted words as an exact phrase, and an unspaced run as the phrase of its
+bigrams with the last one as a prefix, i.e. as a substring.
+
+The analyzer class is pluggable through ``settings.SEARCH_TEXT_ANALYZER``
+(dotted path); indexes must be rebuilt after changing it.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_ANALYZER = "schools.services.text_analysis.TextAnalyzer"
+
+# Zero-width spaces are commonly typed between Khmer words; soft hyphens
+# and the deprecated Khmer inherent vowels are invisible
+IGNORED_CHARACTERS = dict.fromkeys(
+    map(ord, "\u00ad\u200b\u200c\u200d\u2060\ufeff\u17b4\u17b5"))
+
+KHMER_COENG = "\u17d2"
+
+# Scripts written without spaces between words
+UNSPACED_RANGES = (
+    (0x0E00, 0x0E7F),  # Thai
+    (0x0E80, 0x0EFF),  # Lao
+    (0x1000, 0x109F),  # Myanmar
+    (0x1780, 0x17FF),  # Khmer
+    (0x19E0, 0x19FF),  # Khmer symbols
+    (0x3040, 0x30FF),  # Hiragana, Katakana
+    (0x3400, 0x4DBF),  # CJK extension A
+    (0x4E00, 0x9FFF),  # CJK unified ideographs
+)
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|([^\s"]+)')
+
+
+class Clause(NamedTuple):
+    """Consecutive query terms; the last one may match as a prefix"""
+    terms: tuple
+    prefix: bool
+
+
+def is_unspaced(char):
+    """Whether ``char`` belongs to a script written without word breaks"""
+    code = ord(char)
+    return any(low <= code <= high for low, high in UNSPACED_RANGES)
+
+
+def _is_latin(char):
+    code = ord(char)
+    return code < 0x0250 or 0x1E00 <= code <= 0x1EFF
+
+
+def _is_term_char(char):
+    """Letters, digits and combining marks; everything else separates"""
+    return unicodedata.category(char)[0] in "LNM"
+
+
+class TextAnalyzer:
+    """Normalization and tokenization shared by indexing and querying"""
+
+    ngram_size = 2
+    max_clauses = 10
+
+    def normalize(self, text):
+        """Canonical, case- and accent-folded form of ``text``"""
+        text = unicodedata.normalize("NFKC", str(text or ""))
+        text = text.casefold().translate(IGNORED_CHARACTERS)
+        return self.fold_diacritics(text)
+
+    @staticmethod
+    def fold_diacritics(text):
+        """Drop combining marks attached to Latin letters"""
+        folded = []
+        base = ""
+        for char in unicodedata.normalize("NFD", text):
+            if unicodedata.combining(char) and _is_latin(base):
+                continue
+            if not unicodedata.combining(char):
+                base = char
+            folded.append(char)
+        return unicodedata.normalize("NFC", "".join(folded))
+
+    def segments(self, text):
+        """``(run, unspaced)`` runs of a normalized text"""
+        run, unspaced = [], False
+        for char in text:
+            if not _is_term_char(char):
+                if run:
+                    yield "".join(run), unspaced
+                run = []
+                continue
+            if unicodedata.category(char)[0] == "M":
+                # Marks belong to the run of their base character
+                if run:
+                    run.append(char)
+                continue
+            char_unspaced = is_unspaced(char)
+            if run and char_unspaced != unspaced:
+                yield "".join(run), unspaced
+                run = []
+            run.append(char)
+            unspaced = char_unspaced
+        if run:
+            yield "".join(run), unspaced
+
+    @staticmethod
+    def clusters(run):
+        """Base characters with their marks and subscript consonants"""
+        clusters = []
+        for char in run:
+            joins = clusters and (
+                unicodedata.category(char)[0] == "M" or
+                clusters[-1].endswith(KHMER_COENG))
+            if joins:
+                clusters[-1] += char
+            else:
+                clusters.append(char)
+        return clusters
+
+    def ngrams(self, clusters):
+        """Overlapping cluster n-grams of a run"""
+        size = self.ngram_size
+        return [
+            "".join(clusters[start:start + size])
+            for start in range(max(1, len(clusters) - size + 1))
+        ]
+
+    def terms(self, text):
+        """Index terms of ``text``"""
+        terms = []
+        for run, unspaced in self.segments(self.normalize(text)):
+            if not unspaced:
+                terms.append(run)
+                continue
+            clusters = self.clusters(run)
+            terms.extend(self.ngrams(clusters))
+            if len(clusters) >= self.ngram_size:
+                terms.append(clusters[-1])
+        return terms
+
+    def index_text(self, *parts):
+        """Space-separated index terms of several field values"""
+        return " ".join(term for part in parts for term in self.terms(part))
+
+    def parse_query(self, text):
+        """
+        Clauses of a user query. Every clause must match; a quoted text
+        is one phrase of its words without prefix matching.
+        """
+        clauses = []
+        for phrase, bare in QUERY_PATTERN.findall(text or ""):
+            words = []
+            for run, unspaced in self.segments(self.normalize(phrase or bare)):
+                if unspaced:
+                    clusters = self.clusters(run)
+                    clauses.append(Clause(tuple(self.ngrams(clusters)), True))
+                elif phrase:
+                    words.append(run)
+                else:
+                    clauses.append(Clause((run,), True))
+            if words:
+                clauses.append(Clause(tuple(words), False))
+        return clauses[:self.max_clauses]
+
+
+@lru_cache(maxsize=None)
+def get_analyzer():
+    """The configured analyzer instance"""
+    path = getattr(settings, "SEARCH_TEXT_ANALYZER", DEFAULT_ANALYZER)
+    return import_string(path)()
@@ -1,8 +1,14 @@
 import os
-from django.db.models.signals import post_save, post_delete
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
-from schools.models import school
+from schools.models import RelatedSchool, school
+from schools.models.levels import SchoolDegreeOffering, SchoolMajorOffering
+from schools.services.facets import FACETS, bump_facet_version
+from schools.services.name_search import NAME_FIELDS, index_names, remove_names
+from schools.services.related_schools import queue_refresh
+from schools.services.school_search import index_school
 
 @receiver(post_save, sender=school.School)
 def delete_old_logo_on_update(sender, instance, **kwargs):
@@ -21,4 +27,104 @@ def delete_old_logo_on_update(sender, instance, **kwargs):
 def delete_logo_on_delete(sender, instance, **kwargs):
     if instance.logo:
         if os.path.isfile(instance.logo.path):
-            instance.logo.delete(save=False)
\ No newline at end of file
+            instance.logo.delete(save=False)
+
+
+@receiver(post_save, sender=school.School)
+def update_school_search_document(sender, instance, raw=False, **kwargs):
+    """Keep the full-text search document in step with the school"""
+    if raw:
+        return
+    index_school(instance)
+
+
+def update_name_search_entry(sender, instance, raw=False, **kwargs):
+    """Keep the name search entry in step with a place or scholarship"""
+    if raw:
+        return
+    index_names(instance)
+
+
+def delete_name_search_entry(sender, instance, **kwargs):
+    """Drop the name search entry of a deleted place or scholarship"""
+    remove_names(instance)
+
+
+for _label in NAME_FIELDS:
+    _model = apps.get_model(_label)
+    post_save.connect(update_name_search_entry, sender=_model,
+                      dispatch_uid=f"name_search_save_{_label}")
+    post_delete.connect(delete_name_search_entry, sender=_model,
+                        dispatch_uid=f"name_search_delete_{_label}")
+
+
+def invalidate_school_facets(sender, raw=False, **kwargs):
+    """Schools, their tags or facet labels changed; rebuild the facet base"""
+    if raw:
+        return
+    bump_facet_version()
+
+
+for _name, (_param, _source, _model, _label) in FACETS.items():
+    post_save.connect(invalidate_school_facets, sender=_model,
+                      dispatch_uid=f"school_facets_save_{_name}")
+    post_delete.connect(invalidate_school_facets, sender=_model,
+                        dispatch_uid=f"school_facets_delete_{_name}")
+    if not _source.endswith("_id"):
+        m2m_changed.connect(
+            invalidate_school_facets,
+            sender=school.School._meta.get_field(_source).remote_field.through,
+            dispatch_uid=f"school_facets_m2m_{_name}")
+post_save.connect(invalidate_school_facets, sender=school.School,
+                  dispatch_uid="school_facets_save_school")
+post_delete.connect(invalidate_school_facets, sender=school.School,
+                    dispatch_uid="school_facets_delete_school")
+
+
+@receiver(post_save, sender=school.School)
+def queue_related_refresh_on_save(sender, instance, raw=False, **kwargs):
+    """A school's geography may have changed; recompute its neighbours"""
+    if raw:
+        return
+    queue_refresh([instance.pk])
+
+
+@receiver(pre_delete, sender=school.School)
+def queue_related_refresh_on_delete(sender, instance, **kwargs):
+    """Schools listing a deleted school need a replacement neighbour"""
+    queue_refresh(
+        RelatedSchool.objects.filter(related=instance)
+        .exclude(school=instance).values_list("school_id", flat=True))
+
+
+def queue_related_refresh_on_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Types, levels or degrees of schools were added, removed or cleared"""
+    if reverse and action == "pre_clear":
+        # post_clear carries no pk_set; read the schools before the links go
+        field = next(field for field in school.School._meta.many_to_many
+                     if field.remote_field.through is sender)
+        queue_refresh(sender.objects.filter(
+            **{field.m2m_reverse_field_name(): instance.pk}
+        ).values_list(field.m2m_field_name(), flat=True))
+    elif action in ("post_add", "post_remove") or (
+            action == "post_clear" and not reverse):
+        queue_refresh(pk_set if reverse else [instance.pk])
+
+
+def queue_related_refresh_on_offering(sender, instance, raw=False, **kwargs):
+    """A degree or major offering of a school changed"""
+    if raw:
+        return
+    queue_refresh([instance.school_id])
+
+
+for _field in ("type", "educational_levels", "degree_levels"):
+    m2m_changed.connect(
+        queue_related_refresh_on_tags,
+        sender=school.School._meta.get_field(_field).remote_field.through,
+        dispatch_uid=f"related_schools_m2m_{_field}")
+for _model in (SchoolDegreeOffering, SchoolMajorOffering):
+    post_save.connect(queue_related_refresh_on_offering, sender=_model,
+                      dispatch_uid=f"related_schools_save_{_model.__name__}")
+    post_delete.connect(queue_related_refresh_on_offering, sender=_model,
+                        dispatch_uid=f"related_schools_delete_{_model.__name__}")
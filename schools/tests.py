@@ -1,3 +1,341 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from geo.models import City, Country, State, Village
+from schools.models import (EducationalLevel, EducationDegree, NameSearchEntry,
+                            RelatedSchool, RelatedSchoolRefresh, Scholarship,
+                            School, SchoolSearchDocument, SchoolType)
+from schools.services.facets import get_facet_version, school_facets
+from schools.services.name_search import search_names
+from schools.services import related_schools as related_service
+from schools.services.related_schools import (process_refresh_queue,
+                                              rebuild_related_schools,
+                                              related_schools)
+from schools.services.school_search import (parse_query, phrase_condition,
+                                            search_schools)
+from schools.services.text_analysis import get_analyzer
+from schools.views.base import SchoolDetailView
+from search.views import SchoolListSearchView
+
+
+class SchoolSearchTestCase(TestCase):
+    """Full-text school search through the search index"""
+
+    def setUp(self):
+        self.royal = School.objects.create(
+            name="Royal University of Phnom Penh", short_name="RUPP",
+            local_name="សាកលវិទ្យាល័យភូមិន្ទភ្នំពេញ", founder="Ministry of Education",
+            description="Public university offering science and humanities.")
+        self.institute = School.objects.create(
+            name="Institute of Technology", short_name="ITC",
+            description="Engineering school near the Royal University campus.")
+        School.objects.create(name="Green Valley High School", description="Secondary school.")
+
+    def _search(self, text):
+        return list(
+            search_schools(School.objects.all(), text)
+            .order_by("-search_rank", "name").values_list("name", flat=True)
+        )
+
+    def test_prefix_phrase_and_ranking(self):
+        """Words match as prefixes, quotes as phrases; names outrank text"""
+        self.assertEqual(parse_query('univ "phnom penh"'),
+                         [(("univ",), True), (("phnom", "penh"), False)])
+        self.assertEqual(
+            self._search("royal univ"),
+            ["Royal University of Phnom Penh", "Institute of Technology"])
+        self.assertEqual(self._search('"university campus"'), ["Institute of Technology"])
+        self.assertEqual(self._search('"campus university"'), [])
+        self.assertEqual(self._search("សាកលវិទ្យាល័យ"), ["Royal University of Phnom Penh"])
+        self.assertEqual(self._search("ministry"), ["Royal University of Phnom Penh"])
+
+    def test_phrase_condition(self):
+        """The PostgreSQL phrase check keeps term order and adjacency"""
+        def matches(text):
+            condition = phrase_condition(
+                parse_query(text), ("names", "details", "body"))
+            return sorted(
+                SchoolSearchDocument.objects.filter(condition)
+                .values_list("school__short_name", flat=True))
+
+        self.assertIsNone(phrase_condition(parse_query("royal univ"), ("names",)))
+        self.assertEqual(matches('"university campus"'), ["ITC"])
+        self.assertEqual(matches('"campus university"'), [])
+        self.assertEqual(matches('"royal university"'), ["ITC", "RUPP"])
+        self.assertEqual(matches('"royal of"'), [])
+        self.assertEqual(matches("សាកលវិទ្យាល័យ"), ["RUPP"])
+
+    def test_document_follows_saves(self):
+        """Saving a school refreshes its document; deleting removes it"""
+        self.institute.name = "Cambodia Institute of Technology"
+        self.institute.save()
+        self.assertEqual(self._search("cambodia"), ["Cambodia Institute of Technology"])
+        self.institute.delete()
+        self.assertEqual(self._search("cambodia"), [])
+        self.assertEqual(SchoolSearchDocument.objects.count(), 2)
+
+    def test_views_read_page_and_count_in_one_query(self):
+        """Both the search page and the API avoid a separate COUNT"""
+        request = RequestFactory().get("/search/", {"q": "university"})
+        with CaptureQueriesContext(connection) as queries:
+            # Context only; the page template is not rendered here
+            response = SchoolListSearchView.as_view()(request)
+        self.assertEqual(response.context_data["search_count"], 2)
+        school_queries = [
+            query["sql"] for query in queries if '"schools_school"' in query["sql"]]
+        self.assertEqual(len(school_queries), 1, school_queries)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get("/api/v1/schools/", {"search": "royal"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["name"], "Royal University of Phnom Penh")
+        self.assertFalse([
+            query["sql"] for query in queries
+            if 'FROM "schools_school"' in query["sql"] and "COUNT(*)" in query["sql"]
+            and "OVER" not in query["sql"]])
+
+
+class TextAnalysisSearchTestCase(TestCase):
+    """Khmer n-grams and diacritic folding across the search indexes"""
+
+    def setUp(self):
+        self.school = School.objects.create(
+            name="Université Royale de Droit", local_name="សាកលវិទ្យាល័យភូមិន្ទនីតិសាស្ត្រ")
+        country = Country.objects.create(name="Cambodia", code="KHM")
+        state = State.objects.create(name="Siem Reap", local_name="សៀមរាប", country=country)
+        city = City.objects.create(name="Krong Siem Reap", state=state)
+        self.village = Village.objects.create(
+            name="Tuŏl Sângkê", local_name="ទួលសង្កែ", city=city)
+        # Scholarship.save() saves twice, which objects.create() rejects
+        self.scholarship = Scholarship(
+            name="Bourse d'Excellence", local_name="អាហារូបករណ៍ឧត្តមភាព",
+            provider="Ambassade de France")
+        self.scholarship.save()
+
+    def test_analyzer_folds_and_segments(self):
+        """Latin accents fold away; Khmer becomes cluster bigrams"""
+        analyzer = get_analyzer()
+        self.assertEqual(analyzer.terms("Université\u200b ÉCOLE"), ["universite", "ecole"])
+        self.assertEqual(analyzer.terms("ទួលសង្កែ"), ["ទួល", "លស", "សង្កែ", "ង្កែ"])
+        self.assertEqual(
+            analyzer.terms("ទួល\u200bសង្កែ"), analyzer.terms("ទួលសង្កែ"))
+
+    def test_khmer_substrings_and_folded_latin(self):
+        """Khmer matches inside words; Latin matches with or without accents"""
+        schools = School.objects.all()
+        for text in ("វិទ្យាល័យ", "នីតិ", "universite", "UNIVERSITÉ roy"):
+            self.assertEqual(list(search_schools(schools, text)), [self.school], text)
+        self.assertEqual(list(search_schools(schools, "នីតិវិទ្យា")), [])
+
+        villages = Village.objects.all()
+        self.assertEqual(list(search_names(villages, "សង្កែ")), [self.village])
+        self.assertEqual(list(search_names(villages, "tuol sang")), [self.village])
+        self.assertEqual(list(search_names(State.objects.all(), "សៀម")),
+                         [State.objects.get()])
+
+    def test_name_entries_follow_saves_and_api(self):
+        """Geo and scholarship endpoints search through the name index"""
+        response = APIClient().get("/api/v1/villages/", {"search": "ទួល"})
+        self.assertEqual(response.status_code, 200)
+        results = response.data.get("results", response.data)
+        self.assertEqual([row["name"] for row in results], ["Tuŏl Sângkê"])
+
+        response = APIClient().get("/api/v1/scholarships/", {"search": "ឧត្តម"})
+        results = response.data.get("results", response.data)
+        self.assertEqual([row["name"] for row in results], ["Bourse d'Excellence"])
+        response = APIClient().get("/api/v1/scholarships/", {"search": "ambassade"})
+        self.assertEqual(len(response.data.get("results", response.data)), 1)
+
+        self.scholarship.provider = "Japan Foundation"
+        self.scholarship.save()
+        self.assertFalse(search_names(Scholarship.objects.all(), "ambassade").exists())
+        self.village.delete()
+        self.assertFalse(
+            NameSearchEntry.objects.filter(model="geo.village").exists())
+
+
+class SchoolFacetTestCase(TestCase):
+    """Facet counts from the cached NumPy facet base"""
+
+    def setUp(self):
+        cache.clear()
+        country = Country.objects.create(name="Cambodia", code="KHM")
+        phnom_penh = State.objects.create(name="Phnom Penh", country=country)
+        siem_reap = State.objects.create(name="Siem Reap", country=country)
+        self.public = SchoolType.objects.create(type="Public")
+        self.private = SchoolType.objects.create(type="Private")
+        self.bachelor = EducationDegree.objects.create(degree_name="Bachelor")
+        self.high = EducationalLevel.objects.create(level_name="Higher education")
+
+        self.rupp = School.objects.create(
+            name="Royal University", country=country, state=phnom_penh)
+        self.rupp.type.add(self.public)
+        self.rupp.degree_levels.add(self.bachelor)
+        self.rupp.educational_levels.add(self.high)
+        self.itc = School.objects.create(
+            name="Institute of Technology", country=country, state=phnom_penh)
+        self.itc.type.add(self.public)
+        self.itc.degree_levels.add(self.bachelor)
+        self.angkor = School.objects.create(
+            name="Angkor University", country=country, state=siem_reap)
+        self.angkor.type.add(self.private)
+
+    @staticmethod
+    def _counts(facets, name):
+        return {row["name"]: row["count"] for row in facets[name]}
+
+    def test_counts_follow_filters_and_changes(self):
+        """Counts cover the filtered set and follow school and tag changes"""
+        facets = school_facets(School.objects.all())
+        self.assertEqual(self._counts(facets, "types"), {"Public": 2, "Private": 1})
+        self.assertEqual(facets["types"][0]["id"], self.public.pk)
+        self.assertEqual(self._counts(facets, "states"), {"Phnom Penh": 2, "Siem Reap": 1})
+        self.assertEqual(self._counts(facets, "countries"), {"Cambodia": 3})
+        self.assertEqual(self._counts(facets, "degrees"), {"Bachelor": 2})
+        self.assertEqual(self._counts(facets, "cities"), {})
+
+        facets = school_facets(School.objects.filter(name__startswith="A"))
+        self.assertEqual(self._counts(facets, "types"), {"Private": 1})
+        self.assertEqual(self._counts(facets, "degrees"), {})
+
+        self.angkor.degree_levels.add(self.bachelor)
+        self.itc.delete()
+        facets = school_facets(School.objects.all())
+        self.assertEqual(self._counts(facets, "degrees"), {"Bachelor": 2})
+        self.assertEqual(self._counts(facets, "types"), {"Public": 1, "Private": 1})
+
+    def test_version_is_bumped_again_on_commit(self):
+        """A base cached before the tags commit is not served after it"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.angkor.type.add(self.public)
+            stale_version = get_facet_version()
+        self.assertNotEqual(get_facet_version(), stale_version)
+
+    def test_list_response_includes_facets(self):
+        """The school list filters by facet parameters and returns counts"""
+        client = APIClient()
+        client.get("/api/v1/schools/")  # warm the facet base
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/v1/schools/", {"type": self.public.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            self._counts(response.data["facets"], "states"), {"Phnom Penh": 2})
+        self.assertEqual(
+            self._counts(response.data["facets"], "educational_levels"),
+            {"Higher education": 1})
+        self.assertFalse([
+            query["sql"] for query in queries if "GROUP BY" in query["sql"]
+            and "schools_school_degree_levels" in query["sql"]])
+
+        response = client.get(
+            "/api/v1/schools/", {"state": [self.angkor.state_id, self.rupp.state_id],
+                                 "degree": self.bachelor.pk})
+        self.assertEqual(response.data["count"], 2)
+
+
+class RelatedSchoolTestCase(TestCase):
+    """Precomputed nearest-neighbour related schools"""
+
+    def setUp(self):
+        country = Country.objects.create(name="Cambodia", code="KHM")
+        phnom_penh = State.objects.create(name="Phnom Penh", country=country)
+        siem_reap = State.objects.create(name="Siem Reap", country=country)
+        self.public = SchoolType.objects.create(type="Public")
+        self.private = SchoolType.objects.create(type="Private")
+        bachelor = EducationDegree.objects.create(degree_name="Bachelor")
+
+        self.rupp = School.objects.create(name="Royal University", state=phnom_penh)
+        self.rupp.type.add(self.public)
+        self.rupp.degree_levels.add(bachelor)
+        self.itc = School.objects.create(name="Institute of Technology", state=phnom_penh)
+        self.itc.type.add(self.public)
+        self.itc.degree_levels.add(bachelor)
+        self.angkor = School.objects.create(name="Angkor University", state=siem_reap)
+        self.angkor.type.add(self.private)
+        self.lone = School.objects.create(name="Unclassified School")
+        rebuild_related_schools()
+        RelatedSchoolRefresh.objects.all().delete()
+
+    def test_rebuild_ranks_by_shared_attributes(self):
+        """Neighbours share attributes; schools with nothing in common are left out"""
+        self.assertEqual(related_schools(self.rupp), [self.itc])
+        self.assertEqual(related_schools(self.lone), [])
+        self.assertEqual(RelatedSchool.objects.filter(school=self.angkor).count(), 0)
+
+    def test_incremental_refresh_from_queue(self):
+        """Attribute changes queue schools; draining updates the affected lists"""
+        self.angkor.type.add(self.public)
+        self.assertTrue(RelatedSchoolRefresh.objects.filter(school=self.angkor).exists())
+        process_refresh_queue()
+        self.assertFalse(RelatedSchoolRefresh.objects.exists())
+        self.assertEqual(related_schools(self.rupp), [self.itc, self.angkor])
+        self.assertEqual(set(related_schools(self.angkor)), {self.rupp, self.itc})
+
+        self.itc.delete()
+        self.assertTrue(RelatedSchoolRefresh.objects.filter(school=self.rupp).exists())
+        process_refresh_queue()
+        self.assertEqual(related_schools(self.rupp), [self.angkor])
+
+    def test_requeue_during_processing_is_kept(self):
+        """A school re-queued while its batch runs is processed again"""
+        self.angkor.type.add(self.public)
+        refresh = related_service.refresh_related_schools
+        calls = []
+
+        def refresh_and_edit(changed_ids):
+            if not calls:
+                # An edit committed while the worker holds the batch
+                related_service.queue_refresh([self.angkor.pk])
+            calls.append(list(changed_ids))
+            return refresh(changed_ids)
+
+        with mock.patch.object(
+                related_service, "refresh_related_schools", refresh_and_edit):
+            processed, _ = process_refresh_queue()
+        self.assertEqual(calls, [[self.angkor.pk], [self.angkor.pk]])
+        self.assertEqual(processed, 2)
+        self.assertFalse(RelatedSchoolRefresh.objects.exists())
+
+    def test_reverse_clear_queues_tagged_schools(self):
+        """Clearing a type's schools queues every school that had it"""
+        self.public.school_set.clear()
+        self.assertEqual(
+            set(RelatedSchoolRefresh.objects.values_list("school_id", flat=True)),
+            {self.rupp.pk, self.itc.pk})
+
+    def test_detail_page_and_api_read_the_table(self):
+        """The detail page does one lookup; the API action returns scores"""
+        request = RequestFactory().get(f"/schools/{self.rupp.pk}/")
+        view = SchoolDetailView()
+        view.setup(request, pk=self.rupp.pk)
+        view.object = self.rupp
+        with CaptureQueriesContext(connection) as queries:
+            context = view.get_context_data()
+            self.assertEqual(context["related_items"], [self.itc])
+        related_queries = [
+            query["sql"] for query in queries if "schools_relatedschool" in query["sql"]]
+        self.assertEqual(len(related_queries), 1)
+
+        response = APIClient().get(f"/api/v1/schools/{self.rupp.uuid}/related/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["name"] for row in response.data["results"]],
+                         ["Institute of Technology"])
+        self.assertGreater(response.data["results"][0]["similarity"], 0.9)
+
+    def test_unbuilt_lists_fall_back_to_shared_attributes(self):
+        """Before the table is built, schools sharing a type are returned"""
+        RelatedSchool.objects.all().delete()
+        self.assertEqual(related_schools(self.rupp), [self.itc])
+        self.assertEqual(related_schools(self.lone), [])
+
+        response = APIClient().get(f"/api/v1/schools/{self.rupp.uuid}/related/")
+        self.assertEqual([(row["name"], row["similarity"])
+                          for row in response.data["results"]],
+                         [("Institute of Technology", None)])
@@ -1,6 +1,5 @@
 import uuid
 import logging
-from django.db.models import Q
 from typing import Any
 from django import forms
 from django.contrib import messages
@@ -15,6 +14,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 
 from schools.models.online_profile import PlatformProfile
 from schools.models.school import FieldOfStudy, School, SchoolType
+from schools.services.related_schools import related_schools
 
 logger = logging.getLogger(__name__)
 
@@ -129,16 +129,8 @@ class SchoolDetailView(DetailView):
         if getattr(school, 'cover_image', None):
             context['cover_image_url'] = self.request.build_absolute_uri(school.cover_image.url)
 
-        rec_qs = School.objects.exclude(id=school.id)
-        filters = Q()
-        if hasattr(school, 'educational_levels') and school.educational_levels.exists():
-            filters |= Q(educational_levels__in=school.educational_levels.all())
-        if hasattr(school, 'type') and school.type.exists():
-            filters |= Q(type__in=school.type.all())
-        if school.location:
-            filters |= Q(location=school.location)
-
-        context['related_items'] = rec_qs.filter(filters).distinct()[:8] if filters else []
+        # Precomputed nearest neighbours (see schools.services.related_schools)
+        context['related_items'] = related_schools(school)
 
         return context
     
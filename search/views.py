@@ -1,6 +1,6 @@
-from django.db.models import Q
 from django.views.generic import ListView
 from schools.models.school import School
+from schools.services.school_search import SearchPaginator, search_schools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,24 +9,18 @@ class SchoolListSearchView(ListView):
     template_name = 'pages/search.html'
     model = School
     paginate_by = 20
+    # Reads the page and the total match count in one query
+    paginator_class = SearchPaginator
     context_object_name = 'schools'  # optional: for clarity in templates
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        query = self.request.GET.get("q")
+        query = self.request.GET.get("q", "").strip()
 
         if query:
-            queryset = queryset.filter(
-                Q(name__icontains=query) |
-                Q(local_name__icontains=query) |
-                Q(short_name__icontains=query) |
-                Q(code__icontains=query) |
-                Q(description__icontains=query) |
-                Q(founder__icontains=query) |
-                Q(president__icontains=query) |
-                Q(location__icontains=query) |
-                Q(motto__icontains=query)
-            ).distinct()
+            # Ranked full-text match against the school search index
+            queryset = search_schools(queryset, query).order_by(
+                "-search_rank", "name", "pk")
 
         return queryset
 
@@ -35,6 +29,6 @@ class SchoolListSearchView(ListView):
         query = self.request.GET.get("q", "")
         context["page_title"] = f"'{query}'" if query else "Search for Schools"
         context["active"] = "active"
-        context["search_count"] = self.get_queryset().count()
+        context["search_count"] = context["paginator"].count
         context["query"] = query  # so you can prefill the search box in the template
-        return context
\ No newline at end of file
+        return context
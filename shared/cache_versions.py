@@ -0,0 +1,45 @@
+"""
+Version counters for cached data.
+
+Cached data is stored under keys that include a version number kept in
+the default cache. Bumping the version orphans everything cached under
+the previous one, so nothing has to be deleted explicitly. Versions are
+seeded from the clock, so a version lost to eviction never restarts at a
+number whose data may still be cached. Every worker must share the
+default cache for a bump to reach them all (see CACHES in the settings).
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key):
+    """Current version stored under ``key``, initializing it if missing"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def bump_versions(keys):
+    """
+    Bump the versions under ``keys`` immediately, so reads in this
+    transaction miss, and again on commit, so data another request cached
+    from pre-commit rows in between is discarded as well.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))